@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats(BaseModel):
+    name: str
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+    avg_miss_ms: float
+    saved_ms: float
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Thread-safe LRU cache whose entries also expire after a fixed TTL.
+
+    The cache is per process, so invalidation only reaches the worker that
+    performed it; the TTL bounds how stale other workers can be.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl_seconds: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._miss_seconds = 0.0
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def record_miss_latency(self, seconds: float) -> None:
+        """Record how long the lookup behind a miss took, to estimate savings"""
+        with self._lock:
+            self._miss_seconds += seconds
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            lookups = self.hits + self.misses
+            avg_miss = self._miss_seconds / self.misses if self.misses else 0.0
+            return CacheStats(
+                name=self.name,
+                size=len(self._data),
+                max_size=self.max_size,
+                ttl_seconds=self.ttl_seconds,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                hit_rate=self.hits / lookups if lookups else 0.0,
+                avg_miss_ms=avg_miss * 1000,
+                saved_ms=avg_miss * self.hits * 1000,
+            )
+
+
+_registry: dict[str, TTLCache] = {}  # pyright: ignore[reportMissingTypeArgument]
+
+
+def register_cache(cache: TTLCache[K, V]) -> TTLCache[K, V]:
+    _registry[cache.name] = cache
+    return cache
+
+
+def all_cache_stats() -> list[CacheStats]:
+    return [cache.stats() for cache in _registry.values()]
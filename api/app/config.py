@@ -28,6 +28,64 @@ class Settings(BaseSettings):
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
     DATABASE_URL: str = ""
 
+    USER_CACHE_TTL_SECONDS: float = 60
+    USER_CACHE_MAX_SIZE: int = 1024
+
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: dict[str, str] = {
+        "POST /auth/login": "10/minute",
+        "POST /auth/register": "5/minute",
+        "POST /feedbacks": "5/minute",
+        "GET /images/{photo_id}": "300/minute",
+    }
+
+    FEEDBACK_BUFFER_ENABLED: bool = False
+    FEEDBACK_BUFFER_MAX_BATCH_SIZE: int = 500
+    FEEDBACK_BUFFER_FLUSH_INTERVAL_SECONDS: float = 1
+    FEEDBACK_BUFFER_MAX_QUEUE_SIZE: int = 10_000
+
+    # Where photos are stored, see app/storage.py
+    BLOB_STORAGE: Literal["vercel", "local"] = "vercel"
+    BLOB_READ_WRITE_TOKEN: str = ""
+    LOCAL_BLOB_ROOT: str = "data/blob"
+    LOCAL_BLOB_BASE_URL: str = "http://localhost:8000/api/v1/blobs"
+    BLOB_ETAG_CACHE_MAX_SIZE: int = 4096
+
+    # Resized photos for GET /images/{photo_id}, see app/images.py
+    IMAGE_CACHE_DIR: str = "data/image_cache"
+    IMAGE_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    IMAGE_RESIZE_WORKERS: int = 2
+    # Requested widths are rounded up to one of these (the Next.js default
+    # imageSizes and deviceSizes) and qualities must be one of these, which
+    # bounds how many renders a photo can have
+    IMAGE_SIZES: list[int] = [16, 32, 48, 64, 96, 128, 256, 384]
+    IMAGE_DEVICE_SIZES: list[int] = [640, 750, 828, 1080, 1200, 1920, 2048, 3840]
+    IMAGE_QUALITIES: list[int] = [50, 75, 90]
+
+    # Merchant search, see read_merchants in app/routes/merchants.py: at most
+    # this many full-text, name and address matches each are ranked, and fuzzy
+    # matches need a word similarity of at least the threshold of the longest
+    # length the query reaches
+    SEARCH_CANDIDATE_LIMIT: int = 500
+    SEARCH_WORD_SIMILARITY_THRESHOLDS: dict[int, float] = {0: 0.8, 4: 0.6, 8: 0.5}
+
+    # SQL statements per request, see app/query_metrics.py: requests over
+    # their route's budget are logged as warnings
+    SERVER_TIMING_ENABLED: bool = True
+    QUERY_BUDGET_DEFAULT: int = 10
+    QUERY_BUDGETS: dict[str, int] = {
+        "GET /merchants": 5,
+        "GET /merchants/types": 2,
+        "GET /merchant-types": 2,
+    }
+
     BACKEND_CORS_ORIGIN: Annotated[list[AnyUrl] | str, BeforeValidator(parse_cors)] = []
 
     @computed_field
@@ -6,9 +6,14 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.config import settings
+from app.feedback_buffer import feedback_buffer
+from app.images import shutdown_image_proxy
 from app.models.utils import Base
+from app.query_metrics import instrument_engine
+from app.security import shutdown_password_hashing
 
 engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -23,5 +28,10 @@ def get_session() -> Generator[Session, None, None]:
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     Base.metadata.create_all(engine)
+    if settings.FEEDBACK_BUFFER_ENABLED:
+        feedback_buffer.start(SessionLocal)
     yield
+    feedback_buffer.stop()
+    shutdown_password_hashing()
+    shutdown_image_proxy()
     engine.dispose()
@@ -1,3 +1,4 @@
+import time
 from typing import Annotated
 
 import jwt
@@ -5,9 +6,10 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Connection, event, inspect, select
+from sqlalchemy.orm import Mapper, Session, object_session
 
+from app.cache import TTLCache, register_cache
 from app.config import settings
 from app.database import get_session
 from app.models.user import User, UserPublic
@@ -19,6 +21,48 @@ SessionDep = Annotated[Session, Depends(get_session)]
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 TokenDep = Annotated[str, Depends(oauth2_scheme)]
 
+user_cache: TTLCache[str, UserPublic] = register_cache(
+    TTLCache(
+        "users",
+        max_size=settings.USER_CACHE_MAX_SIZE,
+        ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    )
+)
+
+
+CHANGED_USER_EMAILS = "changed_user_emails"
+
+
+def invalidate_user(email: str) -> None:
+    user_cache.invalidate(email)
+
+
+# Users are invalidated once their changes are committed: invalidating at
+# flush time would let a concurrent request cache the old committed row again
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_user(  # pyright: ignore[reportUnusedFunction]
+    _mapper: Mapper[User], _connection: Connection, target: User
+) -> None:
+    session = object_session(target)
+    if session is None:
+        invalidate_user(target.email)
+        return
+    emails: set[str] = session.info.setdefault(CHANGED_USER_EMAILS, set())  # pyright: ignore[reportAny]
+    emails.add(target.email)
+    emails.update(inspect(target).attrs.email.history.deleted)  # pyright: ignore[reportAny]
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:  # pyright: ignore[reportUnusedFunction]
+    for email in session.info.pop(CHANGED_USER_EMAILS, ()):  # pyright: ignore[reportAny]
+        invalidate_user(email)  # pyright: ignore[reportAny]
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session: Session) -> None:  # pyright: ignore[reportUnusedFunction]
+    session.info.pop(CHANGED_USER_EMAILS, None)
+
 
 def get_current_user(session: SessionDep, access_token: TokenDep):
     credentials_exception = HTTPException(
@@ -35,13 +79,25 @@ def get_current_user(session: SessionDep, access_token: TokenDep):
     except (InvalidTokenError, ValidationError):
         raise credentials_exception
 
+    if token_payload.sub is None:
+        raise credentials_exception
+
+    cached_user = user_cache.get(token_payload.sub)
+    if cached_user is not None:
+        return cached_user
+
+    started = time.perf_counter()
     stmt = select(User).where(User.email == token_payload.sub)
     user = session.scalar(stmt)
+    user_cache.record_miss_latency(time.perf_counter() - started)
 
     if user is None:
         raise credentials_exception
 
-    return UserPublic.model_validate(user)
+    user_public = UserPublic.model_validate(user)
+    user_cache.set(token_payload.sub, user_public)
+
+    return user_public
 
 
 CurrentUser = Annotated[UserPublic, Depends(get_current_user)]
@@ -0,0 +1,128 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.models.feedback import Feedback, FeedbackCreate
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class FeedbackBuffer:
+    """
+    Write-behind buffer for feedback submissions.
+
+    Accepted feedback is queued in memory and a background thread writes it
+    with multi-row INSERTs, flushing whenever a batch fills up or the flush
+    interval passes. Whatever is still queued is flushed on shutdown.
+    """
+
+    def __init__(
+        self, max_batch_size: int, flush_interval_seconds: float, max_queue_size: int
+    ):
+        self.max_batch_size = max_batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._queue: queue.Queue[dict[str, Any] | object] = queue.Queue(
+            maxsize=max_queue_size
+        )
+        self._session_factory: sessionmaker[Session] | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, session_factory: sessionmaker[Session]) -> None:
+        if self.running:
+            return
+        self._session_factory = session_factory
+        self._thread = threading.Thread(
+            target=self._run, name="feedback-buffer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, feedback: FeedbackCreate) -> bool:
+        """Queue feedback for writing; returns False when the buffer is full"""
+        row = feedback.model_dump()
+        row["created_at"] = datetime.now(timezone.utc)
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            return False
+        return True
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        assert self._thread is not None
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: list[dict[str, Any]] = []
+            deadline = time.monotonic() + self.flush_interval_seconds
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)  # pyright: ignore[reportArgumentType]
+
+            if batch:
+                self._flush(batch)
+
+        # Drain anything submitted while shutting down
+        remaining: list[dict[str, Any]] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                remaining.append(item)  # pyright: ignore[reportArgumentType]
+        for start in range(0, len(remaining), self.max_batch_size):
+            self._flush(remaining[start : start + self.max_batch_size])
+
+    def _flush(self, batch: list[dict[str, Any]], attempts: int = 3) -> None:
+        assert self._session_factory is not None
+        for attempt in range(1, attempts + 1):
+            try:
+                with self._session_factory() as session:
+                    session.execute(insert(Feedback), batch)
+                    session.commit()
+                return
+            except Exception:
+                logger.exception(
+                    "Failed to flush %d feedback(s) (attempt %d/%d)",
+                    len(batch),
+                    attempt,
+                    attempts,
+                )
+                if attempt < attempts:
+                    time.sleep(0.5 * attempt)
+        logger.error("Dropped %d feedback(s) after %d attempts", len(batch), attempts)
+
+
+feedback_buffer = FeedbackBuffer(
+    max_batch_size=settings.FEEDBACK_BUFFER_MAX_BATCH_SIZE,
+    flush_interval_seconds=settings.FEEDBACK_BUFFER_FLUSH_INTERVAL_SECONDS,
+    max_queue_size=settings.FEEDBACK_BUFFER_MAX_QUEUE_SIZE,
+)
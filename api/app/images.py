@@ -0,0 +1,309 @@
+"""
+On-demand photo resizing for GET /images/{photo_id}
+
+Renders are cached on disk by (blob reference, width, quality, format), so a
+re-uploaded photo gets fresh renders and the cache never has to be purged.
+Identical requests that arrive while a render is running wait for it instead
+of rendering again, and the Pillow work runs in a process pool so it neither
+holds the GIL nor ties up the request threads for long.
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generic, Literal, TypeVar
+
+from PIL import Image, ImageOps
+from pydantic import BaseModel
+
+from app.config import settings
+from app.storage import fetch_blob, write_atomically
+
+T = TypeVar("T")
+
+ImageFormat = Literal["webp", "jpeg"]
+
+MEDIA_TYPES: dict[ImageFormat, str] = {"webp": "image/webp", "jpeg": "image/jpeg"}
+
+
+@dataclass(frozen=True)
+class RenderParams:
+    blob_ref: str
+    width: int
+    quality: int
+    format: ImageFormat
+
+    @property
+    def key(self) -> str:
+        """Cache key and ETag for the rendered image"""
+        params = f"{self.blob_ref}|{self.width}|{self.quality}|{self.format}"
+        return hashlib.sha256(params.encode()).hexdigest()
+
+
+def render_image(source: bytes, width: int, quality: int, format: ImageFormat) -> bytes:
+    """Resize an image to width (never upscaling); safe to run in a process pool"""
+    with Image.open(io.BytesIO(source)) as img:
+        # Let the JPEG decoder skip the pixels we'd throw away anyway
+        img.draft("RGB", (width, width))
+        img = ImageOps.exif_transpose(img)
+
+    if img.width > width:
+        height = max(1, round(img.height * width / img.width))
+        img = img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    if format == "webp" and img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA")
+    elif format == "jpeg" and img.mode != "RGB":
+        # JPEG has no alpha channel, so put transparent images on white
+        rgba = img.convert("RGBA")
+        img = Image.new("RGB", img.size, (255, 255, 255))
+        img.paste(rgba, mask=rgba.split()[-1])
+
+    buffer = io.BytesIO()
+    if format == "webp":
+        img.save(buffer, format="WEBP", quality=quality, method=4)
+    else:
+        img.save(
+            buffer, format="JPEG", quality=quality, optimize=True, progressive=True
+        )
+    return buffer.getvalue()
+
+
+class DiskLRUCache:
+    """
+    Files under root, evicted least recently used first once they take up
+    more than max_bytes.
+
+    The index lives in memory and is rebuilt from the directory (ordered by
+    mtime, which hits bump) on startup. Each worker process keeps its own
+    index, so with several workers the directory can briefly exceed
+    max_bytes until they evict.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def _load(self) -> None:
+        if not self.root.is_dir():
+            return
+        files = [
+            (path.stat(), path) for path in self.root.glob("*/*") if path.is_file()
+        ]
+        for stat_result, path in sorted(files, key=lambda file: file[0].st_mtime_ns):
+            self._entries[path.name] = stat_result.st_size
+            self.total_bytes += stat_result.st_size
+        with self._lock:
+            self._evict()
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another worker
+            with self._lock:
+                self.total_bytes -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+
+        write_atomically(self._path(key), lambda tmp: tmp.write(data))
+
+        with self._lock:
+            self.total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._path(key).unlink(missing_ok=True)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SingleFlight(Generic[T]):
+    """Runs a function once per key at a time; concurrent callers share the result"""
+
+    def __init__(self):
+        self._calls: dict[str, Future[T]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> tuple[T, bool]:
+        """fn's result and whether it came from another caller's call"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class ImageProxyStats(BaseModel):
+    requests: int
+    cache_hits: int
+    cache_misses: int
+    hit_rate: float
+    coalesced: int
+    renders: int
+    errors: int
+    avg_render_ms: float
+    renders_per_second: float
+    requests_per_second: float
+    bytes_served: int
+    cache_entries: int
+    cache_bytes: int
+    cache_max_bytes: int
+    cache_evictions: int
+
+
+class ImageProxy:
+    def __init__(self, cache: DiskLRUCache, workers: int):
+        self.cache = cache
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._flight: SingleFlight[bytes] = SingleFlight()
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self.requests = 0
+        self.coalesced = 0
+        self.renders = 0
+        self.errors = 0
+        self.bytes_served = 0
+        self._render_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned, since forking a process with running threads can
+                # deadlock the child
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def get(self, params: RenderParams) -> bytes:
+        """The rendered image, from the cache or rendered once for all waiters"""
+        with self._lock:
+            self.requests += 1
+
+        data = self.cache.get(params.key)
+        if data is None:
+            try:
+                data, shared = self._flight.do(params.key, lambda: self._render(params))
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                raise
+            if shared:
+                with self._lock:
+                    self.coalesced += 1
+
+        with self._lock:
+            self.bytes_served += len(data)
+        return data
+
+    def _render(self, params: RenderParams) -> bytes:
+        started = time.perf_counter()
+        source = fetch_blob(params.blob_ref)
+        data = (
+            self._get_executor()
+            .submit(render_image, source, params.width, params.quality, params.format)
+            .result()
+        )
+        self.cache.set(params.key, data)
+        with self._lock:
+            self.renders += 1
+            self._render_seconds += time.perf_counter() - started
+        return data
+
+    def stats(self) -> ImageProxyStats:
+        with self._lock:
+            elapsed = max(time.monotonic() - self._started_at, 1e-9)
+            hits, misses = self.cache.hits, self.cache.misses
+            lookups = hits + misses
+            return ImageProxyStats(
+                requests=self.requests,
+                cache_hits=hits,
+                cache_misses=misses,
+                hit_rate=hits / lookups if lookups else 0.0,
+                coalesced=self.coalesced,
+                renders=self.renders,
+                errors=self.errors,
+                avg_render_ms=self._render_seconds / self.renders * 1000
+                if self.renders
+                else 0.0,
+                renders_per_second=self.renders / elapsed,
+                requests_per_second=self.requests / elapsed,
+                bytes_served=self.bytes_served,
+                cache_entries=len(self.cache),
+                cache_bytes=self.cache.total_bytes,
+                cache_max_bytes=self.cache.max_bytes,
+                cache_evictions=self.cache.evictions,
+            )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+image_proxy = ImageProxy(
+    DiskLRUCache(Path(settings.IMAGE_CACHE_DIR), settings.IMAGE_CACHE_MAX_BYTES),
+    workers=settings.IMAGE_RESIZE_WORKERS,
+)
+
+
+def shutdown_image_proxy() -> None:
+    image_proxy.shutdown()
@@ -1,24 +1,38 @@
-from app.models.feedback import Feedback, FeedbackCreate, FeedbackPublic
+from app.models.feedback import (
+    Feedback,
+    FeedbackCreate,
+    FeedbackDailyStats,
+    FeedbackPublic,
+)
 from app.models.merchant import (
     Amenity,
+    CatalogVersion,
     Merchant,
+    MerchantReviewStats,
     MerchantType,
     OpeningHours,
     Photo,
+    PhotoVariant,
     Review,
+    Type,
 )
 from app.models.user import User, UserCreate, UserLogin, UserPublic, UserUpdate
 
 __all__ = [
     "Amenity",
+    "CatalogVersion",
     "Feedback",
     "FeedbackCreate",
+    "FeedbackDailyStats",
     "FeedbackPublic",
     "Merchant",
+    "MerchantReviewStats",
     "MerchantType",
     "OpeningHours",
     "Photo",
+    "PhotoVariant",
     "Review",
+    "Type",
     "User",
     "UserCreate",
     "UserLogin",
@@ -1,11 +1,11 @@
 # pyright: reportUnannotatedClassAttribute=false
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 from pydantic import BaseModel, Field
-from sqlalchemy import CheckConstraint, DateTime, Integer, String
+from sqlalchemy import CheckConstraint, Date, DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.utils import Base
+from app.models.utils import Base, CursorMeta
 
 
 class Feedback(Base):
@@ -23,9 +23,25 @@ class Feedback(Base):
 
     __table_args__ = (
         CheckConstraint("rating >= 1 AND rating <= 5", name="rating_range"),
+        Index("ix_feedbacks_created_at_id", "created_at", "id"),
     )
 
 
+class FeedbackDailyStats(Base):
+    """Per-day feedback aggregates, maintained by a trigger on feedbacks"""
+
+    __tablename__ = "feedback_daily_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
 class FeedbackCreate(BaseModel):
     name: str = Field(max_length=50)
     message: str = Field(max_length=255)
@@ -44,3 +60,23 @@ class FeedbackPublic(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class FeedbacksPublic(BaseModel):
+    data: list[FeedbackPublic]
+    meta: CursorMeta
+
+
+class FeedbackStatsBucket(BaseModel):
+    count: int
+    average: float | None
+    histogram: list[int]
+
+
+class FeedbackDailyStatsPublic(FeedbackStatsBucket):
+    day: date
+
+
+class FeedbackStatsPublic(BaseModel):
+    overall: FeedbackStatsBucket
+    daily: list[FeedbackDailyStatsPublic]
@@ -1,20 +1,23 @@
 # pyright: reportUnannotatedClassAttribute=false
 from datetime import datetime, timezone
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    UniqueConstraint,
 )
-from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.utils import Base, PaginationMeta
+from app.models.utils import Base, CursorMeta, PaginationMeta
 
 
 class Merchant(Base):
@@ -50,6 +53,9 @@ class Merchant(Base):
     google_maps_uri: Mapped[str | None] = mapped_column(Text)
     is_open_now: Mapped[bool | None] = mapped_column(Boolean)
 
+    # Hash of the normalized Google Maps payload, used to skip unchanged places
+    content_hash: Mapped[str | None] = mapped_column(String(64))
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -64,6 +70,12 @@ class Merchant(Base):
     search_vector_en: Mapped[TSVECTOR | None] = mapped_column(TSVECTOR, nullable=True)
     search_vector_id: Mapped[TSVECTOR | None] = mapped_column(TSVECTOR, nullable=True)
 
+    # Copy of merchant_types.type_name, kept in sync by triggers on
+    # merchant_types (migrations/type_slugs.py)
+    type_slugs: Mapped[list[str]] = mapped_column(
+        ARRAY(Text), nullable=False, server_default="{}"
+    )
+
     # Relationships
     types: Mapped[list["MerchantType"]] = relationship(
         back_populates="merchant", cascade="all, delete-orphan"
@@ -80,6 +92,9 @@ class Merchant(Base):
     amenity: Mapped["Amenity | None"] = relationship(
         back_populates="merchant", cascade="all, delete-orphan", uselist=False
     )
+    review_stats: Mapped["MerchantReviewStats | None"] = relationship(
+        back_populates="merchant", uselist=False, viewonly=True
+    )
 
 
 class MerchantType(Base):
@@ -97,6 +112,28 @@ class MerchantType(Base):
     merchant: Mapped["Merchant"] = relationship(back_populates="types")
 
 
+class Type(Base):
+    """
+    Lookup table of type slugs with the number of merchants that have each,
+    refreshed after ingest by app.type_catalog.refresh_type_counts()
+    """
+
+    __tablename__ = "types"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    slug: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    merchant_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class CatalogVersion(Base):
+    """Bumped whenever a catalog changes, so cached copies know to reload"""
+
+    __tablename__ = "catalog_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
 class Photo(Base):
     __tablename__ = "photos"
 
@@ -108,11 +145,14 @@ class Photo(Base):
         nullable=False,
     )
 
-    vercel_blob_url: Mapped[str] = mapped_column(Text, nullable=False)
+    # A blob reference, see app/storage.py; resolve_blob_url gives the URL
+    blob_ref: Mapped[str] = mapped_column(Text, nullable=False)
     file_extension: Mapped[str] = mapped_column(String(10), nullable=False)
     width: Mapped[int | None] = mapped_column(Integer)
     height: Mapped[int | None] = mapped_column(Integer)
     blur_data_url: Mapped[str | None] = mapped_column(Text)
+    thumb_hash: Mapped[str | None] = mapped_column(String(64))
+    perceptual_hash: Mapped[str | None] = mapped_column(String(64), index=True)
 
     is_primary: Mapped[bool] = mapped_column(
         Boolean, index=True, default=False, nullable=False
@@ -120,6 +160,35 @@ class Photo(Base):
     order: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     merchant: Mapped["Merchant"] = relationship(back_populates="photos")
+    variants: Mapped[list["PhotoVariant"]] = relationship(
+        back_populates="photo",
+        cascade="all, delete-orphan",
+        order_by="PhotoVariant.width",
+    )
+
+
+class PhotoVariant(Base):
+    """A resized copy of a photo, generated when the photo is uploaded"""
+
+    __tablename__ = "photo_variants"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    photo_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("photos.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    format: Mapped[str] = mapped_column(String(10), nullable=False)
+    width: Mapped[int] = mapped_column(Integer, nullable=False)
+    height: Mapped[int] = mapped_column(Integer, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    photo: Mapped["Photo"] = relationship(back_populates="variants")
+
+    __table_args__ = (UniqueConstraint("photo_id", "format", "width"),)
 
 
 class Review(Base):
@@ -147,6 +216,42 @@ class Review(Base):
 
     merchant: Mapped["Merchant"] = relationship(back_populates="reviews")
 
+    __table_args__ = (
+        Index(
+            "ix_reviews_merchant_id_published_at_id",
+            "merchant_id",
+            published_at.desc().nulls_last(),
+            id.desc(),
+        ),
+    )
+
+
+class MerchantReviewStats(Base):
+    """Per-merchant review aggregates, maintained by triggers on reviews"""
+
+    __tablename__ = "merchant_review_stats"
+
+    merchant_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("merchants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    latest_published_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True)
+    )
+    latest_review_id: Mapped[int | None] = mapped_column(Integer)
+
+    merchant: Mapped["Merchant"] = relationship(back_populates="review_stats")
+
 
 class OpeningHours(Base):
     __tablename__ = "opening_hours"
@@ -219,6 +324,24 @@ class Amenity(Base):
     merchant: Mapped["Merchant"] = relationship(back_populates="amenity")
 
 
+class ReviewStatsPublic(BaseModel):
+    review_count: int
+    average_rating: float | None
+    histogram: list[int]
+    latest_published_at: datetime | None
+    latest_review_id: int | None
+
+
+class PhotoVariantPublic(BaseModel):
+    url: str
+    format: str
+    width: int
+    height: int
+
+    class Config:
+        from_attributes = True
+
+
 class MerchantListItem(BaseModel):
     id: int | None
     display_name: str | None
@@ -232,6 +355,9 @@ class MerchantListItem(BaseModel):
     photo_width: int | None
     photo_height: int | None
     photo_blur_data_url: str | None
+    photo_thumb_hash: str | None = None
+    photo_variants: list[PhotoVariantPublic] = []
+    review_stats: ReviewStatsPublic | None = None
 
 
 class MerchantsPublic(BaseModel):
@@ -258,6 +384,7 @@ class MerchantDetail(BaseModel):
     longitude: float
     rating: float | None
     user_rating_count: int | None
+    review_stats: ReviewStatsPublic | None = None
 
     class Config:
         from_attributes = True
@@ -265,23 +392,27 @@ class MerchantDetail(BaseModel):
 
 class PhotoPublic(BaseModel):
     id: int
-    vercel_blob_url: str
+    url: str
+    vercel_blob_url: str = Field(
+        deprecated="Use url, which works with every storage backend"
+    )
     file_extension: str
     width: int | None
     height: int | None
     blur_data_url: str | None
+    thumb_hash: str | None = None
     is_primary: bool
     order: int
+    variants: list[PhotoVariantPublic] = []
 
     class Config:
         from_attributes = True
 
 
-class ReviewPublic(BaseModel):
+class ReviewSummaryPublic(BaseModel):
     id: int
     google_review_id: str
     rating: int
-    text: str | None
     author_name: str | None
     author_photo_uri: str | None
     published_at: datetime | None
@@ -291,14 +422,30 @@ class ReviewPublic(BaseModel):
         from_attributes = True
 
 
+class ReviewPublic(ReviewSummaryPublic):
+    text: str | None
+
+
+class ReviewsPublic(BaseModel):
+    data: list[ReviewPublic | ReviewSummaryPublic]
+    meta: CursorMeta
+
+
 class MerchantTypePublic(BaseModel):
     id: int
+    slug: str
     type_name: str
 
     class Config:
         from_attributes = True
 
 
+class TypePublic(BaseModel):
+    slug: str
+    name: str
+    merchant_count: int
+
+
 class OpeningHoursPublic(BaseModel):
     id: int
     is_open_now: bool | None
@@ -28,8 +28,17 @@ class TokenPayload(BaseModel):
 
 class PaginationMeta(BaseModel):
     total: int
+    # Whether total is a lower bound, for searches with more matches than
+    # they rank
+    total_is_estimate: bool = False
     page: int
     page_size: int
     total_pages: int
     has_next: bool
     has_previous: bool
+
+
+class CursorMeta(BaseModel):
+    limit: int
+    has_next: bool
+    next_cursor: str | None
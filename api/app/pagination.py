@@ -0,0 +1,23 @@
+import base64
+import binascii
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(sort_value: datetime | None, row_id: int) -> str:
+    """Encode the (sort value, id) of the last row of a page as an opaque token"""
+    raw = f"{sort_value.isoformat() if sort_value else ''}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        sort_value, _, row_id = raw.partition("|")
+        return (datetime.fromisoformat(sort_value) if sort_value else None, int(row_id))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
@@ -0,0 +1,211 @@
+"""
+Per-request SQL statement counts and timings
+
+QueryMetricsMiddleware starts a RequestMetrics for each request in a context
+variable, which the engine event hooks add every statement to (sync routes
+run in a thread pool with a copy of the context, so they update the same
+object). Responses get a Server-Timing header with the time spent in the
+database, serializing the response and in total, and requests that run more
+statements than their route's budget are logged as warnings.
+"""
+
+import functools
+import inspect
+import logging
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi.routing import APIRoute
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+QUERY_STARTED_AT = "query_metrics_started_at"
+
+
+@dataclass
+class RequestMetrics:
+    queries: int = 0
+    db_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    endpoint_finished_at: float | None = None
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+            f"serialize;dur={self.serialize_seconds * 1000:.1f}, "
+            f"total;dur={total_seconds * 1000:.1f}"
+        )
+
+
+_request_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def current_metrics() -> RequestMetrics | None:
+    """The metrics of the request being handled, if any"""
+    return _request_metrics.get()
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _many):
+    metrics = _request_metrics.get()
+    if metrics is None:
+        return
+    metrics.queries += 1
+    conn.info.setdefault(QUERY_STARTED_AT, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, _statement, _parameters, _context, _many):
+    metrics = _request_metrics.get()
+    started = conn.info.get(QUERY_STARTED_AT)
+    if metrics is None or not started:
+        return
+    metrics.db_seconds += time.perf_counter() - started.pop()
+
+
+def _handle_error(exception_context) -> None:
+    # after_cursor_execute doesn't run for failed statements
+    connection = exception_context.connection
+    started = connection.info.get(QUERY_STARTED_AT) if connection else None
+    metrics = _request_metrics.get()
+    if metrics is None or not started:
+        return
+    metrics.db_seconds += time.perf_counter() - started.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count the engine's statements towards the current request's metrics"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _mark_endpoint_finished() -> None:
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.endpoint_finished_at = time.perf_counter()
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    # functools.wraps keeps the signature FastAPI reads the parameters from
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _mark_endpoint_finished()
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            _mark_endpoint_finished()
+
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    An APIRoute that records how long the response took to serialize
+
+    That is the time from the endpoint returning until the route handler has
+    validated and rendered its response. Set it as route_class on a router.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def instrumented_handler(request: Request) -> Response:
+            response = await handler(request)
+            metrics = _request_metrics.get()
+            if metrics is not None and metrics.endpoint_finished_at is not None:
+                metrics.serialize_seconds = (
+                    time.perf_counter() - metrics.endpoint_finished_at
+                )
+            return response
+
+        return instrumented_handler
+
+
+class QueryMetricsMiddleware:
+    """
+    Collect the metrics of each request, send them as a Server-Timing header
+    and warn about requests over their route's query budget.
+
+    Budgets are keyed like rate limits, by method and route path without the
+    API prefix ("GET /merchants/{merchant_id}"); routes without one get
+    default_budget.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        budgets: dict[str, int],
+        default_budget: int,
+        prefix: str = "",
+        server_timing: bool = True,
+    ):
+        self.app = app
+        self.budgets = budgets
+        self.default_budget = default_budget
+        self.prefix = prefix
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    metrics.server_timing(time.perf_counter() - started),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_metrics.reset(token)
+            self._check_budget(scope, metrics)
+
+    def _check_budget(self, scope: Scope, metrics: RequestMetrics) -> None:
+        # Set by the router once a route matched
+        path: str | None = getattr(scope.get("route"), "path", None)
+        if path is None:
+            return
+        if self.prefix and path.startswith(self.prefix):
+            path = path[len(self.prefix) :]
+        route = f"{scope['method']} {path.rstrip('/') or '/'}"
+
+        budget = self.budgets.get(route, self.default_budget)
+        if metrics.queries > budget:
+            logger.warning(
+                "%s ran %d queries (budget %d) in %.1fms",
+                route,
+                metrics.queries,
+                budget,
+                metrics.db_seconds * 1000,
+            )
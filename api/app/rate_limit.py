@@ -0,0 +1,168 @@
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+PERIODS = {"second": 1, "minute": 60, "hour": 60 * 60, "day": 60 * 60 * 24}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    requests: int
+    period_seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.requests / self.period_seconds
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse limits written as "<requests>/<second|minute|hour|day>" """
+        count, _, period = value.partition("/")
+        if period not in PERIODS:
+            raise ValueError(f"Invalid rate limit: {value}")
+        return cls(requests=int(count), period_seconds=PERIODS[period])
+
+
+class RateLimitBackend(Protocol):
+    async def consume(self, key: str, limit: RateLimit) -> float:
+        """Take one token for key; return 0 if allowed, else seconds to wait"""
+        ...
+
+
+class MemoryRateLimitBackend:
+    """
+    Token buckets held in a plain dict.
+
+    The middleware only touches it from the event loop thread and never awaits
+    between reading and writing a bucket, so no lock is needed. It doubles as
+    the shared backend stand-in for tests.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> (tokens, updated_at, period_seconds), least recently updated
+        # first
+        self._buckets: OrderedDict[str, tuple[float, float, float]] = OrderedDict()
+
+    def consume_now(self, key: str, limit: RateLimit, now: float) -> float:
+        tokens, updated_at, _ = self._buckets.get(
+            key, (limit.requests, now, limit.period_seconds)
+        )
+        tokens = min(
+            limit.requests, tokens + (now - updated_at) * limit.refill_per_second
+        )
+
+        if tokens < 1:
+            self._set(key, tokens, now, limit)
+            return (1 - tokens) / limit.refill_per_second
+
+        if key not in self._buckets and len(self._buckets) >= self.max_keys:
+            self._prune(now)
+        self._set(key, tokens - 1, now, limit)
+        return 0.0
+
+    def _set(self, key: str, tokens: float, now: float, limit: RateLimit) -> None:
+        self._buckets[key] = (tokens, now, limit.period_seconds)
+        self._buckets.move_to_end(key)
+
+    async def consume(self, key: str, limit: RateLimit) -> float:
+        return self.consume_now(key, limit, time.monotonic())
+
+    def _prune(self, now: float) -> None:
+        # Buckets idle for a whole period of their own limit are full again
+        # and can be forgotten
+        self._buckets = OrderedDict(
+            (key, bucket)
+            for key, bucket in self._buckets.items()
+            if now - bucket[1] < bucket[2]
+        )
+        # Still full: forget the least recently used buckets rather than all
+        # of them, so flooding the store with new clients can't reset the
+        # limits of the clients already in it
+        while len(self._buckets) >= self.max_keys:
+            self._buckets.popitem(last=False)
+
+
+def route_pattern(route: str) -> re.Pattern[str]:
+    """Match a route like "GET /images/{photo_id}", one segment per parameter"""
+    parts = re.split(r"(\{[^/]+?\})", route)
+    return re.compile(
+        "".join("[^/]+" if part.startswith("{") else re.escape(part) for part in parts)
+    )
+
+
+class RateLimitMiddleware:
+    """
+    Reject requests over their route's limit with a 429 before routing.
+
+    Routes with path parameters share one bucket per client across all
+    values of the parameters.
+
+    Each worker checks its local buckets first, so floods are turned away
+    without any I/O; requests that pass are then checked against the optional
+    shared backend, which enforces the limit across workers.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: dict[str, RateLimit],
+        prefix: str = "",
+        backend: RateLimitBackend | None = None,
+    ):
+        self.app = app
+        self.limits = {
+            route: limit for route, limit in limits.items() if "{" not in route
+        }
+        self.patterns = [
+            (route_pattern(route), route, limit)
+            for route, limit in limits.items()
+            if "{" in route
+        ]
+        self.prefix = prefix
+        self.local = MemoryRateLimitBackend()
+        self.backend = backend
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path: str = scope["path"]
+        if self.prefix and path.startswith(self.prefix):
+            path = path[len(self.prefix) :]
+        route = f"{scope['method']} {path.rstrip('/') or '/'}"
+
+        limit = self.limits.get(route)
+        if limit is None:
+            for pattern, template, pattern_limit in self.patterns:
+                if pattern.fullmatch(route):
+                    route, limit = template, pattern_limit
+                    break
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        key = f"{client[0] if client else 'unknown'}:{route}"
+
+        retry_after = self.local.consume_now(key, limit, time.monotonic())
+        if not retry_after and self.backend is not None:
+            retry_after = await self.backend.consume(key, limit)
+
+        if retry_after:
+            response = JSONResponse(
+                {"detail": "Too many requests, please try again later"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -5,19 +5,19 @@ import jwt
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi._compat.v2 import ValidationError
 from fastapi.security import OAuth2PasswordRequestForm
-from passlib.context import CryptContext
 from pydantic import EmailStr
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
 from app.dependencies import SessionDep
 from app.models.user import User, UserCreate, UserLogin
 from app.models.utils import Token, TokenPayload
+from app.query_metrics import InstrumentedRoute
+from app.security import hash_password, verify_password
 
-router = APIRouter(prefix="/auth", tags=["auth"])
-
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=InstrumentedRoute)
 
 
 def get_user_by_email(session: Session, email: EmailStr):
@@ -26,12 +26,32 @@ def get_user_by_email(session: Session, email: EmailStr):
     return user
 
 
-def authenticate_user(session: Session, user_in: UserLogin):
-    user = get_user_by_email(session, user_in.email)
+def update_password_hash(session: Session, user_id: int, hashed_password: str):
+    session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(hashed_password=hashed_password, updated_at=datetime.now(timezone.utc))
+    )
+    session.commit()
+
+
+def create_user(session: Session, user: User):
+    session.add(user)
+    session.commit()
+
+
+async def authenticate_user(session: Session, user_in: UserLogin):
+    user = await run_in_threadpool(get_user_by_email, session, user_in.email)
+    # Return the connection to the pool while the password is hashed; the
+    # loaded attributes stay readable on the detached user
+    await run_in_threadpool(session.close)
     if not user:
         return None
-    if not pwd_context.verify(user_in.password, user.hashed_password):
+    verified, new_hash = await verify_password(user_in.password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        await run_in_threadpool(update_password_hash, session, user.id, new_hash)
     return user
 
 
@@ -49,7 +69,7 @@ def create_token(data: TokenPayload, expires_delta: timedelta):
 
 
 @router.post("/login", response_model=Token)
-def login_user(
+async def login_user(
     session: SessionDep,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ):
@@ -59,7 +79,7 @@ def login_user(
         message = e.errors()[0]["msg"]
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
 
-    user = authenticate_user(session, user_in)
+    user = await authenticate_user(session, user_in)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -75,8 +95,10 @@ def login_user(
 
 
 @router.post("/register", response_model=Token)
-def register_user(session: SessionDep, user_in: UserCreate):
-    existing_user = get_user_by_email(session, user_in.email)
+async def register_user(session: SessionDep, user_in: UserCreate):
+    existing_user = await run_in_threadpool(get_user_by_email, session, user_in.email)
+    # Don't hold the connection while the password is hashed
+    await run_in_threadpool(session.close)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -86,14 +108,11 @@ def register_user(session: SessionDep, user_in: UserCreate):
     user = User(
         name=user_in.name,
         email=user_in.email,
-        hashed_password=pwd_context.hash(user_in.password),
+        hashed_password=await hash_password(user_in.password),
     )
+    await run_in_threadpool(create_user, session, user)
 
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
-    access_token_payload = TokenPayload.model_validate({"sub": user.email})
+    access_token_payload = TokenPayload.model_validate({"sub": user_in.email})
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRES_MINUTES)
     access_token = create_token(access_token_payload, access_token_expires)
 
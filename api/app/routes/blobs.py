@@ -0,0 +1,70 @@
+import hashlib
+import os
+import stat
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from app.cache import TTLCache, register_cache
+from app.config import settings
+from app.query_metrics import InstrumentedRoute
+from app.storage import LocalBlobStorage, content_type_for, etag_matches
+
+router = APIRouter(prefix="/blobs", tags=["blobs"], route_class=InstrumentedRoute)
+
+# Local blob names include a hash of their content, so they never change
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+storage = LocalBlobStorage(Path(settings.LOCAL_BLOB_ROOT))
+
+# Keyed by (path, mtime, size), so a replaced file gets a fresh ETag
+etag_cache: TTLCache[tuple[str, int, int], str] = register_cache(
+    TTLCache(
+        "blob_etags",
+        max_size=settings.BLOB_ETAG_CACHE_MAX_SIZE,
+        ttl_seconds=24 * 60 * 60,
+    )
+)
+
+
+def blob_etag(path: Path, stat_result: os.stat_result) -> str:
+    """A strong ETag: the SHA-256 of the file's content"""
+    key = (str(path), stat_result.st_mtime_ns, stat_result.st_size)
+    etag = etag_cache.get(key)
+    if etag is None:
+        with path.open("rb") as f:
+            etag = f'"{hashlib.file_digest(f, "sha256").hexdigest()}"'
+        etag_cache.set(key, etag)
+    return etag
+
+
+@router.api_route("/{blob_path:path}", methods=["GET", "HEAD"])
+def read_blob(blob_path: str, request: Request) -> Response:
+    """
+    Serve a blob from local storage
+
+    Range requests are answered by FileResponse, which also hands the file
+    to the server (zero-copy) when it supports the ASGI pathsend extension.
+    """
+    path = storage.path_for(blob_path)
+    try:
+        stat_result = path.stat() if path else None
+    except FileNotFoundError:
+        stat_result = None
+    if path is None or stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="Blob not found")
+
+    headers = {
+        "ETag": blob_etag(path, stat_result),
+        "Cache-Control": CACHE_CONTROL,
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        path,
+        headers=headers,
+        media_type=content_type_for(path),
+        stat_result=stat_result,
+    )
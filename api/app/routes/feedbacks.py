@@ -1,23 +1,167 @@
-from fastapi import APIRouter, HTTPException
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
 
-from app.dependencies import SessionDep
-from app.models.feedback import Feedback, FeedbackCreate, FeedbackPublic
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, insert, select, tuple_
 
-router = APIRouter(prefix="/feedbacks", tags=["feedbacks"])
+from app.config import settings
+from app.dependencies import SessionDep, get_current_user
+from app.feedback_buffer import feedback_buffer
+from app.models.feedback import (
+    Feedback,
+    FeedbackCreate,
+    FeedbackDailyStats,
+    FeedbackDailyStatsPublic,
+    FeedbackPublic,
+    FeedbacksPublic,
+    FeedbackStatsBucket,
+    FeedbackStatsPublic,
+)
+from app.models.utils import CursorMeta, Message
+from app.pagination import decode_cursor, encode_cursor
+from app.query_metrics import InstrumentedRoute
 
+router = APIRouter(
+    prefix="/feedbacks", tags=["feedbacks"], route_class=InstrumentedRoute
+)
+
+
+def rating_stats(count: int, rating_sum: int, histogram: list[int]):
+    return {
+        "count": count,
+        "average": rating_sum / count if count else None,
+        "histogram": histogram,
+    }
+
+
+@router.get(
+    "", response_model=FeedbacksPublic, dependencies=[Depends(get_current_user)]
+)
+def read_feedbacks(
+    session: SessionDep,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Annotated[str | None, Query()] = None,
+):
+    stmt = select(Feedback).order_by(Feedback.created_at.desc(), Feedback.id.desc())
+
+    if cursor:
+        created_at, feedback_id = decode_cursor(cursor)
+        if created_at is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(
+            tuple_(Feedback.created_at, Feedback.id) < tuple_(created_at, feedback_id)
+        )
+
+    feedbacks = session.scalars(stmt.limit(limit + 1)).all()
+    has_next = len(feedbacks) > limit
+    feedbacks = feedbacks[:limit]
+
+    return FeedbacksPublic(
+        data=[FeedbackPublic.model_validate(feedback) for feedback in feedbacks],
+        meta=CursorMeta(
+            limit=limit,
+            has_next=has_next,
+            next_cursor=(
+                encode_cursor(feedbacks[-1].created_at, feedbacks[-1].id)
+                if has_next
+                else None
+            ),
+        ),
+    )
+
+
+@router.get(
+    "/stats",
+    response_model=FeedbackStatsPublic,
+    dependencies=[Depends(get_current_user)],
+)
+def read_feedback_stats(
+    session: SessionDep,
+    days: Annotated[int, Query(ge=1, le=366)] = 30,
+):
+    rating_columns = [
+        FeedbackDailyStats.rating_1,
+        FeedbackDailyStats.rating_2,
+        FeedbackDailyStats.rating_3,
+        FeedbackDailyStats.rating_4,
+        FeedbackDailyStats.rating_5,
+    ]
+
+    totals = session.execute(
+        select(
+            func.coalesce(func.sum(FeedbackDailyStats.count), 0),
+            func.coalesce(func.sum(FeedbackDailyStats.rating_sum), 0),
+            *[func.coalesce(func.sum(column), 0) for column in rating_columns],
+        )
+    ).one()
+
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    stmt = (
+        select(FeedbackDailyStats)
+        .where(FeedbackDailyStats.day >= since)
+        .order_by(FeedbackDailyStats.day.asc())
+    )
+    daily_stats = session.scalars(stmt).all()
+
+    return FeedbackStatsPublic(
+        overall=FeedbackStatsBucket(
+            **rating_stats(totals[0], totals[1], list(totals[2:]))
+        ),
+        daily=[
+            FeedbackDailyStatsPublic(
+                day=row.day,
+                **rating_stats(
+                    row.count,
+                    row.rating_sum,
+                    [
+                        row.rating_1,
+                        row.rating_2,
+                        row.rating_3,
+                        row.rating_4,
+                        row.rating_5,
+                    ],
+                ),
+            )
+            for row in daily_stats
+        ],
+    )
+
+
+@router.post(
+    "",
+    response_model=FeedbackPublic | Message,
+    status_code=201,
+    responses={202: {"model": Message}},
+)
+def create_feedback(feedback: FeedbackCreate, session: SessionDep, response: Response):
+    if settings.FEEDBACK_BUFFER_ENABLED:
+        if not feedback_buffer.submit(feedback):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Feedback queue is full, please try again later",
+            )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return Message(message="Feedback accepted")
 
-@router.post("", response_model=FeedbackPublic, status_code=201)
-def create_feedback(feedback: FeedbackCreate, session: SessionDep):
     try:
-        db_feedback = Feedback(
+        stmt = (
+            insert(Feedback)
+            .values(
+                name=feedback.name,
+                message=feedback.message,
+                rating=feedback.rating,
+            )
+            .returning(Feedback.id, Feedback.created_at)
+        )
+        feedback_id, created_at = session.execute(stmt).one()
+        session.commit()
+        return FeedbackPublic(
+            id=feedback_id,
             name=feedback.name,
             message=feedback.message,
             rating=feedback.rating,
+            created_at=created_at,
         )
-        session.add(db_feedback)
-        session.commit()
-        session.refresh(db_feedback)
-        return FeedbackPublic.model_validate(db_feedback)
     except Exception as e:
         session.rollback()
         raise HTTPException(
@@ -0,0 +1,71 @@
+from typing import Annotated
+
+import requests
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from PIL import UnidentifiedImageError
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import SessionLocal
+from app.images import MEDIA_TYPES, ImageFormat, RenderParams, image_proxy
+from app.models import Photo
+from app.query_metrics import InstrumentedRoute
+from app.storage import etag_matches
+
+router = APIRouter(prefix="/images", tags=["images"], route_class=InstrumentedRoute)
+
+# Renders are keyed by the blob reference, which changes when a photo is
+# re-uploaded, so a URL always returns the same image
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+IMAGE_WIDTHS = sorted(settings.IMAGE_SIZES + settings.IMAGE_DEVICE_SIZES)
+
+
+def render_width(width: int) -> int:
+    """The smallest allowed width of at least width"""
+    return next((allowed for allowed in IMAGE_WIDTHS if allowed >= width), width)
+
+
+@router.get("/{photo_id}")
+def read_image(
+    photo_id: int,
+    request: Request,
+    w: Annotated[int, Query(ge=1, le=IMAGE_WIDTHS[-1])],
+    q: Annotated[int, Query(ge=1, le=100)] = 75,
+    fmt: ImageFormat = "webp",
+) -> Response:
+    """
+    A photo resized to w pixels wide (never upscaled), for the Next.js image
+    loader
+
+    w is rounded up to the next of IMAGE_SIZES and IMAGE_DEVICE_SIZES, and q
+    must be one of IMAGE_QUALITIES.
+    """
+    if q not in settings.IMAGE_QUALITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"q must be one of {', '.join(map(str, settings.IMAGE_QUALITIES))}",
+        )
+
+    # A session of its own, closed before the blob fetch and render, so cold
+    # renders don't hold connections the other routes need
+    with SessionLocal() as session:
+        blob_ref = session.scalar(select(Photo.blob_ref).where(Photo.id == photo_id))
+    if blob_ref is None:
+        raise HTTPException(status_code=404, detail="Photo not found")
+
+    params = RenderParams(
+        blob_ref=blob_ref, width=render_width(w), quality=q, format=fmt
+    )
+    headers = {"ETag": f'"{params.key}"', "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        data = image_proxy.get(params)
+    except UnidentifiedImageError:
+        raise HTTPException(status_code=422, detail="Photo is not a readable image")
+    except (OSError, requests.RequestException):
+        raise HTTPException(status_code=502, detail="Could not load the photo")
+
+    return Response(content=data, media_type=MEDIA_TYPES[fmt], headers=headers)
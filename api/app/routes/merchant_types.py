@@ -1,20 +1,16 @@
 from fastapi import APIRouter
-from sqlalchemy import select
 
 from app.dependencies import SessionDep
-from app.models.merchant import MerchantType
+from app.models.merchant import TypePublic
+from app.query_metrics import InstrumentedRoute
+from app.type_catalog import read_type_catalog
 
 
-router = APIRouter(prefix="/merchant-types", tags=["type"])
+router = APIRouter(
+    prefix="/merchant-types", tags=["type"], route_class=InstrumentedRoute
+)
 
 
-def format_type_name(type_name: str) -> str:
-    return type_name.replace("_", " ").title()
-
-
-@router.get("", response_model=list[str])
+@router.get("", response_model=list[TypePublic])
 def read_merchant_types(session: SessionDep):
-    stmt = select(MerchantType.type_name).distinct()
-    types = session.scalars(stmt).all()
-
-    return [format_type_name(type_name) for type_name in sorted(types)]
+    return read_type_catalog(session)
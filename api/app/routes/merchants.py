@@ -1,9 +1,12 @@
+from collections import Counter
 from typing import Annotated, Literal
 
 from fastapi import APIRouter, HTTPException, Query
-from sqlalchemy import func, select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import func, literal, literal_column, or_, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import defer, joinedload, selectinload
 
+from app.config import settings
 from app.dependencies import SessionDep
 from app.models.merchant import (
     Amenity,
@@ -11,6 +14,7 @@ from app.models.merchant import (
     Merchant,
     MerchantDetail,
     MerchantListItem,
+    MerchantReviewStats,
     MerchantsPublic,
     MerchantType,
     MerchantTypePublic,
@@ -18,16 +22,99 @@ from app.models.merchant import (
     OpeningHoursPublic,
     Photo,
     PhotoPublic,
+    PhotoVariantPublic,
     Review,
     ReviewPublic,
+    ReviewsPublic,
+    ReviewStatsPublic,
+    ReviewSummaryPublic,
+    TypePublic,
 )
-from app.models.utils import PaginationMeta
+from app.models.utils import CursorMeta, PaginationMeta
+from app.pagination import decode_cursor, encode_cursor
+from app.query_metrics import InstrumentedRoute
+from app.storage import resolve_blob_url
+from app.type_catalog import format_type_name, read_type_catalog
+
+router = APIRouter(
+    prefix="/merchants", tags=["merchants"], route_class=InstrumentedRoute
+)
+
+# How photo placeholders are sent: a ThumbHash string, a blur data URL or none
+Placeholder = Literal["hash", "dataurl", "none"]
+
+MAX_TYPE_FILTERS = 20
+
+# Both search vectors in one tsvector, written exactly as the expression of
+# merchants_search_vector_all_idx (migrations/fts_auto.py) so that index is
+# used for ?lang=auto
+SEARCH_VECTOR_ALL = literal_column(
+    "(COALESCE(merchants.search_vector_en, ''::tsvector)"
+    " || COALESCE(merchants.search_vector_id, ''::tsvector))",
+    TSVECTOR,
+)
+
+
+def parse_type_slugs(types: str | None, type: str | None) -> list[str]:
+    """Type slugs from ?types=a,b (and the deprecated ?type=), deduplicated"""
+    slugs = (types or "").split(",") + [type or ""]
+    slugs = list(dict.fromkeys(slug.strip() for slug in slugs if slug.strip()))
+    if len(slugs) > MAX_TYPE_FILTERS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_TYPE_FILTERS} types can be given"
+        )
+    return slugs
+
+
+def word_similarity_threshold(search: str) -> float:
+    """
+    The pg_trgm.word_similarity_threshold for a query
+
+    Short queries have few trigrams, so a loose threshold would let them
+    match almost anything; they get the stricter thresholds.
+    """
+    thresholds = sorted(settings.SEARCH_WORD_SIMILARITY_THRESHOLDS.items())
+    threshold = thresholds[0][1] if thresholds else 0.6
+    for min_length, value in thresholds:
+        if len(search) >= min_length:
+            threshold = value
+    return threshold
 
-router = APIRouter(prefix="/merchants", tags=["merchants"])
 
+def format_photo_variants(photo: Photo | None) -> list[PhotoVariantPublic]:
+    if photo is None:
+        return []
+
+    return [
+        PhotoVariantPublic(
+            url=resolve_blob_url(variant.url),
+            format=variant.format,
+            width=variant.width,
+            height=variant.height,
+        )
+        for variant in photo.variants
+    ]
 
-def format_type_name(type_name: str) -> str:
-    return type_name.replace("_", " ").title()
+
+def format_review_stats(stats: MerchantReviewStats | None) -> ReviewStatsPublic | None:
+    if stats is None:
+        return None
+
+    return ReviewStatsPublic(
+        review_count=stats.review_count,
+        average_rating=(
+            stats.rating_sum / stats.review_count if stats.review_count else None
+        ),
+        histogram=[
+            stats.rating_1,
+            stats.rating_2,
+            stats.rating_3,
+            stats.rating_4,
+            stats.rating_5,
+        ],
+        latest_published_at=stats.latest_published_at,
+        latest_review_id=stats.latest_review_id,
+    )
 
 
 @router.get("", response_model=MerchantsPublic)
@@ -36,16 +123,25 @@ def read_merchants(
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=100)] = 10,
     search: Annotated[str | None, Query()] = None,
-    type: Annotated[str | None, Query()] = None,
-    lang: Annotated[Literal["english", "indonesian"], Query()] = "english",
+    types: Annotated[
+        str | None, Query(description="Comma-separated type slugs")
+    ] = None,
+    types_mode: Annotated[Literal["any", "all"], Query()] = "any",
+    type: Annotated[str | None, Query(deprecated=True)] = None,
+    lang: Annotated[Literal["english", "indonesian", "auto"], Query()] = "english",
     sort_by: Annotated[
         Literal["name", "rating", "distance", "created_at"], Query()
     ] = "created_at",
     sort_order: Annotated[Literal["asc", "desc"], Query()] = "desc",
+    placeholder: Annotated[Placeholder, Query()] = "dataurl",
 ):
-    stmt = select(Merchant).options(selectinload(Merchant.photos))
+    photos_loader = selectinload(Merchant.photos)
+    if placeholder != "dataurl":
+        photos_loader = photos_loader.defer(Photo.blur_data_url)
+    stmt = select(Merchant).options(photos_loader.selectinload(Photo.variants))
     rank_expr = None
     similarity_expr = None
+    candidate_sources = []
 
     if search:
         search = search.strip()
@@ -53,43 +149,107 @@ def read_merchants(
         search = None
 
     if search:
-        ts_config = "english" if lang == "english" else "indonesian"
-        search_vector_col = (
-            Merchant.search_vector_en
-            if lang == "english"
-            else Merchant.search_vector_id
-        )
-        tsquery = func.plainto_tsquery(ts_config, search)
-
-        fts_condition = search_vector_col.isnot(None) & search_vector_col.op("@@")(
-            tsquery
-        )
-
-        similarity_display = Merchant.display_name.isnot(
-            None
-        ) & Merchant.display_name.op("%")(search)
-        similarity_address = Merchant.short_address.isnot(
-            None
-        ) & Merchant.short_address.op("%")(search)
-        trigram_condition = similarity_display | similarity_address
+        if lang == "auto":
+            tsquery_en = func.plainto_tsquery("english", search)
+            tsquery_id = func.plainto_tsquery("indonesian", search)
+
+            # Matches when either language's query matches, in one lookup on
+            # the combined index; ranked by whichever language fits better
+            fts_condition = SEARCH_VECTOR_ALL.op("@@")(tsquery_en.op("||")(tsquery_id))
+            rank_expr = func.greatest(
+                func.ts_rank(Merchant.search_vector_en, tsquery_en),
+                func.ts_rank(Merchant.search_vector_id, tsquery_id),
+            )
+        else:
+            ts_config = "english" if lang == "english" else "indonesian"
+            search_vector_col = (
+                Merchant.search_vector_en
+                if lang == "english"
+                else Merchant.search_vector_id
+            )
+            tsquery = func.plainto_tsquery(ts_config, search)
 
-        stmt = stmt.where(fts_condition | trigram_condition)
+            fts_condition = search_vector_col.isnot(None) & search_vector_col.op("@@")(
+                tsquery
+            )
+            rank_expr = func.ts_rank(
+                func.coalesce(search_vector_col, func.to_tsvector(ts_config, "")),
+                tsquery,
+            )
 
-        rank_expr = func.ts_rank(
-            func.coalesce(search_vector_col, func.to_tsvector(ts_config, "")), tsquery
+        # `search <% column` (word similarity: the query against the closest
+        # part of the column) uses the threshold set for this transaction
+        session.execute(
+            select(
+                func.set_config(
+                    "pg_trgm.word_similarity_threshold",
+                    str(word_similarity_threshold(search)),
+                    True,
+                )
+            )
         )
+        query = literal(search)
+        # Where the candidates come from, none of them scored: full-text
+        # matches by id, which for frequent terms lets the planner walk the
+        # primary key and stop at the limit instead of ranking every match,
+        # and fuzzy matches on name and on address nearest first, in the order
+        # the GiST trigram indexes (migrations/trgm_gist.py) return them. The
+        # name source also brings in the exact name hits a capped full-text
+        # source can miss
+        candidate_sources = [
+            select(Merchant.id).where(fts_condition).order_by(Merchant.id),
+            select(Merchant.id)
+            .where(query.op("<%")(Merchant.display_name))
+            .order_by(query.op("<<->")(Merchant.display_name), Merchant.id),
+            select(Merchant.id)
+            .where(query.op("<%")(Merchant.short_address))
+            .order_by(query.op("<<->")(Merchant.short_address), Merchant.id),
+        ]
 
-        similarity_display_score = func.similarity(Merchant.display_name, search)
-        similarity_address_score = func.similarity(Merchant.short_address, search)
         similarity_expr = func.greatest(
-            func.coalesce(similarity_display_score, 0),
-            func.coalesce(similarity_address_score, 0),
+            func.coalesce(func.word_similarity(search, Merchant.display_name), 0),
+            func.coalesce(func.word_similarity(search, Merchant.short_address), 0),
         )
 
-    if type:
-        stmt = stmt.join(Merchant.types).where(MerchantType.type_name == type)
+    type_slugs = parse_type_slugs(types, type)
+    type_condition = None
+    if type_slugs:
+        # Both operators use the GIN index on type_slugs; no join, so each
+        # merchant is counted once
+        type_condition = (
+            Merchant.type_slugs.contains(type_slugs)
+            if types_mode == "all"
+            else Merchant.type_slugs.overlap(type_slugs)
+        )
+
+    total_is_estimate = False
+    if candidate_sources:
+        # Two phases: the best SEARCH_CANDIDATE_LIMIT ids of each source, in
+        # one query, then exact ranking of only those candidates below. When
+        # a source is cut off, matches past it are not shown and the total
+        # is only a lower bound
+        limit = settings.SEARCH_CANDIDATE_LIMIT
+        sources = []
+        for index, source in enumerate(candidate_sources):
+            if type_condition is not None:
+                source = source.where(type_condition)
+            sources.append(
+                source.add_columns(literal(index).label("source")).limit(limit)
+            )
+        rows = session.execute(union_all(*sources)).all()
+
+        candidate_ids = list(dict.fromkeys(merchant_id for merchant_id, _ in rows))
+        source_counts = Counter(source for _, source in rows)
+        total_is_estimate = any(count >= limit for count in source_counts.values())
 
-    total_count = session.scalar(select(func.count()).select_from(stmt.subquery())) or 0
+        stmt = stmt.where(Merchant.id.in_(candidate_ids))
+        total_count = len(candidate_ids)
+    else:
+        if type_condition is not None:
+            stmt = stmt.where(type_condition)
+        total_count = (
+            session.scalar(select(func.count()).select_from(stmt.subquery())) or 0
+        )
 
     if search and rank_expr is not None:
         combined_rank = (
@@ -112,8 +272,8 @@ def read_merchants(
                 if sort_order == "asc"
                 else Merchant.created_at.desc()
             )
-        else:
-            order_columns.append(Merchant.id.asc())
+        # Ties in the same order on every page
+        order_columns.append(Merchant.id.asc())
 
         stmt = stmt.order_by(*order_columns)
     else:
@@ -139,6 +299,7 @@ def read_merchants(
         stmt = stmt.order_by(order_column)
 
     offset = (page - 1) * page_size
+    stmt = stmt.options(joinedload(Merchant.review_stats))
     stmt = stmt.offset(offset).limit(page_size)
 
     merchants = session.scalars(stmt).all()
@@ -162,13 +323,18 @@ def read_merchants(
                 short_address=merchant.short_address,
                 rating=merchant.rating,
                 user_rating_count=merchant.user_rating_count,
-                type_count=len(merchant.types),
-                photo_url=merchant.photo_url,
+                type_count=len(merchant.type_slugs),
+                photo_url=resolve_blob_url(merchant.photo_url),
                 photo_width=primary_photo.width if primary_photo else None,
                 photo_height=primary_photo.height if primary_photo else None,
                 photo_blur_data_url=primary_photo.blur_data_url
-                if primary_photo
+                if primary_photo and placeholder == "dataurl"
+                else None,
+                photo_thumb_hash=primary_photo.thumb_hash
+                if primary_photo and placeholder == "hash"
                 else None,
+                photo_variants=format_photo_variants(primary_photo),
+                review_stats=format_review_stats(merchant.review_stats),
             )
         )
 
@@ -180,6 +346,7 @@ def read_merchants(
         data=merchant_items,
         meta=PaginationMeta(
             total=total_count,
+            total_is_estimate=total_is_estimate,
             page=page,
             page_size=page_size,
             total_pages=total_pages,
@@ -189,12 +356,9 @@ def read_merchants(
     )
 
 
-@router.get("/types", response_model=list[str])
+@router.get("/types", response_model=list[TypePublic])
 def read_merchant_types(session: SessionDep):
-    stmt = select(MerchantType.type_name).distinct()
-    types = session.scalars(stmt).all()
-
-    return [format_type_name(type_name) for type_name in sorted(types)]
+    return read_type_catalog(session)
 
 
 @router.get("/{merchant_id}", response_model=MerchantDetail)
@@ -203,7 +367,11 @@ def read_merchant(
     session: SessionDep,
     lang: Annotated[Literal["english", "indonesian"], Query()] = "english",
 ):
-    stmt = select(Merchant).where(Merchant.id == merchant_id).options(selectinload(Merchant.photos))
+    stmt = (
+        select(Merchant)
+        .where(Merchant.id == merchant_id)
+        .options(selectinload(Merchant.photos), joinedload(Merchant.review_stats))
+    )
     merchant = session.scalar(stmt)
 
     if not merchant:
@@ -225,7 +393,7 @@ def read_merchant(
         phone_national=merchant.phone_national,
         phone_international=merchant.phone_international,
         website=merchant.website,
-        photo_url=merchant.photo_url,
+        photo_url=resolve_blob_url(merchant.photo_url),
         photo_width=primary_photo.width if primary_photo else None,
         photo_height=primary_photo.height if primary_photo else None,
         photo_blur_data_url=primary_photo.blur_data_url if primary_photo else None,
@@ -236,11 +404,16 @@ def read_merchant(
         longitude=merchant.longitude,
         rating=merchant.rating,
         user_rating_count=merchant.user_rating_count,
+        review_stats=format_review_stats(merchant.review_stats),
     )
 
 
 @router.get("/{merchant_id}/photos", response_model=list[PhotoPublic])
-def read_merchant_photos(merchant_id: int, session: SessionDep):
+def read_merchant_photos(
+    merchant_id: int,
+    session: SessionDep,
+    placeholder: Annotated[Placeholder, Query()] = "dataurl",
+):
     stmt = select(Merchant).where(Merchant.id == merchant_id)
     merchant = session.scalar(stmt)
 
@@ -250,27 +423,40 @@ def read_merchant_photos(merchant_id: int, session: SessionDep):
     stmt = (
         select(Photo)
         .where(Photo.merchant_id == merchant_id)
+        .options(selectinload(Photo.variants))
         .order_by(Photo.is_primary.desc(), Photo.order.asc())
     )
+    if placeholder != "dataurl":
+        stmt = stmt.options(defer(Photo.blur_data_url))
     photos = session.scalars(stmt).all()
 
     return [
         PhotoPublic(
             id=photo.id,
-            vercel_blob_url=photo.vercel_blob_url,
+            url=resolve_blob_url(photo.blob_ref),
+            vercel_blob_url=resolve_blob_url(photo.blob_ref),
             file_extension=photo.file_extension,
             width=photo.width,
             height=photo.height,
-            blur_data_url=photo.blur_data_url,
+            blur_data_url=photo.blur_data_url if placeholder == "dataurl" else None,
+            thumb_hash=photo.thumb_hash if placeholder == "hash" else None,
             is_primary=photo.is_primary,
             order=photo.order,
+            variants=format_photo_variants(photo),
         )
         for photo in photos
     ]
 
 
-@router.get("/{merchant_id}/reviews", response_model=list[ReviewPublic])
-def read_merchant_reviews(merchant_id: int, session: SessionDep):
+@router.get("/{merchant_id}/reviews", response_model=ReviewsPublic)
+def read_merchant_reviews(
+    merchant_id: int,
+    session: SessionDep,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Annotated[str | None, Query()] = None,
+    rating: Annotated[int | None, Query(ge=1, le=5)] = None,
+    fields: Annotated[Literal["full", "compact"], Query()] = "full",
+):
     stmt = select(Merchant).where(Merchant.id == merchant_id)
     merchant = session.scalar(stmt)
 
@@ -280,23 +466,46 @@ def read_merchant_reviews(merchant_id: int, session: SessionDep):
     stmt = (
         select(Review)
         .where(Review.merchant_id == merchant_id)
-        .order_by(Review.published_at.desc())
+        .order_by(Review.published_at.desc().nulls_last(), Review.id.desc())
     )
-    reviews = session.scalars(stmt).all()
 
-    return [
-        ReviewPublic(
-            id=review.id,
-            google_review_id=review.google_review_id,
-            rating=review.rating,
-            text=review.text,
-            author_name=review.author_name,
-            author_photo_uri=review.author_photo_uri,
-            published_at=review.published_at,
-            relative_time=review.relative_time,
-        )
-        for review in reviews
-    ]
+    if rating is not None:
+        stmt = stmt.where(Review.rating == rating)
+
+    if fields == "compact":
+        stmt = stmt.options(defer(Review.text))
+
+    if cursor:
+        published_at, review_id = decode_cursor(cursor)
+        if published_at is None:
+            stmt = stmt.where(Review.published_at.is_(None), Review.id < review_id)
+        else:
+            stmt = stmt.where(
+                or_(
+                    tuple_(Review.published_at, Review.id)
+                    < tuple_(published_at, review_id),
+                    Review.published_at.is_(None),
+                )
+            )
+
+    reviews = session.scalars(stmt.limit(limit + 1)).all()
+    has_next = len(reviews) > limit
+    reviews = reviews[:limit]
+
+    review_model = ReviewSummaryPublic if fields == "compact" else ReviewPublic
+
+    return ReviewsPublic(
+        data=[review_model.model_validate(review) for review in reviews],
+        meta=CursorMeta(
+            limit=limit,
+            has_next=has_next,
+            next_cursor=(
+                encode_cursor(reviews[-1].published_at, reviews[-1].id)
+                if has_next
+                else None
+            ),
+        ),
+    )
 
 
 @router.get("/{merchant_id}/types", response_model=list[MerchantTypePublic])
@@ -313,6 +522,7 @@ def read_merchant_types_detail(merchant_id: int, session: SessionDep):
     return [
         MerchantTypePublic(
             id=type_obj.id,
+            slug=type_obj.type_name,
             type_name=format_type_name(type_obj.type_name),
         )
         for type_obj in types
@@ -2,8 +2,9 @@ from fastapi import APIRouter
 
 from app.dependencies import CurrentUser
 from app.models.user import UserPublic
+from app.query_metrics import InstrumentedRoute
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=InstrumentedRoute)
 
 
 @router.get("/me", response_model=UserPublic)
@@ -1,10 +1,32 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.cache import CacheStats, all_cache_stats
+from app.dependencies import get_current_user
+from app.images import ImageProxyStats, image_proxy
 from app.models.utils import Status
+from app.query_metrics import InstrumentedRoute
 
-router = APIRouter(prefix="/utils", tags=["utils"])
+router = APIRouter(prefix="/utils", tags=["utils"], route_class=InstrumentedRoute)
 
 
 @router.get("", response_model=Status)
 def health_check():
     return Status(ok=True)
+
+
+@router.get(
+    "/caches",
+    response_model=list[CacheStats],
+    dependencies=[Depends(get_current_user)],
+)
+def read_cache_stats():
+    return all_cache_stats()
+
+
+@router.get(
+    "/images",
+    response_model=ImageProxyStats,
+    dependencies=[Depends(get_current_user)],
+)
+def read_image_proxy_stats():
+    return image_proxy.stats()
@@ -0,0 +1,88 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.config import settings
+
+T = TypeVar("T")
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.ARGON2_TIME_COST,
+    # passlib only flags hashes for an update when their time cost is outside
+    # these bounds; it never compares parallelism (see _verify_and_update)
+    argon2__min_rounds=settings.ARGON2_TIME_COST,
+    argon2__max_rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# argon2-cffi releases the GIL while hashing, so a small dedicated thread pool
+# runs hashes in parallel. Callers await the pool from the event loop, so
+# waiting for a hash holds neither a request threadpool thread nor a worker.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+# Jobs running or queued in the pool; at most PASSWORD_HASH_QUEUE_SIZE wait
+_hash_slots = asyncio.Semaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE
+)
+
+
+def _busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _run_hash_job(fn: Callable[..., T], *args: str) -> T:
+    try:
+        await asyncio.wait_for(
+            _hash_slots.acquire(), settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS
+        )
+    except TimeoutError:
+        raise _busy_exception() from None
+
+    try:
+        # Holding a slot bounds the wait: the pool never has more than
+        # PASSWORD_HASH_QUEUE_SIZE jobs queued ahead of this one
+        return await asyncio.wrap_future(_hash_executor.submit(fn, *args))
+    finally:
+        _hash_slots.release()
+
+
+def _verify_and_update(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    verified, new_hash = pwd_context.verify_and_update(password, hashed_password)
+    if verified and new_hash is None:
+        stored = pwd_context.handler("argon2").from_string(hashed_password)
+        if stored.parallelism != settings.ARGON2_PARALLELISM:
+            new_hash = pwd_context.hash(password)
+    return verified, new_hash
+
+
+async def hash_password(password: str) -> str:
+    return await _run_hash_job(pwd_context.hash, password)
+
+
+async def verify_password(
+    password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify a password against its stored hash.
+
+    Returns whether the password matched and, when the stored hash was made
+    with outdated argon2 parameters, a replacement hash to persist.
+    """
+    return await _run_hash_job(_verify_and_update, password, hashed_password)
+
+
+def shutdown_password_hashing() -> None:
+    _hash_executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,207 @@
+"""
+Blob storage for merchant photos
+
+Photos keep a backend-neutral blob reference instead of a URL:
+
+- "local:{path}" for blobs stored under LOCAL_BLOB_ROOT, served by the
+  /blobs route (or whatever serves LOCAL_BLOB_BASE_URL)
+- the blob URL for Vercel Blob, whose URLs can't be derived from the path
+
+resolve_blob_url() turns a reference into the URL clients should load.
+"""
+
+import hashlib
+import random
+import shutil
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Protocol
+from urllib.parse import quote
+
+import requests
+
+from app.config import settings
+
+LOCAL_PREFIX = "local:"
+
+CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+}
+
+
+def content_type_for(path: Path) -> str:
+    return CONTENT_TYPES.get(path.suffix.lower(), "application/octet-stream")
+
+
+def write_atomically(target: Path, write: Callable[[IO[bytes]], object]) -> None:
+    """
+    Write target through a temporary file renamed over it, so readers never
+    see a partial file; the temporary file is removed if writing fails
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=target.parent, delete=False) as tmp:
+        tmp_path = Path(tmp.name)
+        try:
+            write(tmp)
+            tmp.close()
+            # Temporary files are created 0600, which would keep other servers
+            # of the directory (whatever serves LOCAL_BLOB_BASE_URL) from
+            # reading it
+            tmp_path.chmod(0o644)
+            tmp_path.replace(target)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+
+def resolve_blob_url(reference: str | None) -> str | None:
+    if reference is None or not reference.startswith(LOCAL_PREFIX):
+        return reference
+    blob_path = quote(reference.removeprefix(LOCAL_PREFIX))
+    return f"{settings.LOCAL_BLOB_BASE_URL.rstrip('/')}/{blob_path}"
+
+
+_http = requests.Session()
+
+
+def fetch_blob(reference: str) -> bytes:
+    """The content of a blob, read from disk for local references"""
+    if reference.startswith(LOCAL_PREFIX):
+        local = LocalBlobStorage(Path(settings.LOCAL_BLOB_ROOT))
+        path = local.path_for(reference.removeprefix(LOCAL_PREFIX))
+        if path is None:
+            raise FileNotFoundError(reference)
+        return path.read_bytes()
+
+    response = _http.get(reference, timeout=30)
+    response.raise_for_status()
+    return response.content
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches etag, so a 304 can be sent"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+class BlobUploadError(Exception):
+    """An upload failed in a way that is worth retrying"""
+
+
+class BlobStorage(Protocol):
+    def upload(self, file_path: Path, blob_path: str, content_type: str) -> str:
+        """Store file_path at blob_path and return its blob reference"""
+        ...
+
+    def list(self, prefix: str) -> list[str]:
+        """References of the blobs whose path starts with prefix"""
+        ...
+
+    def delete(self, reference: str) -> None: ...
+
+
+class VercelBlobStorage:
+    def __init__(self, token: str):
+        # Imported here so local storage works without the Vercel SDK
+        from vercel.blob import BlobClient
+
+        self.token = token
+        self.client = BlobClient(token=token)
+
+    def upload(self, file_path: Path, blob_path: str, content_type: str) -> str:
+        uploaded = self.client.upload_file(
+            str(file_path),
+            blob_path,
+            access="public",
+            content_type=content_type,
+        )
+        return uploaded.url
+
+    def list(self, prefix: str) -> list[str]:
+        from vercel.blob import list_objects
+
+        result = list_objects(token=self.token)
+        return [blob.url for blob in result.blobs if blob.pathname.startswith(prefix)]
+
+    def delete(self, reference: str) -> None:
+        from vercel.blob import delete
+
+        delete(reference, token=self.token)
+
+
+class LocalBlobStorage:
+    """
+    Blobs as files under root, named after their content like Vercel's
+    random suffixes ("primary-3f2a9c....jpg"), so a re-upload gets a new
+    name and the served files can be cached as immutable.
+
+    latency_seconds and failure_rate simulate a remote store, for running
+    and benchmarking uploads offline.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        latency_seconds: float = 0.0,
+        failure_rate: float = 0.0,
+    ):
+        self.root = root
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+
+    def upload(self, file_path: Path, blob_path: str, content_type: str) -> str:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise BlobUploadError(f"Simulated failure uploading {blob_path}")
+
+        with file_path.open("rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()[:16]
+        path = Path(blob_path)
+        blob_path = str(path.with_name(f"{path.stem}-{digest}{path.suffix}"))
+
+        def copy(tmp: IO[bytes]) -> None:
+            with file_path.open("rb") as source:
+                shutil.copyfileobj(source, tmp)
+
+        write_atomically(self.root / blob_path, copy)
+        return f"{LOCAL_PREFIX}{blob_path}"
+
+    def list(self, prefix: str) -> list[str]:
+        return [
+            f"{LOCAL_PREFIX}{path.relative_to(self.root).as_posix()}"
+            for path in sorted(self.root.rglob("*"))
+            if path.is_file()
+            and path.relative_to(self.root).as_posix().startswith(prefix)
+        ]
+
+    def delete(self, reference: str) -> None:
+        path = self.path_for(reference.removeprefix(LOCAL_PREFIX))
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def path_for(self, blob_path: str) -> Path | None:
+        """The file for a blob path, or None if it points outside the root"""
+        root = self.root.resolve()
+        path = (root / blob_path).resolve()
+        return path if path.is_relative_to(root) and path != root else None
+
+
+def get_storage(backend: str | None = None) -> BlobStorage:
+    """The configured storage backend (BLOB_STORAGE unless one is given)"""
+    backend = backend or settings.BLOB_STORAGE
+    if backend == "local":
+        return LocalBlobStorage(Path(settings.LOCAL_BLOB_ROOT))
+    if not settings.BLOB_READ_WRITE_TOKEN:
+        raise ValueError("BLOB_READ_WRITE_TOKEN not found in environment variables")
+    return VercelBlobStorage(settings.BLOB_READ_WRITE_TOKEN)
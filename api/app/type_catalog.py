@@ -0,0 +1,105 @@
+"""
+The merchant type catalog: every type slug with its merchant count
+
+Counts live in the types lookup table, which refresh_type_counts() brings up
+to date after ingest. Each refresh that changes anything bumps the "types"
+row of catalog_versions, and read_type_catalog() caches the catalog under
+that version: a request costs one primary key lookup until the catalog
+changes, and every worker sees the change on its next request.
+"""
+
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache, register_cache
+from app.models import CatalogVersion, Type
+from app.models.merchant import TypePublic
+
+CATALOG_NAME = "types"
+
+# Keyed by catalog version, so entries never go stale; the TTL only frees
+# versions nobody asks for anymore
+type_catalog_cache: TTLCache[int, list[TypePublic]] = register_cache(
+    TTLCache("type_catalog", max_size=2, ttl_seconds=24 * 60 * 60)
+)
+
+
+def format_type_name(type_name: str) -> str:
+    return type_name.replace("_", " ").title()
+
+
+def read_type_catalog(session: Session) -> list[TypePublic]:
+    version = session.scalar(
+        select(CatalogVersion.version).where(CatalogVersion.name == CATALOG_NAME)
+    )
+    version = version or 0
+
+    catalog = type_catalog_cache.get(version)
+    if catalog is not None:
+        return catalog
+
+    started = time.perf_counter()
+    stmt = (
+        select(Type.slug, Type.merchant_count)
+        .where(Type.merchant_count > 0)
+        .order_by(Type.slug)
+    )
+    catalog = [
+        TypePublic(
+            slug=slug, name=format_type_name(slug), merchant_count=merchant_count
+        )
+        for slug, merchant_count in session.execute(stmt)
+    ]
+    type_catalog_cache.record_miss_latency(time.perf_counter() - started)
+    type_catalog_cache.set(version, catalog)
+    return catalog
+
+
+def refresh_type_counts(session: Session) -> bool:
+    """
+    Recount merchants per type from merchant_types and commit
+
+    Returns whether any count changed, in which case the catalog version is
+    bumped.
+    """
+    upserted = session.execute(
+        text(
+            """
+            INSERT INTO types (slug, merchant_count)
+            SELECT type_name, COUNT(DISTINCT merchant_id)
+            FROM merchant_types
+            GROUP BY type_name
+            ON CONFLICT (slug) DO UPDATE
+            SET merchant_count = EXCLUDED.merchant_count
+            WHERE types.merchant_count <> EXCLUDED.merchant_count
+        """
+        )
+    ).rowcount
+    emptied = session.execute(
+        text(
+            """
+            UPDATE types SET merchant_count = 0
+            WHERE merchant_count > 0
+              AND NOT EXISTS (
+                  SELECT 1 FROM merchant_types WHERE type_name = types.slug
+              )
+        """
+        )
+    ).rowcount
+
+    changed = bool(upserted or emptied)
+    if changed:
+        session.execute(
+            text(
+                """
+                INSERT INTO catalog_versions (name, version) VALUES (:name, 1)
+                ON CONFLICT (name) DO UPDATE
+                SET version = catalog_versions.version + 1
+            """
+            ),
+            {"name": CATALOG_NAME},
+        )
+    session.commit()
+    return changed
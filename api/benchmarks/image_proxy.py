@@ -0,0 +1,127 @@
+"""
+Benchmark the GET /images/{photo_id} resize proxy, cold and warm
+
+This script:
+1. Requests every photo at each width and the given quality; on a server
+   whose IMAGE_CACHE_DIR doesn't hold these renders yet, this first pass
+   renders (identical concurrent requests share one render)
+2. Requests the same URLs again, which the disk cache answers
+3. Reports throughput and latency percentiles for both passes, followed by
+   the server's GET /utils/images metrics when --email and --password are
+   given to log in with
+
+Start the server with RATE_LIMIT_ENABLED=false, or requests past the
+GET /images/{photo_id} rate limit fail with 429.
+
+Usage:
+    uv run python -m benchmarks.image_proxy --url http://localhost:8000 \\
+        --photo-ids 1 2 3 --widths 384 640 1080 --concurrency 16
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from app.config import settings
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_pass(
+    session: requests.Session, urls: list[str], concurrency: int
+) -> tuple[float, list[float], int]:
+    def fetch(url: str) -> float | None:
+        started = time.perf_counter()
+        response = session.get(url, timeout=120)
+        if response.status_code != 200:
+            return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - started
+
+    latencies = [r for r in results if r is not None]
+    return elapsed, latencies, len(results) - len(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--photo-ids", type=int, nargs="+", required=True)
+    parser.add_argument("--widths", type=int, nargs="+", default=[384, 640, 1080])
+    parser.add_argument("--format", choices=["webp", "jpeg"], default="webp")
+    parser.add_argument(
+        "--quality", type=int, choices=settings.IMAGE_QUALITIES, default=75
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=4, help="Identical requests per URL and pass"
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--email", help="Log in to read GET /utils/images")
+    parser.add_argument("--password")
+    args = parser.parse_args()
+
+    api_url = f"{args.url.rstrip('/')}{settings.API_V1_STR}"
+    quality = args.quality
+    urls = [
+        f"{api_url}/images/{photo_id}?w={width}&q={quality}&fmt={args.format}"
+        for photo_id in args.photo_ids
+        for width in args.widths
+    ] * args.repeat
+    random.shuffle(urls)
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    print(f"\nStarting image proxy benchmark against {api_url}/images...")
+    print(f"{len(urls)} requests per pass, q={quality}, fmt={args.format}")
+
+    print(f"\n{'=' * 50}")
+    print(f"{'Pass':<8}{'Req/sec':>10}{'p50':>10}{'p99':>10}{'Failed':>10}")
+    for name in ("cold", "warm"):
+        elapsed, latencies, failed = run_pass(session, urls, args.concurrency)
+        print(
+            f"{name:<8}{len(latencies) / elapsed:>10.1f}"
+            f"{percentile(latencies, 50) * 1000:>8.1f}ms"
+            f"{percentile(latencies, 99) * 1000:>8.1f}ms{failed:>10}"
+        )
+    print(f"{'=' * 50}")
+
+    if not (args.email and args.password):
+        print()
+        return
+
+    login = session.post(
+        f"{api_url}/auth/login",
+        data={"username": args.email, "password": args.password},
+        timeout=60,
+    )
+    login.raise_for_status()
+    stats = session.get(
+        f"{api_url}/utils/images",
+        headers={"Authorization": f"Bearer {login.json()['access_token']}"},
+        timeout=30,
+    ).json()
+    print("\nServer metrics (GET /utils/images):")
+    for key, value in stats.items():
+        print(
+            f"  {key}: {value:.2f}" if isinstance(value, float) else f"  {key}: {value}"
+        )
+    print()
+
+
+if __name__ == "__main__":
+    main()
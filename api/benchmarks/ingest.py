@@ -0,0 +1,104 @@
+"""
+Benchmark parallel ingest throughput against worker count
+
+This script:
+1. Writes synthetic NDJSON exports built from the sample data files
+2. Runs migrations.ingest over them once per worker count, with fresh ids
+   each run so every run measures inserts
+3. Reports rows/sec and the speedup over the first worker count
+4. Deletes the synthetic merchants it created (unless --keep)
+
+It writes to the configured database, so point DATABASE_URL at a scratch one.
+
+Usage:
+    uv run python -m benchmarks.ingest --workers 1 2 4 8 --files 8 --copies 25
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import delete
+
+from app.database import SessionLocal, engine
+from app.models import Merchant
+from app.models.utils import Base
+from migrations.bulk_seed import synthetic_copy
+from migrations.ingest import ingest
+from migrations.place_stream import iter_places
+
+SAMPLE_FILES = ["data/limo.json", "data/pondok-labu.json"]
+
+
+def write_files(
+    directory: Path, places: list[dict], run: int, files: int, copies: int
+) -> list[Path]:
+    paths: list[Path] = []
+    for index in range(files):
+        path = directory / f"run-{run}-{index}.ndjson"
+        with path.open("w", encoding="utf-8") as f:
+            for copy in range(copies):
+                tag = (run * files + index) * copies + copy + 1
+                for place in places:
+                    f.write(json.dumps(synthetic_copy(place, tag)) + "\n")
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--copies", type=int, default=25, help="Per file")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    places = [
+        place
+        for file_path in SAMPLE_FILES
+        for place in iter_places(file_path)
+        if place.get("id")
+    ]
+    print(
+        f"\nStarting ingest benchmark: {args.files} files x {args.copies} copies "
+        f"x {len(places)} places per run..."
+    )
+
+    Base.metadata.create_all(engine)
+
+    results: list[tuple[int, int, float]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for run, workers in enumerate(args.workers):
+            files = write_files(Path(tmp), places, run, args.files, args.copies)
+            started = time.perf_counter()
+            result = ingest(files, workers, args.batch_size)
+            elapsed = time.perf_counter() - started
+            results.append((workers, sum(result.rows.values()), elapsed))
+            if result.errors:
+                print(f"  {len(result.errors)} errors, first: {result.errors[0]}")
+
+    print(f"\n{'=' * 50}")
+    print(f"{'Workers':<10}{'Rows':>10}{'Seconds':>10}{'Rows/sec':>12}{'Speedup':>8}")
+    baseline = results[0][1] / results[0][2]
+    for workers, rows, elapsed in results:
+        rate = rows / elapsed
+        print(
+            f"{workers:<10}{rows:>10}{elapsed:>10.2f}{rate:>12.0f}"
+            f"{rate / baseline:>7.1f}x"
+        )
+    print(f"{'=' * 50}\n")
+
+    if not args.keep:
+        with SessionLocal() as session:
+            session.execute(
+                delete(Merchant).where(Merchant.google_place_id.like("%-synthetic-%"))
+            )
+            session.commit()
+        print("Deleted synthetic merchants")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark merchant list payload size for each photo placeholder format
+
+This script:
+1. Requests GET /merchants on a running server for each page size and
+   ?placeholder= option
+2. Reports the JSON body size, its gzip size, bytes per merchant and the
+   median response time
+
+Usage:
+    uv run python -m benchmarks.list_payload --url http://localhost:8000 \\
+        --page-sizes 10 50 100
+"""
+
+import argparse
+import gzip
+import statistics
+import time
+
+import requests
+
+from app.config import settings
+
+PLACEHOLDERS = ["dataurl", "hash", "none"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--repeat", type=int, default=5, help="Requests per case")
+    parser.add_argument("--url", default="http://localhost:8000")
+    args = parser.parse_args()
+
+    list_url = f"{args.url.rstrip('/')}{settings.API_V1_STR}/merchants"
+    session = requests.Session()
+
+    print(f"\nStarting list payload benchmark against {list_url}...")
+
+    results: list[tuple[int, str, int, int, int, float]] = []
+    for page_size in args.page_sizes:
+        for placeholder in PLACEHOLDERS:
+            params = {"page_size": page_size, "placeholder": placeholder}
+            timings: list[float] = []
+            body = b""
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = session.get(list_url, params=params, timeout=60)
+                timings.append(time.perf_counter() - started)
+                response.raise_for_status()
+                body = response.content
+
+            items = len(response.json()["data"])
+            results.append(
+                (
+                    page_size,
+                    placeholder,
+                    len(body),
+                    len(gzip.compress(body)),
+                    items,
+                    statistics.median(timings),
+                )
+            )
+
+    print(f"\n{'=' * 50}")
+    print(
+        f"{'Page':<6}{'Placeholder':<13}{'Bytes':>9}{'Gzip':>8}"
+        f"{'Per item':>10}{'Median':>10}"
+    )
+    for page_size, placeholder, size, gzipped, items, median in results:
+        per_item = size / items if items else 0
+        print(
+            f"{page_size:<6}{placeholder:<13}{size:>9}{gzipped:>8}"
+            f"{per_item:>10.0f}{median * 1000:>8.1f}ms"
+        )
+    print(f"{'=' * 50}\n")
+
+
+if __name__ == "__main__":
+    main()
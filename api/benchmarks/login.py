@@ -0,0 +1,126 @@
+"""
+Benchmark login throughput through the bounded password hashing pool
+
+This script:
+1. Hashes a password with the configured argon2 parameters
+2. Runs concurrent "logins" (password verifications) through the hashing pool
+3. Reports throughput, latency percentiles and how many requests were rejected
+
+With --url it instead drives POST /auth/login on a running server with an
+existing account, so the whole request path (DB lookup included) is measured.
+
+Usage:
+    uv run python -m benchmarks.login --concurrency 32 --requests 200
+    uv run python -m benchmarks.login --url http://localhost:8000 \\
+        --email user@example.com --password secret
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from fastapi import HTTPException
+
+from app.config import settings
+from app.security import hash_password, verify_password
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_in_process(password: str, total: int, concurrency: int) -> None:
+    hashed = await hash_password(password)
+    clients = asyncio.Semaphore(concurrency)
+
+    async def attempt() -> float | None:
+        async with clients:
+            started = time.perf_counter()
+            try:
+                await verify_password(password, hashed)
+            except HTTPException:
+                return None
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(attempt() for _ in range(total)))
+    report(results, time.perf_counter() - started, concurrency)
+
+
+def run_http(url: str, email: str, password: str, total: int, concurrency: int) -> None:
+    login_url = f"{url.rstrip('/')}{settings.API_V1_STR}/auth/login"
+    session = requests.Session()
+
+    def attempt(_: int) -> float | None:
+        started = time.perf_counter()
+        response = session.post(
+            login_url, data={"username": email, "password": password}, timeout=60
+        )
+        if response.status_code != 200:
+            return None
+        return time.perf_counter() - started
+
+    run_concurrently(attempt, total, concurrency)
+
+
+def run_concurrently(
+    attempt: Callable[[int], float | None], total: int, concurrency: int
+) -> None:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(attempt, range(total)))
+    report(results, time.perf_counter() - started, concurrency)
+
+
+def report(results: list[float | None], elapsed: float, concurrency: int) -> None:
+    total = len(results)
+    latencies = [r for r in results if r is not None]
+    rejected = total - len(latencies)
+
+    print(f"\n{'=' * 50}")
+    print(f"Requests: {total} (concurrency {concurrency})")
+    print(f"Succeeded: {len(latencies)}")
+    print(f"Rejected: {rejected}")
+    print(f"Throughput: {len(latencies) / elapsed:.1f} logins/sec")
+    if latencies:
+        print(f"Latency mean: {statistics.mean(latencies) * 1000:.1f} ms")
+        print(f"Latency p50: {percentile(latencies, 50) * 1000:.1f} ms")
+        print(f"Latency p99: {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"{'=' * 50}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--url", help="Benchmark a running server instead")
+    parser.add_argument("--email")
+    parser.add_argument("--password", default="correct horse battery staple")
+    args = parser.parse_args()
+
+    print("\nStarting login benchmark...")
+    print(
+        f"argon2: t={settings.ARGON2_TIME_COST} m={settings.ARGON2_MEMORY_COST} "
+        f"p={settings.ARGON2_PARALLELISM}, "
+        f"workers={settings.PASSWORD_HASH_WORKERS}, "
+        f"queue={settings.PASSWORD_HASH_QUEUE_SIZE}"
+    )
+
+    if args.url:
+        if not args.email:
+            parser.error("--email is required with --url")
+        run_http(args.url, args.email, args.password, args.requests, args.concurrency)
+    else:
+        asyncio.run(run_in_process(args.password, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark the concurrent photo upload pipeline offline
+
+This script:
+1. Builds upload jobs from data/merchant_photos and data/additional_photos
+2. Uploads them, with their responsive variants, to a local blob backend in a
+   temporary directory, with simulated network latency and failures
+3. Reports throughput for each concurrency level
+
+Photos are not recorded in the database, so no DATABASE_URL is needed.
+
+Usage:
+    uv run python -m benchmarks.photo_upload --concurrency 1 4 16 \\
+        --latency-ms 100 --failure-rate 0.05 --encode-workers 4
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from app.storage import LocalBlobStorage
+from migrations.photo_upload import (
+    PhotoUploader,
+    additional_photo_jobs,
+    primary_photo_jobs,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--encode-workers", type=int)
+    parser.add_argument("--no-variants", dest="variants", action="store_false")
+    args = parser.parse_args()
+
+    jobs = primary_photo_jobs(Path("data/merchant_photos"))
+    jobs += additional_photo_jobs(Path("data/additional_photos"))
+    print(
+        f"\nStarting photo upload benchmark: {len(jobs)} photos, "
+        f"{args.latency_ms:.0f} ms latency, {args.failure_rate:.0%} failures..."
+    )
+
+    results = []
+    for concurrency in args.concurrency:
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = LocalBlobStorage(
+                Path(tmp),
+                latency_seconds=args.latency_ms / 1000,
+                failure_rate=args.failure_rate,
+            )
+            uploader = PhotoUploader(
+                backend,
+                None,
+                concurrency=concurrency,
+                backoff_seconds=0.05,
+                variants=args.variants,
+                encode_workers=args.encode_workers,
+            )
+            results.append((concurrency, uploader.run(jobs)))
+
+    print(f"\n{'=' * 50}")
+    print(
+        f"{'Workers':<10}{'Photos':>8}{'Variants':>10}{'Errors':>8}{'Retries':>9}"
+        f"{'Photos/sec':>13}"
+    )
+    for concurrency, stats in results:
+        print(
+            f"{concurrency:<10}{stats.uploaded:>8}{stats.variants:>10}"
+            f"{stats.failed:>8}{stats.retries:>9}"
+            f"{stats.uploaded / stats.seconds:>13.1f}"
+        )
+    print(f"{'=' * 50}\n")
+
+
+if __name__ == "__main__":
+    main()
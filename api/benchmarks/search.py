@@ -0,0 +1,366 @@
+"""
+Benchmark merchant search latency for each ?lang= mode
+
+This script:
+1. Runs GET /merchants searches (the route function, against the configured
+   database) for English and Indonesian terms with lang=english, indonesian
+   and auto
+2. Reports latency percentiles and the average number of matches per mode,
+   and per term for lang=auto with the word similarity threshold it used
+3. With --synthetic ROWS, runs against a generated table of ROWS merchants in
+   the search_bench schema (built once, with the same indexes as merchants)
+   instead of the real data
+4. With --explain, prints the plans of the candidate and ranking queries of
+   each mode, to check that both phases are answered from the indexes
+
+Usage:
+    uv run python -m benchmarks.search --repeat 20
+    uv run python -m benchmarks.search --terms kopi coffee "nasi goreng" --explain
+    uv run python -m benchmarks.search --synthetic 1000000 --repeat 5
+"""
+
+import argparse
+import statistics
+import time
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+from app.routes.merchants import read_merchants, word_similarity_threshold
+
+LANGS = ["english", "indonesian", "auto"]
+
+DEFAULT_TERMS = [
+    "coffee",
+    "kopi",
+    "fried rice",
+    "nasi goreng",
+    "bakery",
+    "toko roti",
+    "laundry",
+    "warung",
+    "sate",
+    "warung makmur",
+    "fatmawati",
+    "laundri",
+]
+
+SYNTHETIC_SCHEMA = "search_bench"
+
+# Empty copies, so loading a page doesn't touch the real merchants' rows
+SYNTHETIC_RELATED_TABLES = ["photos", "photo_variants", "merchant_review_stats"]
+
+SYNTHETIC_WORDS = {
+    "first": [
+        "Warung",
+        "Toko",
+        "Kedai",
+        "Kopi",
+        "Bakso",
+        "Sate",
+        "Apotek",
+        "Laundry",
+        "Bengkel",
+        "Salon",
+        "Rumah Makan",
+        "Bakery",
+        "Minimarket",
+        "Depot",
+        "Coffee",
+    ],
+    "second": [
+        "Sederhana",
+        "Makmur",
+        "Jaya",
+        "Barokah",
+        "Sentosa",
+        "Bu Tini",
+        "Pak Budi",
+        "Mantap",
+        "Nusantara",
+        "Sejahtera",
+        "Abadi",
+        "Bahagia",
+        "Kenangan",
+        "Senja",
+        "Lestari",
+    ],
+    "streets": [
+        "Jl. Pondok Labu",
+        "Jl. Fatmawati",
+        "Jl. Cilandak KKO",
+        "Jl. Margasatwa",
+        "Jl. Kemang Raya",
+        "Jl. Ampera Raya",
+        "Jl. Karang Tengah",
+        "Jl. Pangeran Antasari",
+    ],
+    "types": [
+        "restaurant",
+        "cafe",
+        "coffee_shop",
+        "bakery",
+        "grocery_store",
+        "pharmacy",
+        "laundry",
+        "car_repair",
+        "beauty_salon",
+        "convenience_store",
+    ],
+    "descriptions_en": [
+        "Fried rice, noodles and satay cooked to order",
+        "Coffee, tea and fresh pastries",
+        "Fresh bread and cakes baked daily",
+        "Same day laundry and ironing",
+        "Car and motorcycle repair",
+        "Groceries and household goods",
+        "Medicine and health products",
+        "Haircuts and beauty treatments",
+    ],
+    "descriptions_id": [
+        "Nasi goreng, mie dan sate dimasak saat dipesan",
+        "Kopi, teh dan kue segar",
+        "Roti dan kue segar dipanggang setiap hari",
+        "Cuci dan setrika selesai hari ini",
+        "Servis mobil dan motor",
+        "Sembako dan kebutuhan rumah tangga",
+        "Obat dan produk kesehatan",
+        "Potong rambut dan perawatan kecantikan",
+    ],
+}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def build_synthetic(session: Session, rows: int, rebuild: bool) -> None:
+    """Fill search_bench.merchants with rows generated merchants"""
+    schema = SYNTHETIC_SCHEMA
+    if not rebuild:
+        existing = session.scalar(
+            text("SELECT to_regclass(:table)"), {"table": f"{schema}.merchants"}
+        )
+        if existing is not None:
+            count = session.scalar(text(f"SELECT COUNT(*) FROM {schema}.merchants"))
+            if count == rows:
+                print(f"Reusing {rows} synthetic merchants in {schema}")
+                return
+
+    print(f"Generating {rows} synthetic merchants in {schema}...")
+    started = time.perf_counter()
+    session.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    session.execute(text(f"CREATE SCHEMA {schema}"))
+    session.execute(
+        text(
+            f"CREATE TABLE {schema}.merchants "
+            "(LIKE public.merchants INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    for table in SYNTHETIC_RELATED_TABLES:
+        session.execute(
+            text(f"CREATE TABLE {schema}.{table} (LIKE public.{table} INCLUDING ALL)")
+        )
+
+    session.execute(text("SELECT setseed(0.42)"))
+    session.execute(
+        text(
+            f"""
+            WITH w AS (
+                SELECT
+                    CAST(:first AS TEXT[]) AS first,
+                    CAST(:second AS TEXT[]) AS second,
+                    CAST(:streets AS TEXT[]) AS streets,
+                    CAST(:types AS TEXT[]) AS types,
+                    CAST(:descriptions_en AS TEXT[]) AS descriptions_en,
+                    CAST(:descriptions_id AS TEXT[]) AS descriptions_id
+            ),
+            generated AS (
+                SELECT
+                    i.id,
+                    w.first[i.f] || ' ' || w.second[i.s] AS display_name,
+                    w.streets[i.st] || ' No. ' || (1 + i.id % 200) AS short_address,
+                    CASE WHEN i.t2 IS NULL THEN ARRAY[w.types[i.t1]]
+                         ELSE ARRAY[w.types[i.t1], w.types[i.t2]]
+                    END AS type_slugs,
+                    w.descriptions_en[i.d] AS description_en,
+                    w.descriptions_id[i.d] AS description_id
+                FROM (
+                    SELECT
+                        g AS id,
+                        1 + floor(random() * cardinality(w.first))::INT AS f,
+                        1 + floor(random() * cardinality(w.second))::INT AS s,
+                        1 + floor(random() * cardinality(w.streets))::INT AS st,
+                        1 + floor(random() * cardinality(w.types))::INT AS t1,
+                        CASE WHEN random() < 0.3
+                             THEN 1 + floor(random() * cardinality(w.types))::INT
+                        END AS t2,
+                        1 + floor(random() * cardinality(w.descriptions_en))::INT AS d
+                    FROM generate_series(1, :rows) AS g, w
+                ) AS i, w
+            )
+            INSERT INTO {schema}.merchants (
+                id, google_place_id, name, display_name, primary_type,
+                short_address, description_en, description_id, latitude,
+                longitude, rating, user_rating_count, created_at, updated_at,
+                type_slugs, search_vector_en, search_vector_id
+            )
+            SELECT
+                id, 'bench-' || id, display_name, display_name, type_slugs[1],
+                short_address, description_en, description_id,
+                -6.31 + random() * 0.05, 106.78 + random() * 0.05,
+                round((1 + random() * 4)::NUMERIC, 1), floor(random() * 500)::INT,
+                now() - random() * INTERVAL '730 days', now(), type_slugs,
+                merchants_search_document(
+                    'english', display_name, short_address, type_slugs,
+                    description_en
+                ),
+                merchants_search_document(
+                    'indonesian', display_name, short_address, type_slugs,
+                    description_id
+                )
+            FROM generated
+        """
+        ),
+        {"rows": rows, **SYNTHETIC_WORDS},
+    )
+
+    # Same indexes as the real table, whichever migrations created them
+    indexdefs = session.scalars(
+        text(
+            "SELECT indexdef FROM pg_indexes "
+            "WHERE schemaname = 'public' AND tablename = 'merchants'"
+        )
+    ).all()
+    for indexdef in indexdefs:
+        print(f"  {indexdef}")
+        session.execute(
+            text(indexdef.replace(" ON public.merchants ", f" ON {schema}.merchants "))
+        )
+
+    session.execute(text(f"ANALYZE {schema}.merchants"))
+    session.commit()
+    print(f"[OK] Generated in {time.perf_counter() - started:.1f}s")
+
+
+def explain(session: Session, lang: str, term: str) -> None:
+    """Print the plans of the candidate and ranking queries of a search"""
+    statements: list[tuple[str, Any]] = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        read_merchants(session, search=term, lang=lang, placeholder="none")
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    # The first statement sets the word similarity threshold, which stays set
+    # for the rest of the transaction
+    cursor = session.connection().connection.cursor()
+    for name, (statement, parameters) in zip(
+        ["candidates", "ranked page"], statements[1:3], strict=True
+    ):
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+        print(f"\n--- lang={lang} search={term!r} ({name})")
+        for (line,) in cursor.fetchall():
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--terms", nargs="+", default=DEFAULT_TERMS)
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per term")
+    parser.add_argument("--page-size", type=int, default=16)
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        metavar="ROWS",
+        help="Search a generated table of ROWS merchants",
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Regenerate the synthetic table"
+    )
+    parser.add_argument("--explain", action="store_true")
+    args = parser.parse_args()
+
+    print("\nStarting search benchmark...")
+    print(f"{len(args.terms)} terms x {args.repeat} runs per mode")
+
+    results: list[tuple[str, list[float], float]] = []
+    term_results: list[tuple[str, list[float], float]] = []
+    with SessionLocal() as session:
+        if args.synthetic:
+            build_synthetic(session, args.synthetic, args.rebuild)
+            # Unqualified table names now resolve to the synthetic tables
+            # until the session's transaction ends
+            session.execute(
+                text(f"SET LOCAL search_path TO {SYNTHETIC_SCHEMA}, public")
+            )
+
+        # Warm up the connection and caches before timing anything
+        for lang in LANGS:
+            read_merchants(session, search=args.terms[0], lang=lang, placeholder="none")
+
+        for lang in LANGS:
+            timings: list[float] = []
+            matches: list[int] = []
+            by_term: dict[str, tuple[list[float], list[int]]] = {
+                term: ([], []) for term in args.terms
+            }
+            for _ in range(args.repeat):
+                for term in args.terms:
+                    started = time.perf_counter()
+                    page = read_merchants(
+                        session,
+                        search=term,
+                        lang=lang,
+                        page_size=args.page_size,
+                        placeholder="none",
+                    )
+                    elapsed = time.perf_counter() - started
+                    timings.append(elapsed)
+                    matches.append(page.meta.total)
+                    by_term[term][0].append(elapsed)
+                    by_term[term][1].append(page.meta.total)
+            results.append((lang, timings, statistics.mean(matches)))
+            if lang == "auto":
+                term_results = [
+                    (term, term_timings, statistics.mean(term_matches))
+                    for term, (term_timings, term_matches) in by_term.items()
+                ]
+
+        print(f"\n{'=' * 50}")
+        print(f"{'Lang':<12}{'p50':>10}{'p99':>10}{'Mean':>10}{'Matches':>10}")
+        for lang, timings, mean_matches in results:
+            print(
+                f"{lang:<12}{percentile(timings, 50) * 1000:>8.1f}ms"
+                f"{percentile(timings, 99) * 1000:>8.1f}ms"
+                f"{statistics.mean(timings) * 1000:>8.1f}ms{mean_matches:>10.1f}"
+            )
+        print(f"{'=' * 50}")
+
+        print("\nlang=auto by term:")
+        print(f"{'Term':<16}{'Threshold':>10}{'p50':>10}{'p99':>10}{'Matches':>10}")
+        for term, timings, mean_matches in term_results:
+            print(
+                f"{term[:15]:<16}{word_similarity_threshold(term):>10.2f}"
+                f"{percentile(timings, 50) * 1000:>8.1f}ms"
+                f"{percentile(timings, 99) * 1000:>8.1f}ms{mean_matches:>10.1f}"
+            )
+        print(f"{'=' * 50}\n")
+
+        if args.explain:
+            for lang in LANGS:
+                explain(session, lang, args.terms[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -12,12 +12,13 @@ Usage:
     uv run python -m migrations.add_descriptions
 """
 
-import csv
 from pathlib import Path
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from migrations.import_attributes import import_attributes
+
 
 def upgrade(session: Session) -> None:
     """Apply the migration"""
@@ -66,45 +67,16 @@ def upgrade(session: Session) -> None:
         print(f"WARNING: CSV file not found at {csv_path}")
         return
 
-    updated_count = 0
-    skipped_count = 0
-
-    with open(csv_path, "r", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            merchant_id = row.get("id")
-            description_id = row.get("description_id")
-            description_en = row.get("description_en")
-
-            if not merchant_id:
-                skipped_count += 1
-                continue
-
-            # Update merchant with descriptions
-            result = session.execute(
-                text("""
-                    UPDATE merchants
-                    SET description_en = :desc_en,
-                        description_id = :desc_id
-                    WHERE id = :merchant_id
-                """),
-                {
-                    "desc_en": description_en,
-                    "desc_id": description_id,
-                    "merchant_id": merchant_id,
-                },
-            )
-
-            if result.rowcount > 0:  # pyright: ignore[reportAttributeAccessIssue]
-                updated_count += 1
-            else:
-                skipped_count += 1
-                print(f"  WARNING: Merchant ID {merchant_id} not found in database")
+    # COPY into a staging table and apply it with a single UPDATE ... FROM
+    result = import_attributes(
+        session, csv_path, key="id", columns=["description_en", "description_id"]
+    )
+    for merchant_id in result.unmatched:
+        print(f"  WARNING: Merchant ID {merchant_id} not found in database")
 
-    session.commit()
     print("\nDescription population complete:")
-    print(f"  Updated: {updated_count} merchants")
-    print(f"  Skipped: {skipped_count} records")
+    print(f"  Updated: {result.updated} merchants")
+    print(f"  Skipped: {result.staged - result.updated} records")
 
 
 def downgrade(session: Session) -> None:
@@ -0,0 +1,73 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to store backend-neutral blob references for photos.
+
+This migration:
+1. Renames photos.vercel_blob_url to photos.blob_ref
+
+Existing values are Vercel Blob URLs and stay valid as references. Photos
+uploaded with the local backend are stored as "local:{path}" and resolved to
+a URL when they are served (see app/storage.py).
+
+Usage:
+    uv run python -m migrations.blob_ref
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def rename_photo_column(session: Session, old: str, new: str) -> None:
+    # Guarded so running the migration twice is harmless
+    session.execute(
+        text(
+            f"""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'photos' AND column_name = '{old}'
+                ) THEN
+                    ALTER TABLE photos RENAME COLUMN {old} TO {new};
+                END IF;
+            END $$;
+        """
+        )
+    )
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Renaming photos.vercel_blob_url to blob_ref...")
+    rename_photo_column(session, "vercel_blob_url", "blob_ref")
+
+    session.commit()
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Renaming photos.blob_ref to vercel_blob_url...")
+    rename_photo_column(session, "blob_ref", "vercel_blob_url")
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting blob reference migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
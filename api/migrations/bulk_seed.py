@@ -0,0 +1,217 @@
+# pyright: reportUnknownParameterType=false
+# pyright: reportMissingTypeArgument=false
+# pyright: reportAny=false
+# pyright: reportUnknownVariableType=false
+# pyright: reportUnknownMemberType=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnusedCallResult=false
+"""
+Bulk seed script to load merchant data in batches instead of one place at a time
+
+Unlike seed.py, this script:
+1. Streams places from JSON or NDJSON files (see place_stream.py), so memory
+   is bounded by the batch size rather than the input size
+2. Pre-fetches existing google_place_id and google_review_id values in one query each
+3. Inserts merchants with multi-row INSERT ... RETURNING to get their ids
+4. Inserts types, reviews, opening hours and amenities with multi-row INSERTs
+5. Commits once per batch and reports rows/sec per table
+
+--scale N repeats every input place N times under synthetic ids, so the load
+can be measured on more data than the sample files contain.
+
+Usage:
+    uv run python -m migrations.bulk_seed data/limo.json data/pondok-labu.json
+    uv run python -m migrations.bulk_seed data/limo.json data/pondok-labu.json \\
+        --scale 100 --batch-size 1000
+    uv run python -m migrations.bulk_seed data/city-export.ndjson
+"""
+
+import argparse
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from itertools import batched
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import Amenity, Merchant, MerchantType, OpeningHours, Review
+from app.type_catalog import refresh_type_counts
+from migrations.place_stream import iter_places
+from migrations.seed import (
+    amenity_values,
+    merchant_values,
+    opening_hours_values,
+    review_values,
+)
+
+
+def synthetic_copy(place: dict, copy: int) -> dict:
+    """Clone a place under ids that won't collide with the original"""
+    return {
+        **place,
+        "id": f"{place['id']}-synthetic-{copy}",
+        "name": f"{place.get('name', '')}-synthetic-{copy}",
+        "reviews": [
+            {**review, "name": f"{review['name']}-synthetic-{copy}"}
+            for review in place.get("reviews", [])
+            if review.get("name")
+        ],
+    }
+
+
+def scaled_places(files: list[str], scale: int) -> Iterator[dict]:
+    """Stream places from every file, followed by scale - 1 synthetic copies"""
+    for file_path in files:
+        yield from iter_places(file_path)
+    # Re-read the files for each copy rather than holding the places in memory
+    for copy in range(1, scale):
+        for file_path in files:
+            for place in iter_places(file_path):
+                if place.get("id"):
+                    yield synthetic_copy(place, copy)
+
+
+class BulkSeeder:
+    def __init__(self, session: Session):
+        self.session = session
+        self.rows: Counter[str] = Counter()
+        self.seconds: Counter[str] = Counter()
+        self.skipped = 0
+
+        print("Fetching existing place and review ids...")
+        self.place_ids = set(session.scalars(select(Merchant.google_place_id)))
+        self.review_ids = set(session.scalars(select(Review.google_review_id)))
+        print(
+            f"Found {len(self.place_ids)} merchants and {len(self.review_ids)} reviews"
+        )
+
+    def seed(self, places: Iterable[dict], batch_size: int) -> None:
+        for batch in batched(self.new_places(places), batch_size):
+            self.seed_batch(list(batch))
+            started = time.perf_counter()
+            self.session.commit()
+            self.seconds["commit"] += time.perf_counter() - started
+            print(f"  {self.rows['merchants']} merchants loaded...")
+
+    def new_places(self, places: Iterable[dict]) -> Iterator[dict]:
+        """Skip places without an id and places that are already loaded"""
+        for place in places:
+            google_place_id = place.get("id")
+            if not google_place_id or google_place_id in self.place_ids:
+                self.skipped += 1
+                continue
+            self.place_ids.add(google_place_id)
+            yield place
+
+    def seed_batch(self, places: list[dict]) -> None:
+        result = self.insert_rows(
+            Merchant,
+            [merchant_values(place) for place in places],
+            returning=True,
+        )
+        merchant_ids = [row.id for row in result]
+
+        types: list[dict] = []
+        reviews: list[dict] = []
+        opening_hours: list[dict] = []
+        amenities: list[dict] = []
+
+        for merchant_id, place in zip(merchant_ids, places):
+            types.extend(
+                {"merchant_id": merchant_id, "type_name": type_name}
+                for type_name in place.get("types", [])
+            )
+
+            # Same limit as seed.py
+            for review_data in place.get("reviews", [])[:5]:
+                review = review_values(review_data)
+                google_review_id = review["google_review_id"]
+                if not google_review_id or google_review_id in self.review_ids:
+                    continue
+                self.review_ids.add(google_review_id)
+                reviews.append({"merchant_id": merchant_id, **review})
+
+            hours_data = place.get("regularOpeningHours", {})
+            if hours_data:
+                opening_hours.append(
+                    {"merchant_id": merchant_id, **opening_hours_values(hours_data)}
+                )
+
+            amenities.append({"merchant_id": merchant_id, **amenity_values(place)})
+
+        self.insert_rows(MerchantType, types)
+        self.insert_rows(Review, reviews)
+        self.insert_rows(OpeningHours, opening_hours)
+        self.insert_rows(Amenity, amenities)
+
+    def insert_rows(self, model: type, rows: list[dict], returning: bool = False):
+        """Insert rows with multi-row INSERTs and record rows and seconds"""
+        if not rows:
+            return []
+
+        table = model.__tablename__
+        stmt = insert(model)
+        if returning:
+            stmt = stmt.returning(model.id, sort_by_parameter_order=True)
+
+        started = time.perf_counter()
+        result = self.session.execute(stmt, rows)
+        # RETURNING rows are fetched per INSERT page, so count that too
+        result = result.all() if returning else []
+        self.seconds[table] += time.perf_counter() - started
+        self.rows[table] += len(rows)
+        return result
+
+    def report(self, elapsed: float) -> None:
+        print(f"\n{'=' * 50}")
+        print(f"{'Table':<16}{'Rows':>10}{'Seconds':>10}{'Rows/sec':>14}")
+        for table, rows in self.rows.items():
+            seconds = self.seconds[table]
+            rate = rows / seconds if seconds else 0
+            print(f"{table:<16}{rows:>10}{seconds:>10.2f}{rate:>14.0f}")
+        print(f"{'commit':<16}{'':>10}{self.seconds['commit']:>10.2f}")
+
+        total = sum(self.rows.values())
+        print(
+            f"\nTotal: {total} rows in {elapsed:.2f}s ({total / elapsed:.0f} rows/sec)"
+        )
+        print(f"Skipped: {self.skipped} places (missing id or already loaded)")
+        print(f"{'=' * 50}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "files", nargs="*", default=["data/limo.json", "data/pondok-labu.json"]
+    )
+    parser.add_argument(
+        "--scale", type=int, default=1, help="Copies of each place to load"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print("\nStarting bulk seed...\n")
+
+    # Create tables if they don't exist
+    from app.database import engine
+    from app.models.utils import Base
+
+    Base.metadata.create_all(engine)
+
+    with SessionLocal() as session:
+        try:
+            seeder = BulkSeeder(session)
+            started = time.perf_counter()
+            seeder.seed(scaled_places(args.files, args.scale), args.batch_size)
+            refresh_type_counts(session)
+            seeder.report(time.perf_counter() - started)
+        except Exception as e:
+            print(f"\nError during bulk seed: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
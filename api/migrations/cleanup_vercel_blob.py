@@ -1,38 +1,33 @@
 """
-Script to delete all existing photos from Vercel Blob storage
+Script to delete all existing merchant photos from blob storage
 
 This script:
-1. Lists all files in the Vercel Blob store
-2. Deletes all files in the merchants/ directory
+1. Lists the blobs under merchants/ in the configured storage backend
+2. Deletes each of them
 
 Usage:
-    1. Make sure BLOB_READ_WRITE_TOKEN is set in your .env file
-    2. Run: uv run python -m migrations.cleanup_vercel_blob
+    1. Make sure BLOB_READ_WRITE_TOKEN is set in your .env file (Vercel Blob)
+       or BLOB_STORAGE=local
+    2. Run: uv run python -m migrations.cleanup_vercel_blob [--backend local]
 """
 
-import os
+import argparse
 
-from dotenv import load_dotenv
-from vercel.blob import list_objects, delete
+from app.config import settings
+from app.storage import get_storage
 
-# Load environment variables
-load_dotenv()
 
-# Get Vercel Blob token from environment
-BLOB_READ_WRITE_TOKEN = os.getenv("BLOB_READ_WRITE_TOKEN")
-if not BLOB_READ_WRITE_TOKEN:
-    raise ValueError("BLOB_READ_WRITE_TOKEN not found in environment variables")
-
-
-def main():
-    """Delete all photos from Vercel Blob"""
-    print("\nDeleting all photos from Vercel Blob...\n")
+def main(backend: str | None = None):
+    """Delete all merchant photos from blob storage"""
+    backend = backend or settings.BLOB_STORAGE
+    print(f"\nDeleting all photos from {backend} blob storage...\n")
 
     try:
-        # List all blobs
+        storage = get_storage(backend)
+
+        # List all merchant blobs
         print("Fetching list of blobs...")
-        result = list_objects(token=BLOB_READ_WRITE_TOKEN)
-        blobs = result.blobs
+        blobs = storage.list("merchants/")
 
         if not blobs:
             print("No blobs found in storage.")
@@ -44,13 +39,13 @@ def main():
         deleted_count = 0
         error_count = 0
 
-        for blob in blobs:
+        for reference in blobs:
             try:
-                print(f"Deleting: {blob.pathname}")
-                delete(blob.url, token=BLOB_READ_WRITE_TOKEN)
+                print(f"Deleting: {reference}")
+                storage.delete(reference)
                 deleted_count += 1
             except Exception as e:
-                print(f"ERROR: Failed to delete {blob.pathname}: {e}")
+                print(f"ERROR: Failed to delete {reference}: {e}")
                 error_count += 1
 
         print("\n" + "=" * 50)
@@ -61,9 +56,13 @@ def main():
         print("=" * 50 + "\n")
 
     except Exception as e:
-        print(f"\nERROR: Failed to cleanup Vercel Blob: {e}")
+        print(f"\nERROR: Failed to cleanup blob storage: {e}")
         raise
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--backend", choices=["vercel", "local"], default=settings.BLOB_STORAGE
+    )
+    main(parser.parse_args().backend)
@@ -0,0 +1,60 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to store a content hash per merchant for incremental sync.
+
+This migration:
+1. Adds a nullable content_hash column to merchants
+
+Existing merchants start without a hash, so the first run of
+migrations.sync (or migrations.ingest) rewrites them once and fills it in.
+
+Usage:
+    uv run python -m migrations.content_hash
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Adding content_hash column to merchants...")
+    session.execute(
+        text(
+            """
+            ALTER TABLE merchants
+            ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+        """
+        )
+    )
+
+    session.commit()
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Dropping content_hash column...")
+    session.execute(text("ALTER TABLE merchants DROP COLUMN IF EXISTS content_hash;"))
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting content hash migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to maintain per-day feedback statistics incrementally.
+
+This migration:
+1. Creates the feedback_daily_stats summary table
+2. Creates an index on feedbacks (created_at, id) for keyset pagination
+3. Creates statement-level triggers that fold inserted/deleted feedbacks
+   into the summary table, so multi-row INSERTs update it once per statement
+4. Backfills the summary table from existing feedbacks
+
+Usage:
+    uv run python -m migrations.feedback_stats
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+AGGREGATE_COLUMNS = """
+    (created_at AT TIME ZONE 'UTC')::date,
+    COUNT(*),
+    SUM(rating),
+    COUNT(*) FILTER (WHERE rating = 1),
+    COUNT(*) FILTER (WHERE rating = 2),
+    COUNT(*) FILTER (WHERE rating = 3),
+    COUNT(*) FILTER (WHERE rating = 4),
+    COUNT(*) FILTER (WHERE rating = 5)
+"""
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Creating feedback_daily_stats table...")
+    session.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS feedback_daily_stats (
+                day DATE PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0,
+                rating_sum INTEGER NOT NULL DEFAULT 0,
+                rating_1 INTEGER NOT NULL DEFAULT 0,
+                rating_2 INTEGER NOT NULL DEFAULT 0,
+                rating_3 INTEGER NOT NULL DEFAULT 0,
+                rating_4 INTEGER NOT NULL DEFAULT 0,
+                rating_5 INTEGER NOT NULL DEFAULT 0
+            );
+        """
+        )
+    )
+
+    print("Creating index on feedbacks (created_at, id)...")
+    session.execute(
+        text(
+            """
+            CREATE INDEX IF NOT EXISTS ix_feedbacks_created_at_id
+            ON feedbacks (created_at, id);
+        """
+        )
+    )
+
+    print("Creating functions to maintain feedback statistics...")
+    session.execute(
+        text(
+            f"""
+            CREATE OR REPLACE FUNCTION feedback_daily_stats_insert()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                INSERT INTO feedback_daily_stats AS s (
+                    day, count, rating_sum,
+                    rating_1, rating_2, rating_3, rating_4, rating_5
+                )
+                SELECT {AGGREGATE_COLUMNS}
+                FROM inserted_feedbacks
+                GROUP BY 1
+                ON CONFLICT (day) DO UPDATE SET
+                    count = s.count + EXCLUDED.count,
+                    rating_sum = s.rating_sum + EXCLUDED.rating_sum,
+                    rating_1 = s.rating_1 + EXCLUDED.rating_1,
+                    rating_2 = s.rating_2 + EXCLUDED.rating_2,
+                    rating_3 = s.rating_3 + EXCLUDED.rating_3,
+                    rating_4 = s.rating_4 + EXCLUDED.rating_4,
+                    rating_5 = s.rating_5 + EXCLUDED.rating_5;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE OR REPLACE FUNCTION feedback_daily_stats_delete()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                UPDATE feedback_daily_stats AS s
+                SET count = s.count - d.count,
+                    rating_sum = s.rating_sum - d.rating_sum,
+                    rating_1 = s.rating_1 - d.rating_1,
+                    rating_2 = s.rating_2 - d.rating_2,
+                    rating_3 = s.rating_3 - d.rating_3,
+                    rating_4 = s.rating_4 - d.rating_4,
+                    rating_5 = s.rating_5 - d.rating_5
+                FROM (
+                    SELECT {AGGREGATE_COLUMNS}
+                    FROM deleted_feedbacks
+                    GROUP BY 1
+                ) AS d (
+                    day, count, rating_sum,
+                    rating_1, rating_2, rating_3, rating_4, rating_5
+                )
+                WHERE s.day = d.day;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """
+        )
+    )
+
+    print("Creating triggers on feedbacks...")
+    session.execute(
+        text(
+            """
+            DROP TRIGGER IF EXISTS feedback_daily_stats_insert_trigger ON feedbacks;
+            CREATE TRIGGER feedback_daily_stats_insert_trigger
+            AFTER INSERT ON feedbacks
+            REFERENCING NEW TABLE AS inserted_feedbacks
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION feedback_daily_stats_insert();
+
+            DROP TRIGGER IF EXISTS feedback_daily_stats_delete_trigger ON feedbacks;
+            CREATE TRIGGER feedback_daily_stats_delete_trigger
+            AFTER DELETE ON feedbacks
+            REFERENCING OLD TABLE AS deleted_feedbacks
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION feedback_daily_stats_delete();
+        """
+        )
+    )
+
+    print("Backfilling feedback_daily_stats from existing feedbacks...")
+    session.execute(text("LOCK TABLE feedbacks IN SHARE MODE;"))
+    session.execute(text("TRUNCATE feedback_daily_stats;"))
+    session.execute(
+        text(
+            f"""
+            INSERT INTO feedback_daily_stats (
+                day, count, rating_sum,
+                rating_1, rating_2, rating_3, rating_4, rating_5
+            )
+            SELECT {AGGREGATE_COLUMNS}
+            FROM feedbacks
+            GROUP BY 1;
+        """
+        )
+    )
+
+    session.commit()
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Dropping triggers...")
+    session.execute(
+        text(
+            "DROP TRIGGER IF EXISTS feedback_daily_stats_insert_trigger ON feedbacks;"
+        )
+    )
+    session.execute(
+        text(
+            "DROP TRIGGER IF EXISTS feedback_daily_stats_delete_trigger ON feedbacks;"
+        )
+    )
+
+    print("Dropping functions...")
+    session.execute(text("DROP FUNCTION IF EXISTS feedback_daily_stats_insert();"))
+    session.execute(text("DROP FUNCTION IF EXISTS feedback_daily_stats_delete();"))
+
+    print("Dropping index and table...")
+    session.execute(text("DROP INDEX IF EXISTS ix_feedbacks_created_at_id;"))
+    session.execute(text("DROP TABLE IF EXISTS feedback_daily_stats;"))
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting feedback statistics migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
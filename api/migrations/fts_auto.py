@@ -0,0 +1,64 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to index both search vectors together for ?lang=auto.
+
+This migration:
+1. Creates a GIN index on search_vector_en || search_vector_id, so a search
+   in either language is a single index lookup
+
+The expression must stay identical to SEARCH_VECTOR_ALL in
+app/routes/merchants.py, or the planner won't use the index. Requires fts.py.
+
+Usage:
+    uv run python -m migrations.fts_auto
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Creating GIN index on both search vectors...")
+    session.execute(
+        text(
+            """
+            CREATE INDEX IF NOT EXISTS merchants_search_vector_all_idx
+            ON merchants USING GIN (
+                (COALESCE(search_vector_en, ''::tsvector)
+                 || COALESCE(search_vector_id, ''::tsvector))
+            );
+        """
+        )
+    )
+
+    session.commit()
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Dropping index...")
+    session.execute(text("DROP INDEX IF EXISTS merchants_search_vector_all_idx;"))
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting bilingual search index migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to index descriptions and type names for full-text search.
+
+This migration:
+1. Creates merchants_search_document(), which builds a merchant's weighted
+   search vector for one language:
+   - A: display_name
+   - B: short_address and type names ("coffee_shop" as "coffee shop")
+   - C: the description in that language (description_en or description_id)
+2. Replaces the search vector trigger function to use it, and fires the
+   trigger on changes to the descriptions and type_slugs as well. The
+   triggers on merchant_types (type_slugs.py) update type_slugs, so adding
+   or removing types reindexes the merchant
+3. Recomputes the search vectors of existing merchants in batches, each in
+   its own transaction, so rows are only locked briefly
+
+Requires fts.py, add_descriptions.py and type_slugs.py.
+
+Usage:
+    uv run python -m migrations.fts_document [--batch-size 1000]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def upgrade(session: Session, batch_size: int = 1000) -> None:
+    """Apply the migration"""
+    print("Creating merchants_search_document function...")
+    session.execute(
+        text(
+            """
+            CREATE OR REPLACE FUNCTION merchants_search_document(
+                config regconfig,
+                display_name TEXT,
+                short_address TEXT,
+                type_slugs TEXT[],
+                description TEXT
+            )
+            RETURNS tsvector AS $$
+                SELECT
+                    setweight(to_tsvector(config, COALESCE(display_name, '')), 'A') ||
+                    setweight(to_tsvector(config, COALESCE(short_address, '')), 'B') ||
+                    setweight(
+                        to_tsvector(
+                            config,
+                            replace(array_to_string(type_slugs, ' '), '_', ' ')
+                        ),
+                        'B'
+                    ) ||
+                    setweight(to_tsvector(config, COALESCE(description, '')), 'C');
+            $$ LANGUAGE sql IMMUTABLE;
+        """
+        )
+    )
+
+    print("Updating search vector trigger function...")
+    session.execute(
+        text(
+            """
+            CREATE OR REPLACE FUNCTION merchants_search_vector_update()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                NEW.search_vector_en := merchants_search_document(
+                    'english', NEW.display_name, NEW.short_address,
+                    NEW.type_slugs, NEW.description_en
+                );
+                NEW.search_vector_id := merchants_search_document(
+                    'indonesian', NEW.display_name, NEW.short_address,
+                    NEW.type_slugs, NEW.description_id
+                );
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+        """
+        )
+    )
+
+    print("Recreating trigger for descriptions and types...")
+    session.execute(
+        text(
+            """
+            DROP TRIGGER IF EXISTS merchants_search_vector_trigger ON merchants;
+
+            CREATE TRIGGER merchants_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF
+                display_name, short_address, description_en, description_id,
+                type_slugs
+            ON merchants
+            FOR EACH ROW
+            EXECUTE FUNCTION merchants_search_vector_update();
+        """
+        )
+    )
+    session.commit()
+
+    backfill(session, batch_size)
+    print("Migration completed successfully!")
+
+
+def backfill(session: Session, batch_size: int) -> None:
+    """Recompute every merchant's search vectors, one batch per transaction"""
+    print(f"Recomputing search vectors in batches of {batch_size}...")
+    started = time.perf_counter()
+    last_id = 0
+    updated = 0
+    while True:
+        ids = session.scalars(
+            text(
+                """
+                UPDATE merchants
+                SET search_vector_en = merchants_search_document(
+                        'english', display_name, short_address,
+                        type_slugs, description_en
+                    ),
+                    search_vector_id = merchants_search_document(
+                        'indonesian', display_name, short_address,
+                        type_slugs, description_id
+                    )
+                WHERE id IN (
+                    SELECT id FROM merchants
+                    WHERE id > :last_id
+                    ORDER BY id
+                    LIMIT :batch_size
+                )
+                RETURNING id
+            """
+            ),
+            {"last_id": last_id, "batch_size": batch_size},
+        ).all()
+        session.commit()
+        if not ids:
+            break
+
+        last_id = max(ids)
+        updated += len(ids)
+        print(f"  {updated} merchants ({time.perf_counter() - started:.1f}s)")
+
+    print(f"[OK] Recomputed search vectors for {updated} merchants")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration (back to the trigger from fts.py)"""
+    from migrations.fts import upgrade as create_fts
+
+    # Restores the trigger and recomputes every vector from name and address
+    print("Restoring the name and address search vectors...")
+    create_fts(session)
+
+    print("Dropping merchants_search_document function...")
+    session.execute(
+        text(
+            "DROP FUNCTION IF EXISTS "
+            "merchants_search_document(regconfig, TEXT, TEXT, TEXT[], TEXT);"
+        )
+    )
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    print("\nStarting search document migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session, args.batch_size)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Responsive image variants for merchant photos
+
+encode_variants() resizes a source photo to each width of VARIANT_WIDTHS that
+is narrower than the original (photos are never upscaled) and encodes every
+size as WebP and JPEG. It only takes and returns plain data, so it can run in
+a process pool.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageOps
+
+VARIANT_WIDTHS = (320, 640, 1280)
+VARIANT_FORMATS: dict[str, dict[str, Any]] = {
+    "webp": {"quality": 75, "method": 4},
+    "jpeg": {"quality": 80, "optimize": True, "progressive": True},
+}
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+
+@dataclass(frozen=True)
+class EncodedVariant:
+    path: Path
+    format: str
+    width: int
+    height: int
+    size: int
+
+
+def variant_widths(width: int, widths: tuple[int, ...] = VARIANT_WIDTHS) -> list[int]:
+    """Widths to generate for an image; small images get one at their own size"""
+    return [w for w in widths if w < width] or [width]
+
+
+def encode_variants(
+    source: Path,
+    output_dir: Path,
+    stem: str,
+    widths: tuple[int, ...] = VARIANT_WIDTHS,
+) -> list[EncodedVariant]:
+    """Write {stem}-{width}w.{ext} files to output_dir for every width/format"""
+    variants: list[EncodedVariant] = []
+    with Image.open(source) as original:
+        # Bake the EXIF orientation in, since variants are saved without EXIF
+        img = ImageOps.exif_transpose(original)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if img.has_transparency_data else "RGB")
+
+        for width in variant_widths(img.width, widths):
+            height = max(1, round(img.height * width / img.width))
+            resized = (
+                img
+                if width == img.width
+                else img.resize(
+                    (width, height), Image.Resampling.LANCZOS, reducing_gap=3.0
+                )
+            )
+            for fmt, options in VARIANT_FORMATS.items():
+                frame = resized.convert("RGB") if fmt == "jpeg" else resized
+                path = output_dir / f"{stem}-{width}w.{EXTENSIONS[fmt]}"
+                frame.save(path, format=fmt.upper(), **options)
+                variants.append(
+                    EncodedVariant(path, fmt, width, height, path.stat().st_size)
+                )
+    return variants
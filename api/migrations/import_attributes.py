@@ -0,0 +1,273 @@
+# pyright: reportUnknownParameterType=false
+# pyright: reportMissingTypeArgument=false
+# pyright: reportAny=false
+# pyright: reportUnknownVariableType=false
+# pyright: reportUnknownMemberType=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnusedCallResult=false
+"""
+Bulk import of merchant text attributes (descriptions...) from CSV or Parquet
+
+This script:
+1. COPYs the file into a temporary staging table (Parquet is converted to CSV
+   one record batch at a time and needs pyarrow installed)
+2. Applies it with a single UPDATE merchants ... FROM staging, matching on
+   --key (id or google_place_id); if a key repeats, its last row wins
+3. Reports staging rows whose key matched no merchant, through an anti-join
+
+Only the description_* columns found in the file are loaded unless --columns
+names others. Empty cells leave the existing value untouched.
+
+Usage:
+    uv run python -m migrations.import_attributes data/merchant_descriptions.csv \\
+        --columns description_en description_id
+    uv run python -m migrations.import_attributes translations.parquet \\
+        --key google_place_id --unmatched unmatched.txt
+"""
+
+import argparse
+import csv
+import io
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+from psycopg2 import sql
+from sqlalchemy import String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models import Merchant
+
+KEY_COLUMNS = ("id", "google_place_id")
+# Text columns maintained by other scripts, never loaded from a file
+MANAGED_COLUMNS = {"photo_url", "content_hash"}
+DEFAULT_PREFIX = "description_"
+STAGING_TABLE = "merchant_attributes_staging"
+
+
+@dataclass
+class ImportResult:
+    staged: int
+    updated: int
+    unmatched: list[str]
+
+
+def importable_columns() -> set[str]:
+    """Text columns on merchants that may be loaded from a file"""
+    return {
+        column.name
+        for column in Merchant.__table__.columns
+        if isinstance(column.type, String)
+        and column.name not in KEY_COLUMNS
+        and column.name not in MANAGED_COLUMNS
+    }
+
+
+def csv_header(path: Path) -> list[str]:
+    with path.open("r", encoding="utf-8", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def parquet_csv_chunks(path: Path) -> tuple[list[str], Iterator[str]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Importing Parquet files requires pyarrow") from e
+
+    parquet = pq.ParquetFile(path)
+    header = parquet.schema_arrow.names
+
+    def chunks() -> Iterator[str]:
+        for batch in parquet.iter_batches():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in batch.to_pylist():
+                writer.writerow(row[name] for name in header)
+            yield buffer.getvalue()
+
+    return header, chunks()
+
+
+class ChunkReader(io.TextIOBase):
+    """File-like view over an iterator of strings, for COPY FROM STDIN"""
+
+    def __init__(self, chunks: Iterator[str]):
+        self.chunks = chunks
+        self.buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> str:
+        while size is None or size < 0 or len(self.buffer) < size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+        if size is None or size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+def copy_into_staging(
+    session: Session, header: list[str], key: str, source: IO[str], has_header: bool
+) -> int:
+    """Create the staging table for the file's columns and COPY the file in"""
+    key_type = Merchant.__table__.c[key].type.compile(dialect=postgresql.dialect())
+    columns = [
+        sql.SQL("{} {}").format(
+            sql.Identifier(name), sql.SQL(key_type if name == key else "TEXT")
+        )
+        for name in header
+    ]
+
+    raw = session.connection().connection
+    with raw.cursor() as cursor:
+        cursor.execute(
+            sql.SQL("CREATE TEMP TABLE {} (_line BIGSERIAL, {}) ON COMMIT DROP").format(
+                sql.Identifier(STAGING_TABLE), sql.SQL(", ").join(columns)
+            )
+        )
+        cursor.copy_expert(
+            sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, HEADER {})")
+            .format(
+                sql.Identifier(STAGING_TABLE),
+                sql.SQL(", ").join(map(sql.Identifier, header)),
+                sql.SQL("true" if has_header else "false"),
+            )
+            .as_string(cursor),
+            source,
+        )
+        return cursor.rowcount
+
+
+def apply_staging(
+    session: Session, key: str, columns: list[str]
+) -> tuple[int, list[str]]:
+    """UPDATE merchants from staging and return (updated, unmatched keys)"""
+    staging = sql.Identifier(STAGING_TABLE)
+    key_id = sql.Identifier(key)
+    assignments = sql.SQL(", ").join(
+        sql.SQL("{col} = COALESCE(NULLIF(s.{col}, ''), m.{col})").format(
+            col=sql.Identifier(column)
+        )
+        for column in columns
+    )
+
+    raw = session.connection().connection
+    with raw.cursor() as cursor:
+        cursor.execute(
+            sql.SQL(
+                """
+                UPDATE merchants AS m
+                SET {assignments}, updated_at = now()
+                FROM (
+                    SELECT DISTINCT ON ({key}) *
+                    FROM {staging}
+                    WHERE {key} IS NOT NULL
+                    ORDER BY {key}, _line DESC
+                ) AS s
+                WHERE m.{key} = s.{key}
+                """
+            ).format(assignments=assignments, key=key_id, staging=staging)
+        )
+        updated = cursor.rowcount
+
+        cursor.execute(
+            sql.SQL(
+                """
+                SELECT DISTINCT s.{key}::text
+                FROM {staging} AS s
+                LEFT JOIN merchants AS m ON m.{key} = s.{key}
+                WHERE s.{key} IS NOT NULL AND m.id IS NULL
+                ORDER BY 1
+                """
+            ).format(key=key_id, staging=staging)
+        )
+        unmatched = [row[0] for row in cursor.fetchall()]
+
+    return updated, unmatched
+
+
+def import_attributes(
+    session: Session, path: Path, key: str = "id", columns: list[str] | None = None
+) -> ImportResult:
+    """Load merchant attributes from a CSV or Parquet file and commit"""
+    if key not in KEY_COLUMNS:
+        raise ValueError(f"Key must be one of {', '.join(KEY_COLUMNS)}")
+
+    is_parquet = path.suffix.lower() == ".parquet"
+    if is_parquet:
+        header, chunks = parquet_csv_chunks(path)
+    else:
+        header = csv_header(path)
+
+    if key not in header:
+        raise ValueError(f"{path} has no {key!r} column")
+    allowed = importable_columns()
+    if columns is None:
+        columns = [
+            name
+            for name in header
+            if name.startswith(DEFAULT_PREFIX) and name in allowed
+        ]
+    invalid = [c for c in columns if c not in allowed or c not in header]
+    if invalid:
+        raise ValueError(f"Can't import column(s): {', '.join(invalid)}")
+    if not columns:
+        raise ValueError(f"{path} has no columns to import")
+
+    if is_parquet:
+        source: IO[str] = ChunkReader(chunks)
+    else:
+        source = path.open("r", encoding="utf-8", newline="")
+    try:
+        staged = copy_into_staging(session, header, key, source, not is_parquet)
+    finally:
+        source.close()
+
+    updated, unmatched = apply_staging(session, key, columns)
+    session.commit()
+    return ImportResult(staged=staged, updated=updated, unmatched=unmatched)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("file", type=Path, help="CSV or Parquet file")
+    parser.add_argument("--key", default="id", choices=KEY_COLUMNS)
+    parser.add_argument(
+        "--columns",
+        nargs="+",
+        help="Columns to load (default: the description_* columns in the file)",
+    )
+    parser.add_argument("--unmatched", help="Write unmatched keys to this file")
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+
+    print(f"\nImporting merchant attributes from {args.file}...\n")
+
+    with SessionLocal() as session:
+        try:
+            result = import_attributes(session, args.file, args.key, args.columns)
+        except Exception as e:
+            print(f"\nError during import: {e}")
+            session.rollback()
+            raise
+
+    print(f"Staged: {result.staged} rows")
+    print(f"Updated: {result.updated} merchants")
+    print(f"Unmatched: {len(result.unmatched)} keys")
+    for value in result.unmatched[:10]:
+        print(f"  WARNING: No merchant with {args.key} {value}")
+
+    if args.unmatched and result.unmatched:
+        Path(args.unmatched).write_text("\n".join(result.unmatched) + "\n")
+        print(f"Unmatched keys written to {args.unmatched}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+# pyright: reportUnknownParameterType=false
+# pyright: reportMissingTypeArgument=false
+# pyright: reportAny=false
+# pyright: reportUnknownVariableType=false
+# pyright: reportUnknownMemberType=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnusedCallResult=false
+"""
+Parallel ingest of Google Maps places exports with upserts
+
+This script:
+1. Collects every .json/.ndjson/.jsonl file from the given files and directories
+2. Streams and transforms each file in a separate worker process
+3. Upserts merchants with INSERT ... ON CONFLICT (google_place_id) DO UPDATE,
+   replaces their types, opening hours and amenities and upserts their reviews
+4. Commits every batch on its own; a failing batch is retried one place at a
+   time so only the failing places are skipped
+5. Writes skipped places to an error report (JSON lines) and prints rows/sec
+
+Usage:
+    uv run python -m migrations.ingest data/ --workers 4
+    uv run python -m migrations.ingest data/limo.json data/pondok-labu.json \\
+        --batch-size 500 --errors ingest_errors.jsonl
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import delete, insert, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+from app.models import Amenity, Merchant, MerchantType, OpeningHours, Review
+from app.type_catalog import refresh_type_counts
+from migrations.place_stream import NDJSON_SUFFIXES, iter_places
+from migrations.seed import (
+    amenity_values,
+    merchant_values,
+    opening_hours_values,
+    review_values,
+)
+
+INPUT_SUFFIXES = {".json", *NDJSON_SUFFIXES}
+
+# Columns that come from the export; everything else (descriptions, photos,
+# search vectors) is maintained separately and left alone on update
+MERCHANT_COLUMNS = [
+    *(column for column in merchant_values({}) if column != "google_place_id"),
+    "content_hash",
+]
+REVIEW_COLUMNS = [
+    column for column in review_values({}) if column != "google_review_id"
+]
+
+
+@dataclass
+class PlaceRows:
+    """Rows for one place; children don't have a merchant_id yet"""
+
+    google_place_id: str
+    merchant: dict
+    types: list[dict]
+    reviews: list[dict]
+    opening_hours: dict | None
+    amenity: dict
+
+
+@dataclass
+class IngestResult:
+    rows: Counter[str] = field(default_factory=Counter)
+    errors: list[dict] = field(default_factory=list)
+    files: int = 0
+
+    def merge(self, other: "IngestResult") -> None:
+        self.rows.update(other.rows)
+        self.errors.extend(other.errors)
+        self.files += other.files
+
+
+def content_hash(place: PlaceRows) -> str:
+    """
+    Hash the rows stored for a place.
+
+    Hashing the normalized rows rather than the raw payload ignores fields we
+    don't store and key order. Point-in-time fields (open now, "2 weeks ago")
+    are left out so they alone don't mark a place as changed.
+    """
+    merchant = {k: v for k, v in place.merchant.items() if k != "is_open_now"}
+    hours = dict(place.opening_hours or {}, is_open_now=None)
+    reviews = [{**review, "relative_time": None} for review in place.reviews]
+    payload = json.dumps(
+        [merchant, place.types, reviews, hours, place.amenity],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def transform(place: dict) -> PlaceRows:
+    """Build the rows for a place, raising ValueError if it can't be stored"""
+    google_place_id = place.get("id")
+    if not google_place_id:
+        raise ValueError("Place has no id")
+
+    merchant = merchant_values(place)
+    if merchant["latitude"] is None or merchant["longitude"] is None:
+        raise ValueError("Place has no location")
+
+    # Same review limit as seed.py
+    reviews = [review_values(review) for review in place.get("reviews", [])[:5]]
+    hours_data = place.get("regularOpeningHours", {})
+
+    rows = PlaceRows(
+        google_place_id=google_place_id,
+        merchant=merchant,
+        types=[{"type_name": type_name} for type_name in place.get("types", [])],
+        reviews=[review for review in reviews if review["google_review_id"]],
+        opening_hours=opening_hours_values(hours_data) if hours_data else None,
+        amenity=amenity_values(place),
+    )
+    rows.merchant["content_hash"] = content_hash(rows)
+    return rows
+
+
+def upsert_places(session: Session, places: list[PlaceRows]) -> Counter[str]:
+    """Upsert a batch of places and replace their child rows"""
+    counts: Counter[str] = Counter()
+
+    # ON CONFLICT can't touch the same row twice in one statement
+    places = list({place.google_place_id: place for place in places}.values())
+
+    now = datetime.now(timezone.utc)
+    stmt = pg_insert(Merchant).values(
+        [{**place.merchant, "created_at": now, "updated_at": now} for place in places]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Merchant.google_place_id],
+        set_={
+            **{column: stmt.excluded[column] for column in MERCHANT_COLUMNS},
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ).returning(
+        Merchant.id,
+        Merchant.google_place_id,
+        literal_column("xmax = 0").label("inserted"),
+    )
+
+    merchant_ids: dict[str, int] = {}
+    for row in session.execute(stmt):
+        merchant_ids[row.google_place_id] = row.id
+        counts["merchants_inserted" if row.inserted else "merchants_updated"] += 1
+    ids = list(merchant_ids.values())
+
+    # Types, opening hours and amenities carry no identity of their own
+    for model in (MerchantType, OpeningHours, Amenity):
+        session.execute(delete(model).where(model.merchant_id.in_(ids)))
+
+    types: list[dict] = []
+    opening_hours: list[dict] = []
+    amenities: list[dict] = []
+    reviews: dict[str, dict] = {}
+    for place in places:
+        merchant_id = merchant_ids[place.google_place_id]
+        types.extend({"merchant_id": merchant_id, **row} for row in place.types)
+        if place.opening_hours is not None:
+            opening_hours.append({"merchant_id": merchant_id, **place.opening_hours})
+        amenities.append({"merchant_id": merchant_id, **place.amenity})
+        for review in place.reviews:
+            reviews[review["google_review_id"]] = {"merchant_id": merchant_id, **review}
+
+    for model, rows in (
+        (MerchantType, types),
+        (OpeningHours, opening_hours),
+        (Amenity, amenities),
+    ):
+        if rows:
+            session.execute(insert(model), rows)
+            counts[model.__tablename__] += len(rows)
+
+    # Reviews keep their ids so review pagination cursors stay valid
+    if reviews:
+        stmt = pg_insert(Review).values(list(reviews.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Review.google_review_id],
+            set_={
+                column: stmt.excluded[column]
+                for column in ("merchant_id", *REVIEW_COLUMNS)
+            },
+        )
+        session.execute(stmt)
+        counts["reviews"] += len(reviews)
+
+    return counts
+
+
+def error_entry(file_path: Path, place_id: str | None, stage: str, error: Exception):
+    # Report the driver error without the statement and its parameters
+    error = getattr(error, "orig", None) or error
+    return {
+        "file": str(file_path),
+        "google_place_id": place_id,
+        "stage": stage,
+        "error": f"{type(error).__name__}: {error}",
+    }
+
+
+def write_batch(
+    session: Session, file_path: Path, places: list[PlaceRows], result: IngestResult
+) -> None:
+    try:
+        counts = upsert_places(session, places)
+        session.commit()
+        result.rows.update(counts)
+        return
+    except SQLAlchemyError:
+        session.rollback()
+
+    # Isolate the failing places by retrying the batch one place at a time
+    for place in places:
+        try:
+            counts = upsert_places(session, [place])
+            session.commit()
+            result.rows.update(counts)
+        except SQLAlchemyError as e:
+            session.rollback()
+            result.errors.append(
+                error_entry(file_path, place.google_place_id, "write", e)
+            )
+
+
+def ingest_file(file_path: Path, batch_size: int) -> IngestResult:
+    """Stream, transform and upsert one file; runs in a worker process"""
+    result = IngestResult(files=1)
+    batch: list[PlaceRows] = []
+
+    with SessionLocal() as session:
+        try:
+            for place in iter_places(file_path):
+                try:
+                    batch.append(transform(place))
+                except (ValueError, TypeError, AttributeError) as e:
+                    place_id = place.get("id") if isinstance(place, dict) else None
+                    result.errors.append(
+                        error_entry(file_path, place_id, "transform", e)
+                    )
+                    continue
+
+                if len(batch) >= batch_size:
+                    write_batch(session, file_path, batch, result)
+                    batch = []
+        except ValueError as e:
+            # Malformed JSON; keep what was read before the error
+            result.errors.append(error_entry(file_path, None, "parse", e))
+
+        if batch:
+            write_batch(session, file_path, batch, result)
+
+    return result
+
+
+def collect_files(paths: Iterable[str]) -> list[Path]:
+    files: list[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(
+                sorted(
+                    child
+                    for child in path.iterdir()
+                    if child.is_file() and child.suffix.lower() in INPUT_SUFFIXES
+                )
+            )
+        else:
+            files.append(path)
+    return list(dict.fromkeys(files))
+
+
+def init_worker() -> None:
+    # Don't reuse connections inherited from the parent process
+    engine.dispose(close=False)
+
+
+def ingest(files: list[Path], workers: int, batch_size: int) -> IngestResult:
+    """Ingest files in parallel, one file per task"""
+    total = IngestResult()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = {
+            pool.submit(ingest_file, file_path, batch_size): file_path
+            for file_path in files
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            total.merge(result)
+            print(
+                f"  {futures[future]}: {sum(result.rows.values())} rows, "
+                f"{len(result.errors)} errors"
+            )
+    return total
+
+
+def write_error_report(errors: list[dict], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for error in errors:
+            f.write(json.dumps(error) + "\n")
+
+
+def report(result: IngestResult, elapsed: float, workers: int) -> None:
+    total = sum(result.rows.values())
+    print(f"\n{'=' * 50}")
+    print(f"Files: {result.files} (workers {workers})")
+    for table, rows in sorted(result.rows.items()):
+        print(f"{table:<22}{rows:>10}")
+    print(f"\nTotal: {total} rows in {elapsed:.2f}s ({total / elapsed:.0f} rows/sec)")
+    print(f"Errors: {len(result.errors)}")
+    print(f"{'=' * 50}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="+", help="Files or directories to ingest")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--errors", default="ingest_errors.jsonl")
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    print(f"\nIngesting {len(files)} files with {args.workers} workers...\n")
+
+    # Create tables if they don't exist
+    from app.models.utils import Base
+
+    Base.metadata.create_all(engine)
+
+    started = time.perf_counter()
+    result = ingest(files, args.workers, args.batch_size)
+    with SessionLocal() as session:
+        refresh_type_counts(session)
+    report(result, time.perf_counter() - started, args.workers)
+
+    if result.errors:
+        write_error_report(result.errors, args.errors)
+        print(f"Error report written to {args.errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Perceptual hashes for spotting near-duplicate merchant photos
+
+perceptual_hash() is a 256-bit difference hash (dHash): the image is shrunk
+to 17x16 grayscale and each bit records whether a pixel is brighter than its
+right neighbour. Re-encoded or resized copies of a photo hash within a few
+bits of each other (hamming_distance), while different photos differ in
+about half of them.
+
+The 64-bit variant (9x8) is too coarse for this data: the menu screenshots
+in data/additional_photos hash within 2-5 bits of each other. At 256 bits,
+re-encodes and resizes of the sample photos stay within 23 bits and distinct
+photos are at least 36 bits apart, hence MAX_DISTANCE.
+"""
+
+from collections import defaultdict
+from itertools import pairwise
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from PIL import Image
+
+from migrations.placeholders import flatten, open_image
+
+HASH_SIZE = 16
+HASH_BITS = HASH_SIZE * HASH_SIZE
+MAX_DISTANCE = 24
+
+T = TypeVar("T")
+
+
+def hash_image(img: Image.Image) -> str:
+    gray = flatten(img).convert("L")
+    gray = gray.resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS)
+    pixels = gray.tobytes()
+
+    value = 0
+    for y in range(HASH_SIZE):
+        row = pixels[y * (HASH_SIZE + 1) : (y + 1) * (HASH_SIZE + 1)]
+        for left, right in pairwise(row):
+            value = (value << 1) | (left > right)
+    return f"{value:0{HASH_BITS // 4}x}"
+
+
+def perceptual_hash(source: Path | bytes) -> str:
+    """Hex dHash of an image file or its bytes; safe to run in a process pool"""
+    return hash_image(open_image(source, HASH_SIZE * 4))
+
+
+def hamming_distance(a: str, b: str) -> int:
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+class HashIndex(Generic[T]):
+    """
+    Finds stored hashes within max_distance bits of a hash
+
+    The bits are split into max_distance + 1 bands. Two hashes that differ in
+    at most max_distance bits agree exactly on at least one band, so only
+    hashes sharing a band have to be compared.
+    """
+
+    def __init__(self, max_distance: int = MAX_DISTANCE):
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        bounds = [round(i * HASH_BITS / bands) for i in range(bands + 1)]
+        self.bands = [
+            (start, (1 << (end - start)) - 1) for start, end in pairwise(bounds)
+        ]
+        self.buckets: defaultdict[tuple[int, int], list[tuple[int, T]]] = defaultdict(
+            list
+        )
+
+    def add(self, phash: str, item: T) -> None:
+        value = int(phash, 16)
+        for band, (shift, mask) in enumerate(self.bands):
+            self.buckets[(band, (value >> shift) & mask)].append((value, item))
+
+    def find(self, phash: str) -> list[tuple[int, T]]:
+        """(distance, item) for every match, closest first"""
+        value = int(phash, 16)
+        matches: dict[int, tuple[int, T]] = {}
+        for band, (shift, mask) in enumerate(self.bands):
+            for other, item in self.buckets.get((band, (value >> shift) & mask), []):
+                distance = (value ^ other).bit_count()
+                if distance <= self.max_distance:
+                    matches[id(item)] = (distance, item)
+        return sorted(matches.values(), key=lambda match: match[0])
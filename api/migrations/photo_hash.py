@@ -0,0 +1,72 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to store a perceptual hash per photo for duplicate detection.
+
+This migration:
+1. Adds a nullable perceptual_hash column to photos
+2. Indexes it, for looking up exact duplicates
+
+New uploads are hashed by migrations.photo_upload, which uses the hashes to
+skip or link near-duplicate photos; existing photos are backfilled by
+migrations.seed_blur_data.
+
+Usage:
+    uv run python -m migrations.photo_hash
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Adding perceptual_hash column to photos...")
+    session.execute(
+        text(
+            """
+            ALTER TABLE photos
+            ADD COLUMN IF NOT EXISTS perceptual_hash VARCHAR(64);
+        """
+        )
+    )
+
+    print("Creating perceptual_hash index...")
+    session.execute(
+        text(
+            """
+            CREATE INDEX IF NOT EXISTS ix_photos_perceptual_hash
+            ON photos (perceptual_hash);
+        """
+        )
+    )
+
+    session.commit()
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Dropping perceptual_hash column...")
+    session.execute(text("ALTER TABLE photos DROP COLUMN IF EXISTS perceptual_hash;"))
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting perceptual hash migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
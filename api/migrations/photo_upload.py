@@ -0,0 +1,629 @@
+# pyright: reportUnusedCallResult=false
+"""
+Concurrent photo upload pipeline shared by photos.py and additional_photos.py
+
+The pipeline:
+1. Loads existing merchants and photos in one query each and skips photos
+   that are already recorded
+2. Uploads the rest from a bounded thread pool, retrying failed uploads with
+   exponential backoff and jitter
+3. Encodes responsive WebP/JPEG variants and the placeholders (blur data URL
+   and ThumbHash) of every photo from the local file on a process pool (see
+   image_variants.py and placeholders.py) and uploads the variants next to
+   the original; photos recorded before variants existed get only their
+   variants generated
+4. Hashes every new photo (see perceptual_hash.py) before uploading it:
+   near-duplicates of a photo the same merchant already has are skipped
+   (except primary photos), and copies of another merchant's photo, or a
+   primary photo matching one of the merchant's own, are recorded against
+   the blobs already uploaded for it instead of being uploaded again
+5. Appends every finished upload to a progress file, so an interrupted run
+   records those photos on the next run without uploading them again
+6. Writes photo and photo variant rows (and merchants.photo_url for primary
+   photos) in batches, one transaction per batch
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+
+from PIL import Image
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import settings
+from app.models import Merchant, Photo, PhotoVariant
+from app.storage import BlobStorage, LocalBlobStorage, content_type_for, get_storage
+from migrations.image_variants import EncodedVariant, encode_variants
+from migrations.perceptual_hash import MAX_DISTANCE, HashIndex, perceptual_hash
+from migrations.placeholders import Placeholders, generate_placeholders
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+@dataclass(frozen=True)
+class PhotoJob:
+    merchant_id: int
+    file_path: Path
+    order: int  # 0 is the primary photo
+    photo_id: int | None = None  # Set when only the variants are missing
+    perceptual_hash: str | None = None
+
+    @property
+    def key(self) -> tuple[int, int]:
+        return (self.merchant_id, self.order)
+
+    @property
+    def name(self) -> str:
+        return "primary" if self.order == 0 else f"photo-{self.order}"
+
+    @property
+    def blob_path(self) -> str:
+        return f"merchants/{self.merchant_id}/{self.name}{self.file_path.suffix}"
+
+    def variant_blob_path(self, variant: EncodedVariant) -> str:
+        name = f"{self.name}-{variant.width}w{variant.path.suffix}"
+        return f"merchants/{self.merchant_id}/{name}"
+
+
+@dataclass
+class UploadedPhoto:
+    merchant_id: int
+    order: int
+    url: str | None  # Blob reference; None when only variants were uploaded
+    file_extension: str
+    width: int | None
+    height: int | None
+    size: int
+    photo_id: int | None = None
+    blur_data_url: str | None = None
+    thumb_hash: str | None = None
+    perceptual_hash: str | None = None
+    variants: list[dict[str, str | int]] = field(default_factory=list)
+
+    @property
+    def key(self) -> tuple[int, int]:
+        return (self.merchant_id, self.order)
+
+
+@dataclass(eq=False)
+class HashedPhoto:
+    """A photo in the duplicate index and the photo its blobs come from"""
+
+    merchant_id: int
+    # A job still to upload, an upload not recorded yet, or a stored photo id
+    source: PhotoJob | UploadedPhoto | int
+
+
+@dataclass
+class UploadStats:
+    total: int = 0
+    uploaded: int = 0
+    variants: int = 0
+    resumed: int = 0
+    skipped: int = 0
+    duplicates: int = 0
+    linked: int = 0
+    failed: int = 0
+    retries: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    def report(self, title: str) -> None:
+        print(f"\n{'=' * 50}")
+        print(title)
+        print(f"Uploaded: {self.uploaded} ({self.variants} variants)")
+        print(f"Recorded from progress file: {self.resumed}")
+        print(f"Skipped: {self.skipped}")
+        print(f"Duplicates: {self.duplicates} skipped, {self.linked} linked")
+        print(f"Errors: {self.failed} ({self.retries} retries)")
+        print(f"Total: {self.total}")
+        if self.seconds:
+            print(
+                f"Throughput: {self.uploaded / self.seconds:.1f} photos/sec, "
+                f"{self.bytes / self.seconds / 1024 / 1024:.2f} MB/sec"
+            )
+        print(f"{'=' * 50}\n")
+
+
+def stored_photo(photo: Photo) -> UploadedPhoto:
+    """A recorded photo as an upload, to link duplicates to its blobs"""
+    return UploadedPhoto(
+        merchant_id=photo.merchant_id,
+        order=photo.order,
+        url=photo.blob_ref,
+        file_extension=photo.file_extension,
+        width=photo.width,
+        height=photo.height,
+        size=0,
+        blur_data_url=photo.blur_data_url,
+        thumb_hash=photo.thumb_hash,
+        perceptual_hash=photo.perceptual_hash,
+        variants=[
+            {
+                "url": variant.url,
+                "format": variant.format,
+                "width": variant.width,
+                "height": variant.height,
+                "size": variant.size,
+            }
+            for variant in photo.variants
+        ],
+    )
+
+
+def primary_photo_jobs(photos_dir: Path) -> list[PhotoJob]:
+    """One job per data/merchant_photos/{merchant_id}.jpg"""
+    jobs: list[PhotoJob] = []
+    for photo_file in sorted(photos_dir.glob("*.jpg")):
+        if not photo_file.stem.isdigit():
+            print(f"SKIP: Invalid filename format: {photo_file.name}")
+            continue
+        jobs.append(PhotoJob(int(photo_file.stem), photo_file, 0))
+    return jobs
+
+
+def additional_photo_jobs(photos_dir: Path) -> list[PhotoJob]:
+    """Jobs for data/additional_photos/{merchant_id}/*, numbered from 1"""
+    jobs: list[PhotoJob] = []
+    merchant_dirs = sorted(
+        (d for d in photos_dir.iterdir() if d.is_dir() and d.name.isdigit()),
+        key=lambda d: int(d.name),
+    )
+    for merchant_dir in merchant_dirs:
+        photo_files = sorted(
+            (f for f in merchant_dir.iterdir() if f.suffix.lower() in IMAGE_SUFFIXES),
+            key=lambda p: (int(p.stem) if p.stem.isdigit() else float("inf"), p.stem),
+        )
+        for order, photo_file in enumerate(photo_files, start=1):
+            jobs.append(PhotoJob(int(merchant_dir.name), photo_file, order))
+    return jobs
+
+
+class PhotoUploader:
+    def __init__(
+        self,
+        backend: BlobStorage,
+        session: Session | None,
+        concurrency: int = 8,
+        batch_size: int = 50,
+        attempts: int = 4,
+        backoff_seconds: float = 0.5,
+        progress_path: Path | None = None,
+        variants: bool = True,
+        encode_workers: int | None = None,
+        dedupe: bool = True,
+        max_distance: int = MAX_DISTANCE,
+    ):
+        self.backend = backend
+        self.session = session
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.attempts = attempts
+        self.backoff_seconds = backoff_seconds
+        self.progress_path = progress_path
+        self.variants = variants
+        self.encode_workers = encode_workers or os.cpu_count() or 1
+        self.dedupe = dedupe
+        self.max_distance = max_distance
+        # Jobs that reuse the blobs of a job in the queue, by that job's key
+        self.links: dict[tuple[int, int], list[PhotoJob]] = {}
+        self.encoder: Executor | None = None
+        self.variant_dir: Path | None = None
+        self.pending: list[UploadedPhoto] = []
+        self.stats = UploadStats()
+        self._retries_lock = threading.Lock()
+
+    def run(self, jobs: list[PhotoJob]) -> UploadStats:
+        """Upload and record jobs; without a session nothing is written to the DB"""
+        started = time.perf_counter()
+        self.stats.total = len(jobs)
+
+        with (
+            tempfile.TemporaryDirectory() as variant_dir,
+            ProcessPoolExecutor(max_workers=self.encode_workers) as encoder,
+            ThreadPoolExecutor(max_workers=self.concurrency) as pool,
+        ):
+            # Encoding is CPU-bound, so upload threads hand it to the processes
+            self.encoder, self.variant_dir = encoder, Path(variant_dir)
+
+            todo = self.plan(jobs)
+            print(
+                f"Uploading {len(todo)} photo(s) with {self.concurrency} workers "
+                f"({self.stats.skipped} skipped, {self.stats.resumed} resumed, "
+                f"{self.stats.duplicates + self.stats.linked} duplicates)...\n"
+            )
+
+            futures = {pool.submit(self.upload, job): job for job in todo}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    photo = future.result()
+                except Exception as e:
+                    print(f"ERROR: Failed to upload {job.file_path}: {e}")
+                    self.stats.failed += 1 + len(self.links.pop(job.key, []))
+                    continue
+
+                print(
+                    f"  [OK] {job.blob_path} ({photo.width}x{photo.height}, "
+                    f"{len(photo.variants)} variants)"
+                )
+                self.record_progress(photo)
+                self.pending.append(photo)
+                self.stats.uploaded += photo.url is not None
+                self.stats.variants += len(photo.variants)
+                self.stats.bytes += photo.size if photo.url else 0
+                self.stats.bytes += sum(int(v["size"]) for v in photo.variants)
+                for linked in self.links.pop(job.key, []):
+                    self.link(photo, linked)
+                if len(self.pending) >= self.batch_size:
+                    self.flush()
+            self.encoder = None
+            self.variant_dir = None
+
+        self.flush()
+        self.stats.seconds = time.perf_counter() - started
+
+        # Everything is recorded, so the progress file is no longer needed
+        if (
+            self.session is not None
+            and not self.stats.failed
+            and self.progress_path is not None
+        ):
+            self.progress_path.unlink(missing_ok=True)
+
+        return self.stats
+
+    def plan(self, jobs: list[PhotoJob]) -> list[PhotoJob]:
+        """Drop jobs that are already done and queue resumed uploads"""
+        merchant_ids: set[int] | None = None
+        # (merchant_id, order) -> (photo id, whether it has variants)
+        existing: dict[tuple[int, int], tuple[int, bool]] = {}
+        if self.session is not None:
+            ids = {job.merchant_id for job in jobs}
+            merchant_ids = set(
+                self.session.scalars(select(Merchant.id).where(Merchant.id.in_(ids)))
+            )
+            has_variants = (
+                exists().where(PhotoVariant.photo_id == Photo.id).label("has_variants")
+            )
+            existing = {
+                (merchant_id, order): (photo_id, has)
+                for photo_id, merchant_id, order, has in self.session.execute(
+                    select(
+                        Photo.id, Photo.merchant_id, Photo.order, has_variants
+                    ).where(Photo.merchant_id.in_(ids))
+                )
+            }
+
+        progress = self.load_progress()
+
+        todo: list[PhotoJob] = []
+        for job in jobs:
+            if merchant_ids is not None and job.merchant_id not in merchant_ids:
+                print(f"SKIP: Merchant with ID {job.merchant_id} not found")
+                self.stats.skipped += 1
+            elif job.key in existing:
+                photo_id, has_variants = existing[job.key]
+                if has_variants or not self.variants:
+                    self.stats.skipped += 1
+                elif job.key in progress and progress[job.key].photo_id == photo_id:
+                    self.pending.append(progress[job.key])
+                    self.stats.resumed += 1
+                else:
+                    todo.append(replace(job, photo_id=photo_id))
+            elif job.key in progress:
+                self.pending.append(progress[job.key])
+                self.stats.resumed += 1
+            else:
+                todo.append(job)
+        return self.find_duplicates(todo)
+
+    def find_duplicates(self, todo: list[PhotoJob]) -> list[PhotoJob]:
+        """Hash new photos, then drop or link the ones that are duplicates"""
+        new = [job for job in todo if job.photo_id is None]
+        if not new or self.encoder is None:
+            return todo
+        futures = [self.encoder.submit(perceptual_hash, job.file_path) for job in new]
+        hashed: list[PhotoJob] = []
+        for job, future in zip(new, futures, strict=True):
+            try:
+                hashed.append(replace(job, perceptual_hash=future.result()))
+            except Exception as e:
+                # Uploaded without deduplication; a file that can't be read
+                # fails there and is counted like any other failed upload
+                print(f"WARNING: Could not hash {job.file_path}: {e}")
+                hashed.append(job)
+        new = hashed
+        remaining = [job for job in todo if job.photo_id is not None]
+        if not self.dedupe:
+            return remaining + new
+
+        index: HashIndex[HashedPhoto] = HashIndex(self.max_distance)
+        if self.session is not None:
+            for photo_id, merchant_id, phash in self.session.execute(
+                select(Photo.id, Photo.merchant_id, Photo.perceptual_hash).where(
+                    Photo.perceptual_hash.is_not(None)
+                )
+            ):
+                index.add(phash, HashedPhoto(merchant_id, photo_id))
+        for photo in self.pending:
+            if photo.perceptual_hash and photo.photo_id is None:
+                index.add(photo.perceptual_hash, HashedPhoto(photo.merchant_id, photo))
+
+        stored_links: list[tuple[PhotoJob, int]] = []
+        for job in new:
+            if job.perceptual_hash is None:
+                remaining.append(job)
+                continue
+            matches = [match for _, match in index.find(job.perceptual_hash)]
+            own = [match for match in matches if match.merchant_id == job.merchant_id]
+            # A primary photo is always recorded, reusing the blobs of the
+            # merchant's matching photo, so the merchant keeps a primary photo
+            # and merchants.photo_url
+            if own and job.order == 0:
+                matches = own
+            elif own:
+                print(f"SKIP: {job.file_path} duplicates another photo of the merchant")
+                self.stats.duplicates += 1
+                continue
+
+            if not matches:
+                index.add(job.perceptual_hash, HashedPhoto(job.merchant_id, job))
+                remaining.append(job)
+                continue
+
+            source = matches[0].source
+            index.add(job.perceptual_hash, HashedPhoto(job.merchant_id, source))
+            if isinstance(source, PhotoJob):
+                self.links.setdefault(source.key, []).append(job)
+            elif isinstance(source, UploadedPhoto):
+                self.link(source, job)
+            else:
+                stored_links.append((job, source))
+
+        if stored_links and self.session is not None:
+            stored = self.session.scalars(
+                select(Photo)
+                .where(Photo.id.in_({photo_id for _, photo_id in stored_links}))
+                .options(selectinload(Photo.variants))
+            )
+            sources = {photo.id: stored_photo(photo) for photo in stored}
+            for job, photo_id in stored_links:
+                self.link(sources[photo_id], job)
+
+        return remaining
+
+    def link(self, source: UploadedPhoto, job: PhotoJob) -> None:
+        """Record job as a photo that reuses the blobs of source"""
+        photo = replace(
+            source,
+            merchant_id=job.merchant_id,
+            order=job.order,
+            photo_id=None,
+            perceptual_hash=job.perceptual_hash,
+            variants=[dict(variant) for variant in source.variants],
+        )
+        print(f"  [LINK] {job.blob_path} -> {photo.url}")
+        self.record_progress(photo)
+        self.pending.append(photo)
+        self.stats.linked += 1
+
+    def upload(self, job: PhotoJob) -> UploadedPhoto:
+        """Upload one photo, retrying with exponential backoff; runs in the pool"""
+        with Image.open(job.file_path) as img:
+            width, height = img.width, img.height
+
+        url = None
+        placeholders: Future[Placeholders] | None = None
+        if job.photo_id is None:
+            if self.encoder is not None:
+                placeholders = self.encoder.submit(generate_placeholders, job.file_path)
+            url = self.upload_blob(job.file_path, job.blob_path)
+
+        variants: list[dict[str, str | int]] = []
+        for variant in self.encode(job):
+            variants.append(
+                {
+                    "url": self.upload_blob(
+                        variant.path, job.variant_blob_path(variant)
+                    ),
+                    "format": variant.format,
+                    "width": variant.width,
+                    "height": variant.height,
+                    "size": variant.size,
+                }
+            )
+            variant.path.unlink()
+
+        generated = placeholders.result() if placeholders else None
+        return UploadedPhoto(
+            merchant_id=job.merchant_id,
+            order=job.order,
+            url=url,
+            file_extension=job.file_path.suffix.lstrip("."),
+            width=width,
+            height=height,
+            size=job.file_path.stat().st_size,
+            photo_id=job.photo_id,
+            blur_data_url=generated.blur_data_url if generated else None,
+            thumb_hash=generated.thumb_hash if generated else None,
+            perceptual_hash=job.perceptual_hash,
+            variants=variants,
+        )
+
+    def encode(self, job: PhotoJob) -> list[EncodedVariant]:
+        if not self.variants or self.encoder is None or self.variant_dir is None:
+            return []
+        stem = f"{job.merchant_id}-{job.name}"
+        return self.encoder.submit(
+            encode_variants, job.file_path, self.variant_dir, stem
+        ).result()
+
+    def upload_blob(self, file_path: Path, blob_path: str) -> str:
+        attempt = 1
+        while True:
+            try:
+                return self.backend.upload(
+                    file_path, blob_path, content_type_for(file_path)
+                )
+            except Exception as e:
+                if attempt >= self.attempts:
+                    raise
+                # Exponential backoff with jitter so retries don't line up
+                delay = self.backoff_seconds * 2 ** (attempt - 1)
+                delay *= 0.5 + random.random()
+                print(f"  RETRY: {blob_path} in {delay:.1f}s ({e})")
+                with self._retries_lock:
+                    self.stats.retries += 1
+                time.sleep(delay)
+                attempt += 1
+
+    def load_progress(self) -> dict[tuple[int, int], UploadedPhoto]:
+        if self.progress_path is None or not self.progress_path.exists():
+            return {}
+        photos: dict[tuple[int, int], UploadedPhoto] = {}
+        with self.progress_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    photo = UploadedPhoto(**json.loads(line))
+                    photos[photo.key] = photo
+        return photos
+
+    def record_progress(self, photo: UploadedPhoto) -> None:
+        if self.progress_path is None:
+            return
+        with self.progress_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(photo)) + "\n")
+
+    def flush(self) -> None:
+        """Record pending uploads in a single transaction"""
+        if not self.pending or self.session is None:
+            self.pending = []
+            return
+
+        photos, self.pending = self.pending, []
+        new = [photo for photo in photos if photo.photo_id is None]
+        try:
+            photo_ids: list[int] = []
+            if new:
+                photo_ids = list(
+                    self.session.scalars(
+                        insert(Photo).returning(Photo.id, sort_by_parameter_order=True),
+                        [
+                            {
+                                "merchant_id": photo.merchant_id,
+                                "blob_ref": photo.url,
+                                "file_extension": photo.file_extension,
+                                "width": photo.width,
+                                "height": photo.height,
+                                "blur_data_url": photo.blur_data_url,
+                                "thumb_hash": photo.thumb_hash,
+                                "perceptual_hash": photo.perceptual_hash,
+                                "is_primary": photo.order == 0,
+                                "order": photo.order,
+                            }
+                            for photo in new
+                        ],
+                    )
+                )
+            new_ids = dict(zip((photo.key for photo in new), photo_ids))
+
+            variants = [
+                {"photo_id": photo.photo_id or new_ids[photo.key], **variant}
+                for photo in photos
+                for variant in photo.variants
+            ]
+            if variants:
+                self.session.execute(insert(PhotoVariant), variants)
+
+            primary = [
+                {"id": photo.merchant_id, "photo_url": photo.url}
+                for photo in new
+                if photo.order == 0
+            ]
+            if primary:
+                self.session.execute(update(Merchant), primary)
+            self.session.commit()
+        except Exception as e:
+            # The uploads stay in the progress file and are recorded next run
+            print(f"ERROR: Failed to record {len(photos)} photo(s): {e}")
+            self.session.rollback()
+            self.stats.failed += len(photos)
+
+
+def add_upload_arguments(parser: argparse.ArgumentParser, progress: str) -> None:
+    parser.add_argument(
+        "--backend", choices=["vercel", "local"], default=settings.BLOB_STORAGE
+    )
+    parser.add_argument(
+        "--local-root",
+        type=Path,
+        default=Path(settings.LOCAL_BLOB_ROOT),
+        help="Directory used by the local backend",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--attempts", type=int, default=4)
+    parser.add_argument("--progress", type=Path, default=Path(progress))
+    parser.add_argument(
+        "--encode-workers",
+        type=int,
+        help="Processes encoding variants and placeholders (default: CPU count)",
+    )
+    parser.add_argument(
+        "--no-variants",
+        dest="variants",
+        action="store_false",
+        help="Upload originals only, without responsive variants",
+    )
+    parser.add_argument(
+        "--no-dedupe",
+        dest="dedupe",
+        action="store_false",
+        help="Upload near-duplicate photos instead of skipping or linking them",
+    )
+    parser.add_argument(
+        "--max-distance",
+        type=int,
+        default=MAX_DISTANCE,
+        help="Bits two perceptual hashes may differ by and still be duplicates",
+    )
+
+
+def backend_from_args(args: argparse.Namespace) -> BlobStorage:
+    if args.backend == "local":
+        return LocalBlobStorage(args.local_root)
+    return get_storage("vercel")
+
+
+def run_upload(
+    session: Session | None, jobs: Iterable[PhotoJob], args: argparse.Namespace
+) -> UploadStats:
+    uploader = PhotoUploader(
+        backend_from_args(args),
+        session,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        attempts=args.attempts,
+        progress_path=args.progress,
+        variants=args.variants,
+        encode_workers=args.encode_workers,
+        dedupe=args.dedupe,
+        max_distance=args.max_distance,
+    )
+    return uploader.run(list(jobs))
@@ -0,0 +1,81 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to add the photo_variants table for responsive images.
+
+This migration:
+1. Creates the photo_variants table (one row per photo, width and format)
+2. Adds the index used to load the variants of a page of photos
+
+Variants of photos uploaded before this migration are generated by re-running
+migrations.photos and migrations.additional_photos, which only encode and
+upload the variants for photos that are already recorded.
+
+Usage:
+    uv run python -m migrations.photo_variants
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Creating photo_variants table...")
+    session.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS photo_variants (
+                id SERIAL PRIMARY KEY,
+                photo_id INTEGER NOT NULL
+                    REFERENCES photos(id) ON DELETE CASCADE,
+                url TEXT NOT NULL,
+                format VARCHAR(10) NOT NULL,
+                width INTEGER NOT NULL,
+                height INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                UNIQUE (photo_id, format, width)
+            );
+        """
+        )
+    )
+
+    print("Creating photo_id index...")
+    session.execute(
+        text(
+            """
+            CREATE INDEX IF NOT EXISTS ix_photo_variants_photo_id
+            ON photo_variants (photo_id);
+        """
+        )
+    )
+
+    session.commit()
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Dropping photo_variants table...")
+    session.execute(text("DROP TABLE IF EXISTS photo_variants;"))
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting photo variants migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
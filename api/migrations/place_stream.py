@@ -0,0 +1,134 @@
+# pyright: reportMissingTypeArgument=false
+# pyright: reportAny=false
+"""
+Streaming readers for Google Maps places exports
+
+iter_places() yields one place at a time, so memory stays bounded by the
+largest single place rather than the size of the file. It accepts:
+- JSON files shaped like {"places": [...]} (or a bare top-level array),
+  parsed incrementally with json.JSONDecoder.raw_decode over buffered reads
+- NDJSON files (.ndjson / .jsonl), one place per line
+"""
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TextIO
+
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+
+class JSONStream:
+    """Incremental reader of JSON values from a text file"""
+
+    def __init__(self, file: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int | None = None) -> bool:
+        """Append more input to the buffer; returns False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.file.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed input so the buffer only holds the current value
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of buffer")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Probably cut off mid-value; read at least as much again as
+                # is buffered so large values don't get re-parsed many times
+                if not self.fill(max(self.chunk_size, len(self.buffer))):
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def array_items(self) -> Iterator:
+        """Yield the items of the array starting at the current position"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' in array, got {separator!r}")
+
+
+def iter_json_places(file: TextIO, key: str = "places") -> Iterator[dict]:
+    stream = JSONStream(file)
+    if stream.peek() == "[":
+        yield from stream.array_items()
+        return
+
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        name = stream.value()
+        stream.expect(":")
+        if name == key:
+            yield from stream.array_items()
+        else:
+            stream.value()  # Skip other top-level values
+
+        separator = stream.peek()
+        stream.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or '}}' in object, got {separator!r}")
+
+
+def iter_ndjson_places(file: TextIO) -> Iterator[dict]:
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_places(file_path: str | Path) -> Iterator[dict]:
+    """Yield places from a JSON or NDJSON export one at a time"""
+    path = Path(file_path)
+    with path.open("r", encoding="utf-8") as f:
+        if path.suffix.lower() in NDJSON_SUFFIXES:
+            yield from iter_ndjson_places(f)
+        else:
+            yield from iter_json_places(f)
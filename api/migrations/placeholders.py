@@ -0,0 +1,198 @@
+"""
+Low-resolution placeholders shown while merchant photos load
+
+- blur_data_url: a tiny base64 JPEG data URL, for the Next.js Image
+  blurDataURL prop (~1 KB per photo)
+- thumb_hash: a ThumbHash (https://evanw.github.io/thumbhash/), ~25 bytes
+  that clients decode into a placeholder image themselves (~35 characters
+  of base64)
+
+The functions take a file path or the image bytes and return plain data, so
+they can run in a process pool.
+"""
+
+import base64
+import io
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+BLUR_WIDTH = 10
+# ThumbHash only keeps the low frequencies, so larger inputs add nothing
+THUMB_HASH_MAX_SIZE = 100
+
+
+@dataclass(frozen=True)
+class Placeholders:
+    blur_data_url: str
+    thumb_hash: str
+
+
+def open_image(source: Path | bytes, size: int) -> Image.Image:
+    """Open an upright image, decoding JPEGs at the smallest scale >= size"""
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as img:
+        # Let the JPEG decoder skip most of the pixels we'd throw away anyway
+        img.draft("RGB", (size, size))
+        return ImageOps.exif_transpose(img)
+
+
+def flatten(img: Image.Image) -> Image.Image:
+    """Convert to RGB, putting transparent images on a white background"""
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    if img.mode != "RGB":
+        return img.convert("RGB")
+    return img
+
+
+def encode_blur_data_url(img: Image.Image, width: int = BLUR_WIDTH) -> str:
+    height = max(1, int(width * img.height / img.width))
+    small = flatten(img).resize(
+        (width, height), Image.Resampling.LANCZOS, reducing_gap=2.0
+    )
+
+    buffer = io.BytesIO()
+    small.save(buffer, format="JPEG", quality=70)
+
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return f"data:image/jpeg;base64,{encoded}"
+
+
+def _round(value: float) -> int:
+    # ThumbHash is defined with JavaScript's Math.round (halves round up)
+    return math.floor(value + 0.5)
+
+
+def _encode_channel(
+    channel: list[float], w: int, h: int, nx: int, ny: int
+) -> tuple[float, list[float], float]:
+    """DCT of one channel: (DC term, normalized AC terms, AC scale)"""
+    fy_table = [
+        [math.cos(math.pi / h * cy * (y + 0.5)) for y in range(h)] for cy in range(ny)
+    ]
+    dc = 0.0
+    ac: list[float] = []
+    scale = 0.0
+    for cy in range(ny):
+        cx = 0
+        while cx * ny < nx * (ny - cy):
+            fx = [math.cos(math.pi / w * cx * (x + 0.5)) for x in range(w)]
+            fy = fy_table[cy]
+            f = 0.0
+            for y in range(h):
+                row = channel[y * w : (y + 1) * w]
+                f += fy[y] * sum(value * c for value, c in zip(row, fx))
+            f /= w * h
+            if cx or cy:
+                ac.append(f)
+                scale = max(scale, abs(f))
+            else:
+                dc = f
+            cx += 1
+    if scale:
+        ac = [0.5 + 0.5 / scale * f for f in ac]
+    return dc, ac, scale
+
+
+def encode_thumb_hash(img: Image.Image) -> str:
+    """Base64 ThumbHash of an image, a port of the reference rgbaToThumbHash"""
+    img = img.convert("RGBA")
+    img.thumbnail((THUMB_HASH_MAX_SIZE, THUMB_HASH_MAX_SIZE))
+    w, h = img.size
+    pixels = list(img.getdata())
+
+    # Average color, weighted by alpha
+    avg_r = avg_g = avg_b = avg_a = 0.0
+    for r, g, b, a in pixels:
+        alpha = a / 255
+        avg_r += alpha / 255 * r
+        avg_g += alpha / 255 * g
+        avg_b += alpha / 255 * b
+        avg_a += alpha
+    if avg_a:
+        avg_r /= avg_a
+        avg_g /= avg_a
+        avg_b /= avg_a
+
+    has_alpha = avg_a < w * h
+    l_limit = 5 if has_alpha else 7
+    lx = max(1, _round(l_limit * w / max(w, h)))
+    ly = max(1, _round(l_limit * h / max(w, h)))
+
+    # Convert to LPQA, composited over the average color
+    l_channel: list[float] = []
+    p_channel: list[float] = []
+    q_channel: list[float] = []
+    a_channel: list[float] = []
+    for r, g, b, a in pixels:
+        alpha = a / 255
+        r = avg_r * (1 - alpha) + alpha / 255 * r
+        g = avg_g * (1 - alpha) + alpha / 255 * g
+        b = avg_b * (1 - alpha) + alpha / 255 * b
+        l_channel.append((r + g + b) / 3)
+        p_channel.append((r + g) / 2 - b)
+        q_channel.append(r - g)
+        a_channel.append(alpha)
+
+    l_dc, l_ac, l_scale = _encode_channel(l_channel, w, h, max(3, lx), max(3, ly))
+    p_dc, p_ac, p_scale = _encode_channel(p_channel, w, h, 3, 3)
+    q_dc, q_ac, q_scale = _encode_channel(q_channel, w, h, 3, 3)
+
+    is_landscape = w > h
+    header24 = (
+        _round(63 * l_dc)
+        | (_round(31.5 + 31.5 * p_dc) << 6)
+        | (_round(31.5 + 31.5 * q_dc) << 12)
+        | (_round(31 * l_scale) << 18)
+        | (has_alpha << 23)
+    )
+    header16 = (
+        (ly if is_landscape else lx)
+        | (_round(63 * p_scale) << 3)
+        | (_round(63 * q_scale) << 9)
+        | (is_landscape << 15)
+    )
+    hash_bytes = [
+        header24 & 255,
+        (header24 >> 8) & 255,
+        header24 >> 16,
+        header16 & 255,
+        header16 >> 8,
+    ]
+
+    channels = [l_ac, p_ac, q_ac]
+    if has_alpha:
+        a_dc, a_ac, a_scale = _encode_channel(a_channel, w, h, 5, 5)
+        hash_bytes.append(_round(15 * a_dc) | (_round(15 * a_scale) << 4))
+        channels.append(a_ac)
+
+    # AC terms are packed two 4-bit values per byte
+    nibbles = [_round(15 * f) for ac in channels for f in ac]
+    if len(nibbles) % 2:
+        nibbles.append(0)
+    hash_bytes += [lo | (hi << 4) for lo, hi in zip(nibbles[::2], nibbles[1::2])]
+
+    return base64.b64encode(bytes(hash_bytes)).decode("ascii")
+
+
+def blur_data_url(source: Path | bytes, width: int = BLUR_WIDTH) -> str:
+    """Downscale an image to `width` pixels wide and encode it as a data URL"""
+    return encode_blur_data_url(open_image(source, width * 8), width)
+
+
+def thumb_hash(source: Path | bytes) -> str:
+    return encode_thumb_hash(open_image(source, THUMB_HASH_MAX_SIZE))
+
+
+def generate_placeholders(source: Path | bytes) -> Placeholders:
+    """Both placeholders from a single decode"""
+    img = open_image(source, THUMB_HASH_MAX_SIZE)
+    return Placeholders(
+        blur_data_url=encode_blur_data_url(img),
+        thumb_hash=encode_thumb_hash(img),
+    )
@@ -1,9 +1,10 @@
 """
-Script to recreate the photos table with new schema for Vercel Blob photos
+Script to recreate the photos table with new schema for blob storage photos
 
 This script:
-1. Drops all data from photos table
-2. Recreates the table with new schema optimized for Vercel Blob storage
+1. Drops all data from photos table (and the photo_variants table)
+2. Recreates the table with new schema optimized for blob storage
+3. Recreates the photo_variants table
 
 Usage:
     uv run python -m migrations.recreate_photos_table
@@ -12,6 +13,7 @@ Usage:
 from sqlalchemy import text
 
 from app.database import SessionLocal
+from migrations.photo_variants import upgrade as create_photo_variants
 
 
 def main():
@@ -22,21 +24,25 @@ def main():
         try:
             # Drop the existing photos table
             print("Dropping existing photos table...")
+            session.execute(text("DROP TABLE IF EXISTS photo_variants"))
             session.execute(text("DROP TABLE IF EXISTS photos CASCADE"))
             session.commit()
             print("[OK] Dropped photos table")
 
             # Create new photos table with updated schema
-            print("\nCreating new photos table with Vercel Blob schema...")
+            print("\nCreating new photos table with blob storage schema...")
             session.execute(
                 text("""
                 CREATE TABLE photos (
                     id SERIAL PRIMARY KEY,
                     merchant_id INTEGER NOT NULL,
-                    vercel_blob_url TEXT NOT NULL,
+                    blob_ref TEXT NOT NULL,
                     file_extension VARCHAR(10) NOT NULL,
                     width INTEGER,
                     height INTEGER,
+                    blur_data_url TEXT,
+                    thumb_hash VARCHAR(64),
+                    perceptual_hash VARCHAR(64),
                     is_primary BOOLEAN NOT NULL DEFAULT FALSE,
                     "order" INTEGER NOT NULL DEFAULT 0,
                     CONSTRAINT fk_merchant
@@ -61,9 +67,19 @@ def main():
                     "CREATE INDEX ix_photos_is_primary ON photos(is_primary)"
                 )
             )
+            session.execute(
+                text(
+                    "CREATE INDEX ix_photos_perceptual_hash "
+                    "ON photos(perceptual_hash)"
+                )
+            )
             session.commit()
             print("[OK] Created indexes")
 
+            print("\nCreating photo_variants table...")
+            create_photo_variants(session)
+            print("[OK] Created photo_variants table")
+
             print("\n" + "=" * 50)
             print("SUCCESS: Photos table recreated successfully!")
             print("=" * 50 + "\n")
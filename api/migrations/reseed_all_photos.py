@@ -2,7 +2,7 @@
 Master script to run all photo migration steps in order
 
 This script runs:
-1. Cleanup Vercel Blob storage
+1. Cleanup blob storage
 2. Recreate photos table
 3. Upload primary photos
 4. Upload additional photos
@@ -31,8 +31,8 @@ def main():
     print("=" * 60)
 
     try:
-        # Step 1: Cleanup Vercel Blob
-        print("\n[STEP 1/4] Cleaning up Vercel Blob storage...")
+        # Step 1: Cleanup blob storage
+        print("\n[STEP 1/4] Cleaning up blob storage...")
         cleanup_blob()
 
         # Step 2: Recreate photos table
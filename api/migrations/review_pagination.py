@@ -0,0 +1,60 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to support keyset pagination of merchant reviews.
+
+This migration:
+1. Creates a composite index on reviews (merchant_id, published_at DESC NULLS LAST, id DESC)
+   matching the ordering used by GET /merchants/{merchant_id}/reviews
+
+Usage:
+    uv run python -m migrations.review_pagination
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Creating index on reviews (merchant_id, published_at, id)...")
+    session.execute(
+        text(
+            """
+            CREATE INDEX IF NOT EXISTS ix_reviews_merchant_id_published_at_id
+            ON reviews (merchant_id, published_at DESC NULLS LAST, id DESC);
+        """
+        )
+    )
+
+    session.commit()
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Dropping index...")
+    session.execute(
+        text("DROP INDEX IF EXISTS ix_reviews_merchant_id_published_at_id;")
+    )
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting review pagination migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to maintain per-merchant review statistics incrementally.
+
+This migration:
+1. Creates the merchant_review_stats table (count, rating sum, 1-5 histogram,
+   latest published_at and latest review id per merchant)
+2. Creates a statement-level INSERT trigger on reviews that folds new rows
+   into the stats, so bulk inserts update each merchant once per statement
+3. Creates UPDATE/DELETE triggers that recompute stats for affected merchants
+4. Backfills the stats table from existing reviews
+
+Usage:
+    uv run python -m migrations.review_stats
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+STATS_COLUMNS = """
+    merchant_id, review_count, rating_sum,
+    rating_1, rating_2, rating_3, rating_4, rating_5,
+    latest_published_at, latest_review_id
+"""
+
+
+def aggregate_query(source: str, where: str = "TRUE") -> str:
+    """SELECT producing one stats row per merchant from a set of review rows"""
+    return f"""
+        WITH agg AS (
+            SELECT
+                merchant_id,
+                COUNT(*) AS review_count,
+                SUM(rating) AS rating_sum,
+                COUNT(*) FILTER (WHERE rating = 1) AS rating_1,
+                COUNT(*) FILTER (WHERE rating = 2) AS rating_2,
+                COUNT(*) FILTER (WHERE rating = 3) AS rating_3,
+                COUNT(*) FILTER (WHERE rating = 4) AS rating_4,
+                COUNT(*) FILTER (WHERE rating = 5) AS rating_5
+            FROM {source}
+            WHERE {where}
+            GROUP BY merchant_id
+        ),
+        latest AS (
+            SELECT DISTINCT ON (merchant_id) merchant_id, published_at, id
+            FROM {source}
+            WHERE {where}
+            ORDER BY merchant_id, published_at DESC NULLS LAST, id DESC
+        )
+        SELECT
+            agg.merchant_id, agg.review_count, agg.rating_sum,
+            agg.rating_1, agg.rating_2, agg.rating_3, agg.rating_4, agg.rating_5,
+            latest.published_at, latest.id
+        FROM agg
+        JOIN latest USING (merchant_id)
+    """
+
+
+def is_newer(candidate: str, current: str) -> str:
+    """SQL condition: candidate's latest review sorts after current's"""
+    return f"""
+        (COALESCE({candidate}.latest_published_at, '-infinity'), {candidate}.latest_review_id)
+        > (COALESCE({current}.latest_published_at, '-infinity'), COALESCE({current}.latest_review_id, 0))
+    """
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Creating merchant_review_stats table...")
+    session.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS merchant_review_stats (
+                merchant_id INTEGER PRIMARY KEY
+                    REFERENCES merchants(id) ON DELETE CASCADE,
+                review_count INTEGER NOT NULL DEFAULT 0,
+                rating_sum INTEGER NOT NULL DEFAULT 0,
+                rating_1 INTEGER NOT NULL DEFAULT 0,
+                rating_2 INTEGER NOT NULL DEFAULT 0,
+                rating_3 INTEGER NOT NULL DEFAULT 0,
+                rating_4 INTEGER NOT NULL DEFAULT 0,
+                rating_5 INTEGER NOT NULL DEFAULT 0,
+                latest_published_at TIMESTAMP WITH TIME ZONE,
+                latest_review_id INTEGER
+            );
+        """
+        )
+    )
+
+    print("Creating functions to maintain review statistics...")
+    session.execute(
+        text(
+            f"""
+            CREATE OR REPLACE FUNCTION merchant_review_stats_insert()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                INSERT INTO merchant_review_stats AS s ({STATS_COLUMNS})
+                {aggregate_query("inserted_reviews")}
+                ON CONFLICT (merchant_id) DO UPDATE SET
+                    review_count = s.review_count + EXCLUDED.review_count,
+                    rating_sum = s.rating_sum + EXCLUDED.rating_sum,
+                    rating_1 = s.rating_1 + EXCLUDED.rating_1,
+                    rating_2 = s.rating_2 + EXCLUDED.rating_2,
+                    rating_3 = s.rating_3 + EXCLUDED.rating_3,
+                    rating_4 = s.rating_4 + EXCLUDED.rating_4,
+                    rating_5 = s.rating_5 + EXCLUDED.rating_5,
+                    latest_published_at = CASE
+                        WHEN {is_newer("EXCLUDED", "s")}
+                        THEN EXCLUDED.latest_published_at
+                        ELSE s.latest_published_at
+                    END,
+                    latest_review_id = CASE
+                        WHEN {is_newer("EXCLUDED", "s")}
+                        THEN EXCLUDED.latest_review_id
+                        ELSE s.latest_review_id
+                    END;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE OR REPLACE FUNCTION merchant_review_stats_refresh(merchant_ids INTEGER[])
+            RETURNS VOID AS $$
+            BEGIN
+                DELETE FROM merchant_review_stats
+                WHERE merchant_id = ANY(merchant_ids);
+
+                INSERT INTO merchant_review_stats ({STATS_COLUMNS})
+                {aggregate_query("reviews", "merchant_id = ANY(merchant_ids)")};
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE OR REPLACE FUNCTION merchant_review_stats_delete()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                PERFORM merchant_review_stats_refresh(
+                    ARRAY(SELECT DISTINCT merchant_id FROM deleted_reviews)
+                );
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE OR REPLACE FUNCTION merchant_review_stats_update()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                PERFORM merchant_review_stats_refresh(
+                    ARRAY(
+                        SELECT merchant_id FROM old_reviews
+                        UNION
+                        SELECT merchant_id FROM new_reviews
+                    )
+                );
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """
+        )
+    )
+
+    print("Creating triggers on reviews...")
+    session.execute(
+        text(
+            """
+            DROP TRIGGER IF EXISTS merchant_review_stats_insert_trigger ON reviews;
+            CREATE TRIGGER merchant_review_stats_insert_trigger
+            AFTER INSERT ON reviews
+            REFERENCING NEW TABLE AS inserted_reviews
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION merchant_review_stats_insert();
+
+            DROP TRIGGER IF EXISTS merchant_review_stats_update_trigger ON reviews;
+            CREATE TRIGGER merchant_review_stats_update_trigger
+            AFTER UPDATE ON reviews
+            REFERENCING OLD TABLE AS old_reviews NEW TABLE AS new_reviews
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION merchant_review_stats_update();
+
+            DROP TRIGGER IF EXISTS merchant_review_stats_delete_trigger ON reviews;
+            CREATE TRIGGER merchant_review_stats_delete_trigger
+            AFTER DELETE ON reviews
+            REFERENCING OLD TABLE AS deleted_reviews
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION merchant_review_stats_delete();
+        """
+        )
+    )
+
+    print("Backfilling merchant_review_stats from existing reviews...")
+    session.execute(text("LOCK TABLE reviews IN SHARE MODE;"))
+    session.execute(text("TRUNCATE merchant_review_stats;"))
+    session.execute(
+        text(
+            f"""
+            INSERT INTO merchant_review_stats ({STATS_COLUMNS})
+            {aggregate_query("reviews")};
+        """
+        )
+    )
+
+    session.commit()
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Dropping triggers...")
+    for event in ("insert", "update", "delete"):
+        session.execute(
+            text(
+                f"DROP TRIGGER IF EXISTS merchant_review_stats_{event}_trigger ON reviews;"
+            )
+        )
+
+    print("Dropping functions...")
+    session.execute(text("DROP FUNCTION IF EXISTS merchant_review_stats_insert();"))
+    session.execute(text("DROP FUNCTION IF EXISTS merchant_review_stats_update();"))
+    session.execute(text("DROP FUNCTION IF EXISTS merchant_review_stats_delete();"))
+    session.execute(
+        text("DROP FUNCTION IF EXISTS merchant_review_stats_refresh(INTEGER[]);")
+    )
+
+    print("Dropping merchant_review_stats table...")
+    session.execute(text("DROP TABLE IF EXISTS merchant_review_stats;"))
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting review statistics migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
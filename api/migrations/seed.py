@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
 from app.models import Amenity, Merchant, MerchantType, OpeningHours, Photo, Review
+from app.type_catalog import refresh_type_counts
 
 
 def load_data(file_path: str = "data.json") -> dict:
@@ -41,6 +42,119 @@ def parse_datetime(date_string: str | None) -> datetime | None:
         return None
 
 
+def merchant_values(place_data: dict) -> dict:
+    """Map a Google Maps place to merchants column values"""
+    return {
+        "google_place_id": place_data.get("id"),
+        "name": place_data.get("name", "").replace("places/", ""),
+        "display_name": place_data.get("displayName", {}).get("text"),
+        "primary_type": place_data.get("primaryType"),
+        "formatted_address": place_data.get("formattedAddress"),
+        "short_address": place_data.get("shortFormattedAddress"),
+        "phone_national": place_data.get("nationalPhoneNumber"),
+        "phone_international": place_data.get("internationalPhoneNumber"),
+        "website": place_data.get("websiteUri"),
+        "latitude": place_data.get("location", {}).get("latitude"),
+        "longitude": place_data.get("location", {}).get("longitude"),
+        "plus_code": place_data.get("plusCode", {}).get("globalCode"),
+        "rating": place_data.get("rating"),
+        "user_rating_count": place_data.get("userRatingCount"),
+        "business_status": place_data.get("businessStatus"),
+        "google_maps_uri": place_data.get("googleMapsUri"),
+        "is_open_now": place_data.get("regularOpeningHours", {}).get("openNow"),
+    }
+
+
+def review_values(review_data: dict) -> dict:
+    """Map a Google Maps review to reviews column values (without merchant_id)"""
+    return {
+        "google_review_id": review_data.get("name"),
+        "rating": review_data.get("rating", 0),
+        "text": review_data.get("text", {}).get("text"),
+        "author_name": review_data.get("authorAttribution", {}).get("displayName"),
+        "author_photo_uri": review_data.get("authorAttribution", {}).get("photoUri"),
+        "published_at": parse_datetime(review_data.get("publishTime")),
+        "relative_time": review_data.get("relativePublishTimeDescription"),
+    }
+
+
+def opening_hours_values(hours_data: dict) -> dict:
+    """Map regularOpeningHours to opening_hours column values (without merchant_id)"""
+    weekday_descriptions = hours_data.get("weekdayDescriptions", [])
+
+    # Parse weekday descriptions into individual days
+    # Format: ["Monday: 7:00 AM – 10:00 PM", "Tuesday: 7:00 AM – 10:00 PM", ...]
+    days = {
+        "monday": None,
+        "tuesday": None,
+        "wednesday": None,
+        "thursday": None,
+        "friday": None,
+        "saturday": None,
+        "sunday": None,
+    }
+
+    for desc in weekday_descriptions:
+        if not desc or ":" not in desc:
+            continue
+
+        day_name, hours = desc.split(":", 1)
+        day_name = day_name.strip().lower()
+        hours = hours.strip()
+
+        if day_name in days:
+            days[day_name] = hours
+
+    return {"is_open_now": hours_data.get("openNow"), **days}
+
+
+def amenity_values(place_data: dict) -> dict:
+    """Map a Google Maps place to amenities column values (without merchant_id)"""
+
+    # Extract payment options
+    payment_opts = place_data.get("paymentOptions", {})
+
+    # Extract parking options
+    parking_opts = place_data.get("parkingOptions", {})
+
+    # Extract accessibility options
+    accessibility_opts = place_data.get("accessibilityOptions", {})
+
+    return {
+        # Service options
+        "takeout": place_data.get("takeout"),
+        "dine_in": place_data.get("dineIn"),
+        "outdoor_seating": place_data.get("outdoorSeating"),
+        "reservable": place_data.get("reservable"),
+        # Dining options
+        "serves_breakfast": place_data.get("servesBreakfast"),
+        "serves_lunch": place_data.get("servesLunch"),
+        "serves_dinner": place_data.get("servesDinner"),
+        "serves_brunch": place_data.get("servesBrunch"),
+        "serves_beer": place_data.get("servesBeer"),
+        "serves_wine": place_data.get("servesWine"),
+        "serves_vegetarian_food": place_data.get("servesVegetarianFood"),
+        # Suitability
+        "good_for_children": place_data.get("goodForChildren"),
+        "good_for_groups": place_data.get("goodForGroups"),
+        # Payment options
+        "accepts_credit_cards": payment_opts.get("acceptsCreditCards"),
+        "accepts_debit_cards": payment_opts.get("acceptsDebitCards"),
+        "accepts_cash_only": payment_opts.get("acceptsCashOnly"),
+        "accepts_nfc": payment_opts.get("acceptsNfc"),
+        # Parking options
+        "free_parking": parking_opts.get("freeParkingLot"),
+        "paid_parking": parking_opts.get("paidParkingLot"),
+        "valet_parking": parking_opts.get("valetParking"),
+        # Accessibility options
+        "wheelchair_entrance": accessibility_opts.get("wheelchairAccessibleEntrance"),
+        "wheelchair_restroom": accessibility_opts.get("wheelchairAccessibleRestroom"),
+        "wheelchair_seating": accessibility_opts.get("wheelchairAccessibleSeating"),
+        # Other amenities
+        "restroom": place_data.get("restroom"),
+    }
+
+
 def seed_merchant(session: Session, place_data: dict) -> Merchant | None:
     """Seed a single merchant and all related data"""
     google_place_id = place_data.get("id")
@@ -57,25 +171,7 @@ def seed_merchant(session: Session, place_data: dict) -> Merchant | None:
 
     # Create merchant
     try:
-        merchant = Merchant(
-            google_place_id=google_place_id,
-            name=place_data.get("name", "").replace("places/", ""),
-            display_name=place_data.get("displayName", {}).get("text"),
-            primary_type=place_data.get("primaryType"),
-            formatted_address=place_data.get("formattedAddress"),
-            short_address=place_data.get("shortFormattedAddress"),
-            phone_national=place_data.get("nationalPhoneNumber"),
-            phone_international=place_data.get("internationalPhoneNumber"),
-            website=place_data.get("websiteUri"),
-            latitude=place_data.get("location", {}).get("latitude"),
-            longitude=place_data.get("location", {}).get("longitude"),
-            plus_code=place_data.get("plusCode", {}).get("globalCode"),
-            rating=place_data.get("rating"),
-            user_rating_count=place_data.get("userRatingCount"),
-            business_status=place_data.get("businessStatus"),
-            google_maps_uri=place_data.get("googleMapsUri"),
-            is_open_now=place_data.get("regularOpeningHours", {}).get("openNow"),
-        )
+        merchant = Merchant(**merchant_values(place_data))
 
         session.add(merchant)
         session.flush()  # Get the merchant ID without committing
@@ -155,21 +251,7 @@ def seed_reviews(session: Session, merchant: Merchant, reviews: list[dict]) -> i
             if existing:
                 continue
 
-            author_name = review_data.get("authorAttribution", {}).get("displayName")
-            author_photo = review_data.get("authorAttribution", {}).get("photoUri")
-            review_text = review_data.get("text", {}).get("text")
-            published_at = parse_datetime(review_data.get("publishTime"))
-
-            review = Review(
-                merchant_id=merchant.id,
-                google_review_id=google_review_id,
-                rating=review_data.get("rating", 0),
-                text=review_text,
-                author_name=author_name,
-                author_photo_uri=author_photo,
-                published_at=published_at,
-                relative_time=review_data.get("relativePublishTimeDescription"),
-            )
+            review = Review(merchant_id=merchant.id, **review_values(review_data))
             session.add(review)
             count += 1
         except Exception as e:
@@ -183,91 +265,15 @@ def seed_opening_hours(session: Session, merchant: Merchant, hours_data: dict) -
     if not hours_data:
         return
 
-    weekday_descriptions = hours_data.get("weekdayDescriptions", [])
-
-    # Parse weekday descriptions into individual days
-    # Format: ["Monday: 7:00 AM – 10:00 PM", "Tuesday: 7:00 AM – 10:00 PM", ...]
-    days = {
-        "monday": None,
-        "tuesday": None,
-        "wednesday": None,
-        "thursday": None,
-        "friday": None,
-        "saturday": None,
-        "sunday": None,
-    }
-
-    for desc in weekday_descriptions:
-        if not desc or ":" not in desc:
-            continue
-
-        day_name, hours = desc.split(":", 1)
-        day_name = day_name.strip().lower()
-        hours = hours.strip()
-
-        if day_name in days:
-            days[day_name] = hours
-
     opening_hours = OpeningHours(
-        merchant_id=merchant.id,
-        is_open_now=hours_data.get("openNow"),
-        monday=days["monday"],
-        tuesday=days["tuesday"],
-        wednesday=days["wednesday"],
-        thursday=days["thursday"],
-        friday=days["friday"],
-        saturday=days["saturday"],
-        sunday=days["sunday"],
+        merchant_id=merchant.id, **opening_hours_values(hours_data)
     )
     session.add(opening_hours)
 
 
 def seed_amenities(session: Session, merchant: Merchant, place_data: dict) -> None:
     """Seed merchant amenities"""
-
-    # Extract payment options
-    payment_opts = place_data.get("paymentOptions", {})
-
-    # Extract parking options
-    parking_opts = place_data.get("parkingOptions", {})
-
-    # Extract accessibility options
-    accessibility_opts = place_data.get("accessibilityOptions", {})
-
-    amenity = Amenity(
-        merchant_id=merchant.id,
-        # Service options
-        takeout=place_data.get("takeout"),
-        dine_in=place_data.get("dineIn"),
-        outdoor_seating=place_data.get("outdoorSeating"),
-        reservable=place_data.get("reservable"),
-        # Dining options
-        serves_breakfast=place_data.get("servesBreakfast"),
-        serves_lunch=place_data.get("servesLunch"),
-        serves_dinner=place_data.get("servesDinner"),
-        serves_brunch=place_data.get("servesBrunch"),
-        serves_beer=place_data.get("servesBeer"),
-        serves_wine=place_data.get("servesWine"),
-        serves_vegetarian_food=place_data.get("servesVegetarianFood"),
-        # Suitability
-        good_for_children=place_data.get("goodForChildren"),
-        good_for_groups=place_data.get("goodForGroups"),
-        # Payment options
-        accepts_credit_cards=payment_opts.get("acceptsCreditCards"),
-        accepts_debit_cards=payment_opts.get("acceptsDebitCards"),
-        accepts_cash_only=payment_opts.get("acceptsCashOnly"),
-        accepts_nfc=payment_opts.get("acceptsNfc"),
-        # Parking options
-        free_parking=parking_opts.get("freeParkingLot"),
-        paid_parking=parking_opts.get("paidParkingLot"),
-        valet_parking=parking_opts.get("valetParking"),
-        # Accessibility options
-        wheelchair_entrance=accessibility_opts.get("wheelchairAccessibleEntrance"),
-        wheelchair_restroom=accessibility_opts.get("wheelchairAccessibleRestroom"),
-        wheelchair_seating=accessibility_opts.get("wheelchairAccessibleSeating"),
-        # Other amenities
-        restroom=place_data.get("restroom"),
-    )
+    amenity = Amenity(merchant_id=merchant.id, **amenity_values(place_data))
     session.add(amenity)
 
 
@@ -300,6 +306,7 @@ def main():
         # Commit all changes
         try:
             session.commit()
+            refresh_type_counts(session)
             print("\nSeed completed successfully!")
             print(f"Total: {success_count}/{total_places} merchants seeded\n")
         except Exception as e:
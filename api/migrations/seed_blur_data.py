@@ -1,35 +1,74 @@
 """
 Seed script to generate and populate blur_data_url for photos in the database
 
+Photos uploaded through photo_upload.py get their placeholders and perceptual
+hash from the local file at upload time, so this script only backfills
+photos without them.
+
 This script:
-1. Adds a blur_data_url column to the photos table (if not exists)
-2. Downloads each photo from Vercel Blob
-3. Generates a small blur placeholder (10px width)
-4. Converts it to base64 data URL format
-5. Updates the photos table with the blur data
+1. Adds the blur_data_url and thumb_hash columns to the photos table (if not
+   exists)
+2. Loads the photos missing blur data, a ThumbHash or a perceptual hash in
+   one query
+3. Reads each photo from data/merchant_photos or data/additional_photos when
+   the original is on disk, then from local blob storage, and otherwise
+   downloads it over a shared HTTP session that keeps connections open
+   between photos
+4. Generates a small blur placeholder (10px width) as a base64 data URL, a
+   ThumbHash and a perceptual hash on a process pool (see placeholders.py and
+   perceptual_hash.py)
+5. Updates the photos table in batches, one transaction per batch
 
 For Next.js Image component blurDataURL prop.
 
 Usage:
     1. Make sure all dependencies are installed: uv sync
     2. Run the script: uv run python -m migrations.seed_blur_data
+       (options: --workers, --concurrency, --batch-size)
 """
 
-import base64
-import io
+import argparse
+import os
+import time
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import dataclass
+from pathlib import Path
 
 import requests
 from dotenv import load_dotenv
-from PIL import Image
-from sqlalchemy import select, text
+from requests.adapters import HTTPAdapter
+from sqlalchemy import or_, select, text, update
 from sqlalchemy.orm import Session
+from urllib3.util.retry import Retry
 
+from app.config import settings
 from app.database import SessionLocal, engine
 from app.models import Photo
+from app.storage import LOCAL_PREFIX, LocalBlobStorage, resolve_blob_url
+from migrations.perceptual_hash import perceptual_hash
+from migrations.photo_hash import upgrade as add_perceptual_hash_column
+from migrations.photo_upload import additional_photo_jobs, primary_photo_jobs
+from migrations.placeholders import Placeholders, generate_placeholders
+from migrations.thumb_hash import upgrade as add_thumb_hash_column
 
 # Load environment variables
 load_dotenv()
 
+PRIMARY_PHOTOS_DIR = Path("data/merchant_photos")
+ADDITIONAL_PHOTOS_DIR = Path("data/additional_photos")
+
+
+@dataclass(frozen=True)
+class PhotoSource:
+    photo_id: int
+    blob_ref: str
+    file_path: Path | None  # The original on disk, if it is still there
+
 
 def add_blur_data_column():
     """Add blur_data_url column to photos table if it doesn't exist"""
@@ -55,98 +94,166 @@ def add_blur_data_column():
             print("blur_data_url column already exists.")
 
 
-def generate_blur_placeholder(image_url: str, blur_width: int = 10) -> str | None:
-    """
-    Download an image and generate a base64 blur placeholder
-
-    Args:
-        image_url: URL of the image to download
-        blur_width: Width of the blur placeholder (default: 10px)
-
-    Returns:
-        Base64 data URL string for the blur placeholder
-    """
-    try:
-        # Download the image
-        response = requests.get(image_url, timeout=30)
+def local_photo_files() -> dict[tuple[int, int], Path]:
+    """Original files by (merchant_id, order), as photos.py numbers them"""
+    jobs = []
+    if PRIMARY_PHOTOS_DIR.is_dir():
+        jobs += primary_photo_jobs(PRIMARY_PHOTOS_DIR)
+    if ADDITIONAL_PHOTOS_DIR.is_dir():
+        jobs += additional_photo_jobs(ADDITIONAL_PHOTOS_DIR)
+    return {job.key: job.file_path for job in jobs}
+
+
+def photos_without_placeholders(session: Session) -> list[PhotoSource]:
+    files = local_photo_files()
+    rows = session.execute(
+        select(Photo.id, Photo.merchant_id, Photo.order, Photo.blob_ref)
+        .where(
+            or_(
+                Photo.blur_data_url.is_(None),
+                Photo.thumb_hash.is_(None),
+                Photo.perceptual_hash.is_(None),
+            )
+        )
+        .order_by(Photo.id)
+    )
+    return [
+        PhotoSource(photo_id, blob_ref, files.get((merchant_id, order)))
+        for photo_id, merchant_id, order, blob_ref in rows
+    ]
+
+
+def describe_photo(source: Path | bytes) -> tuple[Placeholders, str]:
+    """Placeholders and perceptual hash of a photo; runs in the process pool"""
+    return generate_placeholders(source), perceptual_hash(source)
+
+
+def http_session(concurrency: int) -> requests.Session:
+    """A session whose connection pool is shared by all download threads"""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+    )
+    adapter = HTTPAdapter(pool_maxsize=concurrency, max_retries=retry)
+    http = requests.Session()
+    http.mount("https://", adapter)
+    http.mount("http://", adapter)
+    return http
+
+
+class BlurBackfill:
+    def __init__(
+        self, session: Session, workers: int, concurrency: int, batch_size: int
+    ):
+        self.session = session
+        self.workers = workers
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.http = http_session(concurrency)
+        self.local_storage = LocalBlobStorage(Path(settings.LOCAL_BLOB_ROOT))
+        self.pending: list[dict[str, int | str]] = []
+        self.success_count = 0
+        self.local_count = 0
+        self.error_count = 0
+
+    def download(self, photo: PhotoSource) -> bytes:
+        """Fetch a photo that is not on disk; runs in the download threads"""
+        if photo.blob_ref.startswith(LOCAL_PREFIX):
+            path = self.local_storage.path_for(
+                photo.blob_ref.removeprefix(LOCAL_PREFIX)
+            )
+            if path is not None and path.is_file():
+                return path.read_bytes()
+        response = self.http.get(resolve_blob_url(photo.blob_ref), timeout=30)
         response.raise_for_status()
+        return response.content
+
+    def run(self, photos: list[PhotoSource]) -> None:
+        with (
+            ProcessPoolExecutor(max_workers=self.workers) as encoder,
+            ThreadPoolExecutor(max_workers=self.concurrency) as downloader,
+        ):
+            encodes: dict[Future[tuple[Placeholders, str]], PhotoSource] = {}
+            downloads: dict[Future[bytes], PhotoSource] = {}
+            for photo in photos:
+                if photo.file_path is not None:
+                    future = encoder.submit(describe_photo, photo.file_path)
+                    encodes[future] = photo
+                    self.local_count += 1
+                else:
+                    downloads[downloader.submit(self.download, photo)] = photo
+
+            # Hand each download to the process pool as soon as it arrives
+            for future in as_completed(downloads):
+                photo = downloads[future]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    print(f"  ERROR downloading photo {photo.photo_id}: {e}")
+                    self.error_count += 1
+                    continue
+                encodes[encoder.submit(describe_photo, data)] = photo
+
+            for future in as_completed(encodes):
+                photo = encodes[future]
+                try:
+                    placeholders, phash = future.result()
+                except Exception as e:
+                    print(
+                        f"  ERROR generating placeholders for photo {photo.photo_id}: {e}"
+                    )
+                    self.error_count += 1
+                    continue
+
+                self.pending.append(
+                    {
+                        "id": photo.photo_id,
+                        "blur_data_url": placeholders.blur_data_url,
+                        "thumb_hash": placeholders.thumb_hash,
+                        "perceptual_hash": phash,
+                    }
+                )
+                if len(self.pending) >= self.batch_size:
+                    self.flush()
+
+        self.flush()
+
+    def flush(self) -> None:
+        """Write pending placeholders in a single transaction"""
+        if not self.pending:
+            return
 
-        # Open image with PIL
-        img = Image.open(io.BytesIO(response.content))
-
-        # Convert to RGB if necessary (handle PNGs with transparency)
-        if img.mode in ("RGBA", "LA", "P"):
-            # Create white background
-            background = Image.new("RGB", img.size, (255, 255, 255))
-            if img.mode == "P":
-                img = img.convert("RGBA")
-            background.paste(img, mask=img.split()[-1] if img.mode == "RGBA" else None)
-            img = background
-        elif img.mode != "RGB":
-            img = img.convert("RGB")
-
-        # Calculate height maintaining aspect ratio
-        aspect_ratio = img.height / img.width
-        blur_height = int(blur_width * aspect_ratio)
-
-        # Resize to small dimensions for blur
-        img_small = img.resize((blur_width, blur_height), Image.Resampling.LANCZOS)
-
-        # Save to bytes buffer as JPEG
-        buffer = io.BytesIO()
-        img_small.save(buffer, format="JPEG", quality=70)
-        buffer.seek(0)
-
-        # Convert to base64
-        img_base64 = base64.b64encode(buffer.read()).decode("utf-8")
-
-        # Return as data URL
-        return f"data:image/jpeg;base64,{img_base64}"
-
-    except Exception as e:
-        print(f"  ERROR generating blur for {image_url}: {e}")
-        return None
-
-
-def seed_blur_data(session: Session, photo: Photo) -> bool:
-    """
-    Generate and save blur data for a single photo
-
-    Args:
-        session: Database session
-        photo: Photo model instance
-
-    Returns:
-        True if successful, False otherwise
-    """
-    try:
-        # Skip if blur_data_url already exists
-        if photo.blur_data_url:
-            return False
-
-        print(f"  Processing photo {photo.id} (merchant {photo.merchant_id})...")
-
-        # Generate blur placeholder
-        blur_data = generate_blur_placeholder(photo.vercel_blob_url)
-
-        if blur_data:
-            # Update the photo record
-            photo.blur_data_url = blur_data
-            session.commit()
-            print(f"  [OK] Generated blur data for photo {photo.id}")
-            return True
-        else:
-            print(f"  [SKIP] Could not generate blur data for photo {photo.id}")
-            return False
-
-    except Exception as e:
-        print(f"  ERROR processing photo {photo.id}: {e}")
-        session.rollback()
-        return False
+        rows, self.pending = self.pending, []
+        try:
+            self.session.execute(update(Photo), rows)
+            self.session.commit()
+            self.success_count += len(rows)
+            print(f"  [OK] Saved placeholders for {len(rows)} photos")
+        except Exception as e:
+            print(f"  ERROR saving placeholders for {len(rows)} photos: {e}")
+            self.session.rollback()
+            self.error_count += len(rows)
 
 
 def main():
     """Main seed function"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes decoding and resizing photos (default: CPU count)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Concurrent downloads for photos that are not on disk",
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
     print("\nStarting blur data generation for photos...\n")
 
     # Add column if needed
@@ -154,44 +261,32 @@ def main():
 
     print("\nFetching photos from database...\n")
 
-    # Get all photos
     with SessionLocal() as session:
-        stmt = select(Photo).order_by(Photo.id)
-        photos = session.scalars(stmt).all()
+        add_thumb_hash_column(session)
+        add_perceptual_hash_column(session)
+        photos = photos_without_placeholders(session)
 
         if not photos:
-            print("No photos found in database.")
+            print("No photos without placeholders found in database.")
             return
 
-        print(f"Found {len(photos)} photos\n")
-
-        success_count = 0
-        skip_count = 0
-        error_count = 0
-
-        for photo in photos:
-            # Check if already has blur data
-            if photo.blur_data_url:
-                skip_count += 1
-                continue
-
-            result = seed_blur_data(session, photo)
-            if result:
-                success_count += 1
-            else:
-                # Re-check if it was actually skipped due to error vs already existing
-                session.refresh(photo)
-                if photo.blur_data_url:
-                    skip_count += 1
-                else:
-                    error_count += 1
+        print(f"Found {len(photos)} photos without placeholders\n")
+
+        started = time.perf_counter()
+        backfill = BlurBackfill(
+            session, args.workers, args.concurrency, args.batch_size
+        )
+        backfill.run(photos)
+        elapsed = time.perf_counter() - started
 
         print(f"\n{'=' * 50}")
         print("Blur data generation completed!")
-        print(f"Success: {success_count}")
-        print(f"Skipped: {skip_count}")
-        print(f"Errors: {error_count}")
+        print(f"Success: {backfill.success_count}")
+        print(f"From local files: {backfill.local_count}")
+        print(f"Errors: {backfill.error_count}")
         print(f"Total: {len(photos)}")
+        if elapsed:
+            print(f"Throughput: {backfill.success_count / elapsed:.1f} photos/sec")
         print(f"{'=' * 50}\n")
 
 
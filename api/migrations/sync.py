@@ -0,0 +1,204 @@
+# pyright: reportUnknownParameterType=false
+# pyright: reportMissingTypeArgument=false
+# pyright: reportAny=false
+# pyright: reportUnknownVariableType=false
+# pyright: reportUnknownMemberType=false
+# pyright: reportUnknownArgumentType=false
+# pyright: reportUnusedCallResult=false
+"""
+Incremental re-sync of merchants from a fresh Google Maps places export
+
+This script:
+1. Loads the stored content hash of every merchant in one query
+2. Streams the export and hashes each place's normalized rows
+3. Upserts only new places and places whose hash changed (bumping
+   updated_at and replacing their children); unchanged places are skipped
+4. With --delete-missing, deletes merchants that are not in the export
+5. Prints inserted/updated/unchanged/deleted counts and time per phase
+
+Requires the content_hash column (migrations/content_hash.py).
+
+Usage:
+    uv run python -m migrations.sync data/limo.json data/pondok-labu.json
+    uv run python -m migrations.sync exports/ --delete-missing
+"""
+
+import argparse
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import batched
+from pathlib import Path
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import Merchant
+from app.type_catalog import refresh_type_counts
+from migrations.ingest import (
+    IngestResult,
+    PlaceRows,
+    collect_files,
+    error_entry,
+    transform,
+    write_batch,
+    write_error_report,
+)
+from migrations.place_stream import iter_places
+
+
+class Sync:
+    def __init__(self, session: Session, batch_size: int):
+        self.session = session
+        self.batch_size = batch_size
+        self.result = IngestResult()
+        self.unchanged = 0
+        self.deleted = 0
+        self.phases: Counter[str] = Counter()
+        self.stored: dict[str, str | None] = {}
+        self.seen: set[str] = set()
+        self.pending: list[tuple[Path, PlaceRows]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - started
+
+    def load_hashes(self) -> None:
+        with self.phase("load hashes"):
+            rows = self.session.execute(
+                select(Merchant.google_place_id, Merchant.content_hash)
+            )
+            self.stored = {place_id: digest for place_id, digest in rows}
+        print(f"Loaded hashes for {len(self.stored)} merchants")
+
+    def diff_file(self, file_path: Path) -> bool:
+        """Queue new and changed places from a file; False if it didn't parse"""
+        started = time.perf_counter()
+        write_seconds = self.phases["write"]
+        complete = True
+
+        try:
+            for place in iter_places(file_path):
+                place_id = place.get("id") if isinstance(place, dict) else None
+                if place_id:
+                    self.seen.add(place_id)
+                try:
+                    rows = transform(place)
+                except (ValueError, TypeError, AttributeError) as e:
+                    self.result.errors.append(
+                        error_entry(file_path, place_id, "transform", e)
+                    )
+                    continue
+
+                if (
+                    self.stored.get(rows.google_place_id)
+                    == rows.merchant["content_hash"]
+                ):
+                    self.unchanged += 1
+                    continue
+
+                self.pending.append((file_path, rows))
+                if len(self.pending) >= self.batch_size:
+                    self.flush()
+        except ValueError as e:
+            self.result.errors.append(error_entry(file_path, None, "parse", e))
+            complete = False
+
+        # Time spent writing batches mid-file is counted under "write"
+        elapsed = time.perf_counter() - started
+        self.phases["parse + diff"] += elapsed - (self.phases["write"] - write_seconds)
+        return complete
+
+    def flush(self) -> None:
+        with self.phase("write"):
+            # write_batch reports errors against one file; group to keep that
+            by_file: dict[Path, list[PlaceRows]] = {}
+            for file_path, rows in self.pending:
+                by_file.setdefault(file_path, []).append(rows)
+            for file_path, places in by_file.items():
+                write_batch(self.session, file_path, places, self.result)
+            self.pending = []
+
+    def delete_missing(self) -> None:
+        missing = [place_id for place_id in self.stored if place_id not in self.seen]
+        with self.phase("delete"):
+            for chunk in batched(missing, self.batch_size):
+                result = self.session.execute(
+                    delete(Merchant).where(Merchant.google_place_id.in_(chunk))
+                )
+                self.session.commit()
+                self.deleted += result.rowcount
+
+    def report(self, elapsed: float) -> None:
+        rows = self.result.rows
+        print(f"\n{'=' * 50}")
+        print(f"Inserted: {rows['merchants_inserted']}")
+        print(f"Updated: {rows['merchants_updated']}")
+        print(f"Unchanged: {self.unchanged}")
+        print(f"Deleted: {self.deleted}")
+        print(f"Errors: {len(self.result.errors)}")
+        child_rows = {
+            table: count
+            for table, count in sorted(rows.items())
+            if not table.startswith("merchants_")
+        }
+        if child_rows:
+            print("\nChild rows written:")
+            for table, count in child_rows.items():
+                print(f"  {table:<20}{count:>10}")
+        print("\nPhases:")
+        for name, seconds in self.phases.items():
+            print(f"  {name:<20}{seconds:>9.2f}s")
+        print(f"  {'total':<20}{elapsed:>9.2f}s")
+        print(f"{'=' * 50}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="+", help="Files or directories to sync")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--delete-missing",
+        action="store_true",
+        help="Delete merchants that are not in the export",
+    )
+    parser.add_argument("--errors", default="sync_errors.jsonl")
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    print(f"\nSyncing {len(files)} files...\n")
+
+    started = time.perf_counter()
+    with SessionLocal() as session:
+        sync = Sync(session, args.batch_size)
+        sync.load_hashes()
+
+        complete = True
+        for file_path in files:
+            complete = sync.diff_file(file_path) and complete
+        if sync.pending:
+            sync.flush()
+
+        if args.delete_missing:
+            if complete:
+                sync.delete_missing()
+            else:
+                print("Not deleting missing merchants: some files failed to parse")
+
+        refresh_type_counts(session)
+
+    sync.report(time.perf_counter() - started)
+
+    if sync.result.errors:
+        write_error_report(sync.result.errors, args.errors)
+        print(f"Error report written to {args.errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to store a ThumbHash placeholder per photo.
+
+This migration:
+1. Adds a nullable thumb_hash column to photos
+
+New uploads get a ThumbHash from migrations.photo_upload; existing photos are
+backfilled by migrations.seed_blur_data.
+
+Usage:
+    uv run python -m migrations.thumb_hash
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Adding thumb_hash column to photos...")
+    session.execute(
+        text(
+            """
+            ALTER TABLE photos
+            ADD COLUMN IF NOT EXISTS thumb_hash VARCHAR(64);
+        """
+        )
+    )
+
+    session.commit()
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Dropping thumb_hash column...")
+    session.execute(text("ALTER TABLE photos DROP COLUMN IF EXISTS thumb_hash;"))
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting thumb hash migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to create GiST trigram indexes for nearest-match search.
+
+This migration:
+1. Creates GiST indexes on display_name and short_address using
+   gist_trgm_ops, which (unlike the GIN indexes from trgm.py) can return rows
+   in order of `search <<-> column` distance, so a search's closest fuzzy
+   candidates are read off the index instead of sorted
+
+Requires trgm.py.
+
+Usage:
+    uv run python -m migrations.trgm_gist
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Creating GiST trigram index on display_name...")
+    session.execute(
+        text(
+            """
+            CREATE INDEX IF NOT EXISTS merchants_display_name_trgm_gist_idx
+            ON merchants USING GIST (display_name gist_trgm_ops);
+        """
+        )
+    )
+
+    print("Creating GiST trigram index on short_address...")
+    session.execute(
+        text(
+            """
+            CREATE INDEX IF NOT EXISTS merchants_short_address_trgm_gist_idx
+            ON merchants USING GIST (short_address gist_trgm_ops);
+        """
+        )
+    )
+
+    session.commit()
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Dropping GiST trigram indexes...")
+    session.execute(text("DROP INDEX IF EXISTS merchants_display_name_trgm_gist_idx;"))
+    session.execute(text("DROP INDEX IF EXISTS merchants_short_address_trgm_gist_idx;"))
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting GiST trigram indexes migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
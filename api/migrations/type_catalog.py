@@ -0,0 +1,84 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to add the merchant type catalog.
+
+This migration:
+1. Creates the types lookup table (one row per type slug, with its
+   merchant count)
+2. Creates the catalog_versions table, bumped when the counts change so the
+   API's cached catalog is reloaded
+3. Backfills the counts from merchant_types
+
+The seed, bulk_seed, ingest and sync scripts refresh the counts when they
+finish (see app/type_catalog.py).
+
+Usage:
+    uv run python -m migrations.type_catalog
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.type_catalog import refresh_type_counts
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Creating types table...")
+    session.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS types (
+                id SERIAL PRIMARY KEY,
+                slug VARCHAR(100) NOT NULL UNIQUE,
+                merchant_count INTEGER NOT NULL DEFAULT 0
+            );
+        """
+        )
+    )
+
+    print("Creating catalog_versions table...")
+    session.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS catalog_versions (
+                name VARCHAR(50) PRIMARY KEY,
+                version BIGINT NOT NULL DEFAULT 0
+            );
+        """
+        )
+    )
+    session.commit()
+
+    print("Backfilling type counts from merchant_types...")
+    refresh_type_counts(session)
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Dropping types and catalog_versions tables...")
+    session.execute(text("DROP TABLE IF EXISTS types;"))
+    session.execute(text("DROP TABLE IF EXISTS catalog_versions;"))
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting type catalog migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
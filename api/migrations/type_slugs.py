@@ -0,0 +1,163 @@
+# pyright: reportUnusedCallResult=false
+"""
+Migration script to denormalize merchant types into an indexed array.
+
+This migration:
+1. Adds merchants.type_slugs, a text[] of the merchant's type slugs in
+   merchant_types order
+2. Creates statement-level triggers on merchant_types that rebuild the array
+   for the merchants whose types were inserted or deleted, so every ingest
+   path keeps it in sync
+3. Backfills the array from merchant_types
+4. Creates a GIN index on it, used by ?types= with && (any) and @> (all)
+
+Usage:
+    uv run python -m migrations.type_slugs
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+REBUILD_TYPE_SLUGS = """
+    UPDATE merchants AS m
+    SET type_slugs = COALESCE(
+        (
+            SELECT array_agg(mt.type_name ORDER BY mt.id)
+            FROM merchant_types AS mt
+            WHERE mt.merchant_id = m.id
+        ),
+        '{{}}'
+    )
+    WHERE m.id IN (SELECT DISTINCT merchant_id FROM {changed})
+"""
+
+
+def upgrade(session: Session) -> None:
+    """Apply the migration"""
+    print("Adding type_slugs column to merchants...")
+    session.execute(
+        text(
+            """
+            ALTER TABLE merchants
+            ADD COLUMN IF NOT EXISTS type_slugs TEXT[] NOT NULL DEFAULT '{}';
+        """
+        )
+    )
+
+    print("Creating functions to maintain type_slugs...")
+    session.execute(
+        text(
+            f"""
+            CREATE OR REPLACE FUNCTION merchants_type_slugs_insert()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                {REBUILD_TYPE_SLUGS.format(changed="inserted_types")};
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE OR REPLACE FUNCTION merchants_type_slugs_delete()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                {REBUILD_TYPE_SLUGS.format(changed="deleted_types")};
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """
+        )
+    )
+
+    print("Creating triggers on merchant_types...")
+    session.execute(
+        text(
+            """
+            DROP TRIGGER IF EXISTS merchants_type_slugs_insert_trigger
+                ON merchant_types;
+            CREATE TRIGGER merchants_type_slugs_insert_trigger
+            AFTER INSERT ON merchant_types
+            REFERENCING NEW TABLE AS inserted_types
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION merchants_type_slugs_insert();
+
+            DROP TRIGGER IF EXISTS merchants_type_slugs_delete_trigger
+                ON merchant_types;
+            CREATE TRIGGER merchants_type_slugs_delete_trigger
+            AFTER DELETE ON merchant_types
+            REFERENCING OLD TABLE AS deleted_types
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION merchants_type_slugs_delete();
+        """
+        )
+    )
+
+    print("Backfilling type_slugs from merchant_types...")
+    session.execute(
+        text(
+            """
+            UPDATE merchants AS m
+            SET type_slugs = t.slugs
+            FROM (
+                SELECT merchant_id, array_agg(type_name ORDER BY id) AS slugs
+                FROM merchant_types
+                GROUP BY merchant_id
+            ) AS t
+            WHERE m.id = t.merchant_id AND m.type_slugs <> t.slugs;
+        """
+        )
+    )
+
+    print("Creating GIN index on type_slugs...")
+    session.execute(
+        text(
+            """
+            CREATE INDEX IF NOT EXISTS ix_merchants_type_slugs
+            ON merchants USING GIN (type_slugs);
+        """
+        )
+    )
+
+    session.commit()
+    print("Migration completed successfully!")
+
+
+def downgrade(session: Session) -> None:
+    """Rollback the migration"""
+    print("Dropping triggers and functions...")
+    session.execute(
+        text(
+            """
+            DROP TRIGGER IF EXISTS merchants_type_slugs_insert_trigger
+                ON merchant_types;
+            DROP TRIGGER IF EXISTS merchants_type_slugs_delete_trigger
+                ON merchant_types;
+            DROP FUNCTION IF EXISTS merchants_type_slugs_insert();
+            DROP FUNCTION IF EXISTS merchants_type_slugs_delete();
+        """
+        )
+    )
+
+    print("Dropping type_slugs column...")
+    session.execute(text("DROP INDEX IF EXISTS ix_merchants_type_slugs;"))
+    session.execute(text("ALTER TABLE merchants DROP COLUMN IF EXISTS type_slugs;"))
+
+    session.commit()
+    print("Rollback completed successfully!")
+
+
+def main():
+    """Run the migration"""
+    from app.database import SessionLocal
+
+    print("\nStarting type_slugs migration...\n")
+
+    with SessionLocal() as session:
+        try:
+            upgrade(session)
+        except Exception as e:
+            print(f"\nError during migration: {e}")
+            session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    main()
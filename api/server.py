@@ -4,15 +4,29 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.database import lifespan
 from app.models.utils import Message
-from app.routes import auth, feedbacks, merchant_types, merchants, users, utils
+from app.query_metrics import QueryMetricsMiddleware
+from app.rate_limit import RateLimit, RateLimitMiddleware
+from app.routes import (
+    auth,
+    blobs,
+    feedbacks,
+    images,
+    merchant_types,
+    merchants,
+    users,
+    utils,
+)
 
 api_router = APIRouter()
 api_router.include_router(auth.router)
 api_router.include_router(feedbacks.router)
+api_router.include_router(images.router)
 api_router.include_router(merchants.router)
 api_router.include_router(merchant_types.router)
 api_router.include_router(utils.router)
 api_router.include_router(users.router)
+if settings.BLOB_STORAGE == "local":
+    api_router.include_router(blobs.router)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -21,6 +35,24 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limits={
+            route: RateLimit.parse(limit)
+            for route, limit in settings.RATE_LIMITS.items()
+        },
+        prefix=settings.API_V1_STR,
+    )
+
+app.add_middleware(
+    QueryMetricsMiddleware,
+    budgets=settings.QUERY_BUDGETS,
+    default_budget=settings.QUERY_BUDGET_DEFAULT,
+    prefix=settings.API_V1_STR,
+    server_timing=settings.SERVER_TIMING_ENABLED,
+)
+
 if settings.all_cors_origin:
     app.add_middleware(
         CORSMiddleware,
@@ -8,7 +8,15 @@ const nextConfig: NextConfig = {
     turbopackFileSystemCacheForDev: true,
   },
   images: {
+    // Photos served by the API's local blob storage during development
+    dangerouslyAllowLocalIP: process.env.NODE_ENV === 'development',
     remotePatterns: [
+      {
+        protocol: 'http',
+        hostname: 'localhost',
+        port: '8000',
+        pathname: '/api/v1/blobs/**',
+      },
       {
         protocol: 'https',
         hostname: 'qge8bmbe4b0zsl99.public.blob.vercel-storage.com',
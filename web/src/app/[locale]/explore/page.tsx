@@ -123,8 +123,8 @@ async function MerchantTypesFilter({ locale }: { locale: Locale }) {
   const opts = [
     { label: t('merchantType'), value: '', isDisabled: true },
     ...merchantTypes.map((type) => ({
-      label: type,
-      value: type.toLocaleLowerCase().replace(/\s+/g, '_'),
+      label: type.name,
+      value: type.slug,
     })),
   ];
 
@@ -157,7 +157,7 @@ async function MerchantsResult({ locale, searchParams }: MerchantsResultProps) {
     page: page ? Number(page) : 1,
     page_size: page_size ? Number(page_size) : 16,
     search: typeof search === 'string' ? search : undefined,
-    type: typeof type === 'string' ? type : undefined,
+    types: typeof type === 'string' ? type : undefined,
     sort_by:
       typeof sort_by === 'string'
         ? (sort_by as NonNullable<MerchantsQuery>['sort_by'])
@@ -168,7 +168,7 @@ async function MerchantsResult({ locale, searchParams }: MerchantsResultProps) {
         : undefined,
   };
 
-  const merchants = await getMerchants(query, locale);
+  const merchants = await getMerchants(query);
 
   if (merchants.data.length === 0) {
     return (
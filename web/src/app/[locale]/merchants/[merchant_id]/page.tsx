@@ -59,7 +59,7 @@ import {
 } from '@/lib/data/merchants';
 import type {
   MerchantDetail as MerchantDetailType,
-  MerchantReviewsResponse,
+  MerchantReview,
 } from '@/lib/types/merchant';
 import { cn, MAPBOX_ACCESS_TOKEN } from '@/lib/utils';
 
@@ -328,7 +328,7 @@ async function MerchantDetails({
 }
 
 type ReviewCardProps = {
-  reviews: MerchantReviewsResponse;
+  reviews: MerchantReview[];
 } & ComponentProps<typeof ItemGroup>;
 
 function ReviewCards({ reviews, className, ...props }: ReviewCardProps) {
@@ -30,7 +30,7 @@ export function MerchantPhotos({
               loading="eager"
               placeholder="blur"
               sizes="(max-width: 1024px) 100vw, 66vw"
-              src={primaryPhoto.vercel_blob_url}
+              src={primaryPhoto.url}
               width={primaryPhoto.width}
             />
           )}
@@ -51,7 +51,7 @@ export function MerchantPhotos({
                     height={photo.height}
                     loading="eager"
                     placeholder="blur"
-                    src={photo.vercel_blob_url}
+                    src={photo.url}
                     width={photo.width}
                   />
                 )}
@@ -11,6 +11,7 @@ import type {
   MerchantPhotosError,
   MerchantPhotosResponse,
   MerchantResponse,
+  MerchantReview,
   MerchantReviewsError,
   MerchantReviewsPath,
   MerchantReviewsResponse,
@@ -23,7 +24,7 @@ import type {
 } from '../types/merchant';
 import { API_URL } from '../utils';
 
-export async function getMerchants(query: MerchantsQuery, locale?: string) {
+export async function getMerchants(query: MerchantsQuery) {
   const searchParams = new URLSearchParams();
 
   if (query) {
@@ -34,11 +35,8 @@ export async function getMerchants(query: MerchantsQuery, locale?: string) {
     }
   }
 
-  if (locale && locale === 'id') {
-    searchParams.set('lang', 'indonesian');
-  } else {
-    searchParams.set('lang', 'english');
-  }
+  // Searches match English and Indonesian terms whatever the locale
+  searchParams.set('lang', 'auto');
 
   const res = await fetch(`${API_URL}/merchants?${searchParams.toString()}`, {
     method: 'GET',
@@ -177,9 +175,10 @@ export async function getMerchantReviews(path: MerchantReviewsPath) {
     throw new Error(message);
   }
 
-  const data = (await res.json()) as MerchantReviewsResponse;
+  const { data } = (await res.json()) as MerchantReviewsResponse;
 
-  return data;
+  // Full reviews are requested, so every item includes its text
+  return data as MerchantReview[];
 }
 
 export async function getMerchantTypes(path: MerchantTypesPath) {
@@ -6,6 +6,8 @@ export type PaginationMeta = components['schemas']['PaginationMeta'];
 
 export type MerchantDetail = components['schemas']['MerchantDetail'];
 
+export type MerchantReview = components['schemas']['ReviewPublic'];
+
 export type MerchantsQuery =
   paths['/api/v1/merchants']['get']['parameters']['query'];
 
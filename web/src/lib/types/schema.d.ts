@@ -440,6 +440,8 @@ export interface components {
         MerchantTypePublic: {
             /** Id */
             id: number;
+            /** Slug */
+            slug: string;
             /** Type Name */
             type_name: string;
         };
@@ -475,10 +477,24 @@ export interface components {
             /** Sunday */
             sunday: string | null;
         };
+        /** CursorMeta */
+        CursorMeta: {
+            /** Limit */
+            limit: number;
+            /** Has Next */
+            has_next: boolean;
+            /** Next Cursor */
+            next_cursor: string | null;
+        };
         /** PaginationMeta */
         PaginationMeta: {
             /** Total */
             total: number;
+            /**
+             * Total Is Estimate
+             * @default false
+             */
+            total_is_estimate: boolean;
             /** Page */
             page: number;
             /** Page Size */
@@ -494,7 +510,12 @@ export interface components {
         PhotoPublic: {
             /** Id */
             id: number;
-            /** Vercel Blob Url */
+            /** Url */
+            url: string;
+            /**
+             * Vercel Blob Url
+             * @deprecated
+             */
             vercel_blob_url: string;
             /** File Extension */
             file_extension: string;
@@ -517,8 +538,25 @@ export interface components {
             google_review_id: string;
             /** Rating */
             rating: number;
+            /** Author Name */
+            author_name: string | null;
+            /** Author Photo Uri */
+            author_photo_uri: string | null;
+            /** Published At */
+            published_at: string | null;
+            /** Relative Time */
+            relative_time: string | null;
             /** Text */
             text: string | null;
+        };
+        /** ReviewSummaryPublic */
+        ReviewSummaryPublic: {
+            /** Id */
+            id: number;
+            /** Google Review Id */
+            google_review_id: string;
+            /** Rating */
+            rating: number;
             /** Author Name */
             author_name: string | null;
             /** Author Photo Uri */
@@ -528,6 +566,12 @@ export interface components {
             /** Relative Time */
             relative_time: string | null;
         };
+        /** ReviewsPublic */
+        ReviewsPublic: {
+            /** Data */
+            data: (components["schemas"]["ReviewPublic"] | components["schemas"]["ReviewSummaryPublic"])[];
+            meta: components["schemas"]["CursorMeta"];
+        };
         /** Status */
         Status: {
             /** Ok */
@@ -540,6 +584,15 @@ export interface components {
             /** Token Type */
             token_type: string;
         };
+        /** TypePublic */
+        TypePublic: {
+            /** Slug */
+            slug: string;
+            /** Name */
+            name: string;
+            /** Merchant Count */
+            merchant_count: number;
+        };
         /** UserCreate */
         UserCreate: {
             /** Name */
@@ -697,8 +750,12 @@ export interface operations {
                 page?: number;
                 page_size?: number;
                 search?: string | null;
+                /** @description Comma-separated type slugs */
+                types?: string | null;
+                types_mode?: "any" | "all";
+                /** @deprecated */
                 type?: string | null;
-                lang?: "english" | "indonesian";
+                lang?: "english" | "indonesian" | "auto";
                 sort_by?: "name" | "rating" | "distance" | "created_at";
                 sort_order?: "asc" | "desc";
             };
@@ -743,7 +800,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": string[];
+                    "application/json": components["schemas"]["TypePublic"][];
                 };
             };
         };
@@ -814,7 +871,12 @@ export interface operations {
     };
     read_merchant_reviews_api_v1_merchants__merchant_id__reviews_get: {
         parameters: {
-            query?: never;
+            query?: {
+                limit?: number;
+                cursor?: string | null;
+                rating?: number | null;
+                fields?: "full" | "compact";
+            };
             header?: never;
             path: {
                 merchant_id: number;
@@ -829,7 +891,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["ReviewPublic"][];
+                    "application/json": components["schemas"]["ReviewsPublic"];
                 };
             };
             /** @description Validation Error */
@@ -951,7 +1013,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": string[];
+                    "application/json": components["schemas"]["TypePublic"][];
                 };
             };
         };